@@ -20,14 +20,24 @@ class Cache(object):
         else:
             sect = {}
             cache_dir = config.get(Config.SECTION_CACHE_DIR, self.CACHE_DIR)
-            if not os.path.isabs(cache_dir):
-                cache_dir = os.path.join(project.dvc_dir, cache_dir)
-                cache_dir = os.path.abspath(os.path.realpath(cache_dir))
-            sect[Config.SECTION_REMOTE_URL] = cache_dir
+            sect[Config.SECTION_REMOTE_URL] = self._abspath(cache_dir)
             t = config.get(Config.SECTION_CACHE_TYPE, None)
             if t:
                 sect[Config.SECTION_CACHE_TYPE] = t
 
+            # NOTE: slower cache tiers, e.g. a cache on NFS shared by all
+            # the nodes, that back the fast one above.
+            shared = config.get(Config.SECTION_CACHE_SHARED, None)
+            if shared:
+                sect[Config.SECTION_CACHE_SHARED] = [
+                    self._abspath(d.strip()) for d in shared.split(',')]
+            promote = config.get(Config.SECTION_CACHE_PROMOTE, None)
+            if promote:
+                sect[Config.SECTION_CACHE_PROMOTE] = promote
+            limit = config.get(Config.SECTION_CACHE_SIZE_LIMIT, None)
+            if limit:
+                sect[Config.SECTION_CACHE_SIZE_LIMIT] = limit
+
         self.local = Remote(project, sect)
 
         self.s3 = self._get_remote(config, Config.SECTION_CACHE_S3)
@@ -36,6 +46,12 @@ class Cache(object):
         self.hdfs = self._get_remote(config, Config.SECTION_CACHE_HDFS)
         self.azure = self._get_remote(config, Config.SECTION_CACHE_AZURE)
 
+    def _abspath(self, cache_dir):
+        if not os.path.isabs(cache_dir):
+            cache_dir = os.path.join(self.project.dvc_dir, cache_dir)
+            cache_dir = os.path.abspath(os.path.realpath(cache_dir))
+        return cache_dir
+
     def _get_remote(self, config, name):
         from dvc.remote import Remote
 
@@ -0,0 +1,105 @@
+"""
+Checking outputs out while they are still being pulled. Every output is
+checked out as soon as all of its objects are in the cache, instead of
+waiting for the whole pull to finish.
+"""
+from dvc.logger import Logger
+
+
+class CheckoutQueue(object):
+    """
+    Callback for RemoteLOCAL.pull() that checks out outputs of stages as
+    soon as their objects arrive and reports stages that are ready.
+    """
+    def __init__(self, project, stages):
+        self.cache = project.cache.local
+        # NOTE: md5 -> outputs that are waiting for it
+        self._waiting = {}
+        # NOTE: output -> md5s that it is still missing
+        self._missing = {}
+        # NOTE: stage -> number of its outputs that are not checked out yet
+        self._left = {}
+        # NOTE: stage -> outputs that don't come from the pull (e.g.
+        # external ones), checked out once the rest of the stage is there
+        self._rest = {}
+        self._stages = {}
+        self.ready = []
+
+        for stage in stages:
+            outs = [out for out in stage.outs if self._pullable(out)]
+            self._left[stage] = len(stage.outs)
+            self._rest[stage] = [out for out in stage.outs
+                                 if not self._pullable(out)]
+            if not outs:
+                self._checkout_rest(stage)
+
+            for out in outs:
+                self._stages[out] = stage
+                self._wait(out, [out.md5])
+
+    @staticmethod
+    def _pullable(out):
+        return out.use_cache and \
+            out.path_info['scheme'] == 'local' and \
+            out.md5 is not None
+
+    def _wait(self, out, md5s):
+        missing = self._missing.setdefault(out, set())
+        for md5 in md5s:
+            if md5 in missing:
+                continue
+
+            if self.cache.changed_cache(md5):
+                missing.add(md5)
+                self._waiting.setdefault(md5, []).append(out)
+            elif self.cache.is_dir_cache(md5):
+                for _, m in self.cache._entries(md5):
+                    if m not in missing and self.cache.changed_cache(m):
+                        missing.add(m)
+                        self._waiting.setdefault(m, []).append(out)
+
+        if not missing:
+            self._checkout(out)
+
+    def _checkout(self, out):
+        del self._missing[out]
+        out.checkout()
+
+        stage = self._stages[out]
+        self._left[stage] -= 1
+        if self._left[stage] == len(self._rest[stage]):
+            self._checkout_rest(stage)
+
+    def _checkout_rest(self, stage):
+        for out in self._rest[stage]:
+            out.checkout()
+            self._left[stage] -= 1
+        self._ready(stage)
+
+    def _ready(self, stage):
+        self.ready.append(stage)
+        Logger.info("Stage '{}' is ready.".format(stage.relpath))
+
+    def __call__(self, md5s):
+        for md5 in md5s:
+            # NOTE: the download might have failed, in which case the
+            # object is left pending and is taken care of by the final
+            # checkout.
+            if md5 not in self._waiting or self.cache.changed_cache(md5):
+                continue
+
+            for out in self._waiting.pop(md5):
+                if out not in self._missing:
+                    continue
+
+                self._missing[out].discard(md5)
+                if self.cache.is_dir_cache(md5):
+                    # NOTE: now that we know what is inside of it
+                    self._wait(out, [m for _, m in self.cache._entries(md5)])
+                elif not self._missing[out]:
+                    self._checkout(out)
+
+    @property
+    def pending(self):
+        """ Stages that still have outputs that are not checked out """
+        return [stage for stage, left in self._left.items() if left > 0]
@@ -3,29 +3,9 @@ from __future__ import print_function
 import os
 import sys
 import argparse
+import importlib
 from multiprocessing import cpu_count
 
-from dvc.command.init import CmdInit
-from dvc.command.destroy import CmdDestroy
-from dvc.command.remove import CmdRemove
-from dvc.command.move import CmdMove
-from dvc.command.run import CmdRun
-from dvc.command.repro import CmdRepro
-from dvc.command.data_sync import CmdDataPush, CmdDataPull, CmdDataFetch
-from dvc.command.status import CmdDataStatus
-from dvc.command.gc import CmdGC
-from dvc.command.add import CmdAdd
-from dvc.command.imp import CmdImport
-from dvc.command.config import CmdConfig
-from dvc.command.checkout import CmdCheckout
-from dvc.command.remote import CmdRemoteAdd, CmdRemoteRemove
-from dvc.command.remote import CmdRemoteModify, CmdRemoteList
-from dvc.command.metrics import CmdMetricsShow, CmdMetricsAdd
-from dvc.command.metrics import CmdMetricsRemove, CmdMetricsModify
-from dvc.command.install import CmdInstall
-from dvc.command.root import CmdRoot
-from dvc.command.lock import CmdLock, CmdUnlock
-from dvc.command.pipeline import CmdPipelineShow
 from dvc.logger import Logger
 from dvc import VERSION
 
@@ -40,6 +20,17 @@ def _fix_subparsers(subparsers):
         subparsers.dest = 'cmd'
 
 
+class LazyCmd(object):
+    """ Command class that is only imported when the command is run """
+    def __init__(self, module, name):
+        self.module = module
+        self.name = name
+
+    def __call__(self, args):
+        module = importlib.import_module('dvc.command.' + self.module)
+        return getattr(module, self.name)(args)
+
+
 class DvcParser(argparse.ArgumentParser):
     def error(self, message):
         sys.stderr.write('{}{}\n'.format(Logger.error_prefix(), message))
@@ -115,7 +106,7 @@ def parse_args(argv=None):
                         default=False,
                         help="Overwrite '.dvc' if it exists. Will remove "
                              "all local cache.")
-    init_parser.set_defaults(func=CmdInit)
+    init_parser.set_defaults(func=LazyCmd('init', 'CmdInit'))
 
     # Destroy
     DESTROY_HELP = "Destroy dvc. Will remove all project's information, " \
@@ -131,7 +122,7 @@ def parse_args(argv=None):
                         action='store_true',
                         default=False,
                         help='Force destruction.')
-    destroy_parser.set_defaults(func=CmdDestroy)
+    destroy_parser.set_defaults(func=LazyCmd('destroy', 'CmdDestroy'))
 
     # Add
     ADD_HELP = 'Add files/directories to dvc.'
@@ -150,7 +141,7 @@ def parse_args(argv=None):
                         'targets',
                         nargs='+',
                         help='Input files/directories.')
-    add_parser.set_defaults(func=CmdAdd)
+    add_parser.set_defaults(func=LazyCmd('add', 'CmdAdd'))
 
     # Import
     IMPORT_HELP = 'Import files from URL.'
@@ -165,7 +156,7 @@ def parse_args(argv=None):
     import_parser.add_argument(
                         'out',
                         help='Output.')
-    import_parser.set_defaults(func=CmdImport)
+    import_parser.set_defaults(func=LazyCmd('imp', 'CmdImport'))
 
     # Checkout
     CHECKOUT_HELP = 'Checkout data files from cache.'
@@ -178,7 +169,7 @@ def parse_args(argv=None):
                         'targets',
                         nargs='*',
                         help='DVC files.')
-    checkout_parser.set_defaults(func=CmdCheckout)
+    checkout_parser.set_defaults(func=LazyCmd('checkout', 'CmdCheckout'))
 
     # Run
     RUN_HELP = 'Generate a stage file from a given ' \
@@ -247,7 +238,7 @@ def parse_args(argv=None):
                         'command',
                         nargs=argparse.REMAINDER,
                         help='Command or command file to execute.')
-    run_parser.set_defaults(func=CmdRun)
+    run_parser.set_defaults(func=LazyCmd('run', 'CmdRun'))
 
     # Parent parser used in pull/push/status
     parent_cache_parser = argparse.ArgumentParser(
@@ -287,7 +278,7 @@ def parse_args(argv=None):
                         action='store_true',
                         default=False,
                         help='Fetch cache for all branches.')
-    pull_parser.set_defaults(func=CmdDataPull)
+    pull_parser.set_defaults(func=LazyCmd('data_sync', 'CmdDataPull'))
 
     # Push
     PUSH_HELP = 'Push data files to the cloud.'
@@ -306,7 +297,11 @@ def parse_args(argv=None):
                         action='store_true',
                         default=False,
                         help='Push cache for all branches.')
-    push_parser.set_defaults(func=CmdDataPush)
+    push_parser.add_argument(
+                        '--from-remote',
+                        help='Copy data from this remote repository instead '
+                             'of the local cache.')
+    push_parser.set_defaults(func=LazyCmd('data_sync', 'CmdDataPush'))
 
     # Fetch
     FETCH_HELP = 'Fetch data files from the cloud.'
@@ -325,7 +320,7 @@ def parse_args(argv=None):
                         action='store_true',
                         default=False,
                         help='Fetch cache for all branches.')
-    fetch_parser.set_defaults(func=CmdDataFetch)
+    fetch_parser.set_defaults(func=LazyCmd('data_sync', 'CmdDataFetch'))
 
     # Status
     STATUS_HELP = 'Show the project status.'
@@ -345,7 +340,7 @@ def parse_args(argv=None):
                         '-r',
                         '--remote',
                         help='Remote repository to compare local cache to.')
-    status_parser.set_defaults(func=CmdDataStatus)
+    status_parser.set_defaults(func=LazyCmd('status', 'CmdDataStatus'))
 
     # Repro
     REPRO_HELP = 'Reproduce DVC file. Default file name - \'Dvcfile\'.'
@@ -403,7 +398,7 @@ def parse_args(argv=None):
                         default=False,
                         help='Reproduce the whole pipeline that the '
                              'specified stage file belongs to.')
-    repro_parser.set_defaults(func=CmdRepro)
+    repro_parser.set_defaults(func=LazyCmd('repro', 'CmdRepro'))
 
     # Remove
     REMOVE_HELP = 'Remove outputs of DVC file.'
@@ -429,7 +424,7 @@ def parse_args(argv=None):
                         'targets',
                         nargs='+',
                         help='DVC files.')
-    remove_parser.set_defaults(func=CmdRemove)
+    remove_parser.set_defaults(func=LazyCmd('remove', 'CmdRemove'))
 
     # Move
     MOVE_HELP = 'Move output of DVC file.'
@@ -444,7 +439,7 @@ def parse_args(argv=None):
     move_parser.add_argument(
                         'dst',
                         help='Destination.')
-    move_parser.set_defaults(func=CmdMove)
+    move_parser.set_defaults(func=LazyCmd('move', 'CmdMove'))
 
     # Garbage collector
     GC_HELP = 'Collect garbage.'
@@ -469,7 +464,7 @@ def parse_args(argv=None):
                         '-r',
                         '--remote',
                         help='Remote repository to collect garbage in.')
-    gc_parser.set_defaults(func=CmdGC)
+    gc_parser.set_defaults(func=LazyCmd('gc', 'CmdGC'))
 
     # Config
     CONFIG_HELP = 'Get or set config options.'
@@ -497,7 +492,7 @@ def parse_args(argv=None):
                         action='store_true',
                         default=False,
                         help='Use local config.')
-    config_parser.set_defaults(func=CmdConfig)
+    config_parser.set_defaults(func=LazyCmd('config', 'CmdConfig'))
 
     # Remote
     REMOTE_HELP = 'Manage set of tracked repositories.'
@@ -537,7 +532,7 @@ def parse_args(argv=None):
                         action='store_true',
                         default=False,
                         help='Set as default remote.')
-    remote_add_parser.set_defaults(func=CmdRemoteAdd)
+    remote_add_parser.set_defaults(func=LazyCmd('remote', 'CmdRemoteAdd'))
 
     REMOTE_REMOVE_HELP = 'Remove remote.'
     remote_remove_parser = remote_subparsers.add_parser(
@@ -553,7 +548,8 @@ def parse_args(argv=None):
                         action='store_true',
                         default=False,
                         help='Use local config.')
-    remote_remove_parser.set_defaults(func=CmdRemoteRemove)
+    remote_remove_parser.set_defaults(
+                        func=LazyCmd('remote', 'CmdRemoteRemove'))
 
     REMOTE_MODIFY_HELP = 'Modify remote.'
     remote_modify_parser = remote_subparsers.add_parser(
@@ -582,7 +578,8 @@ def parse_args(argv=None):
                         action='store_true',
                         default=False,
                         help='Use local config.')
-    remote_modify_parser.set_defaults(func=CmdRemoteModify)
+    remote_modify_parser.set_defaults(
+                        func=LazyCmd('remote', 'CmdRemoteModify'))
 
     REMOTE_LIST_HELP = 'List remotes.'
     remote_list_parser = remote_subparsers.add_parser(
@@ -595,7 +592,7 @@ def parse_args(argv=None):
                         action='store_true',
                         default=False,
                         help='Use local config.')
-    remote_list_parser.set_defaults(func=CmdRemoteList)
+    remote_list_parser.set_defaults(func=LazyCmd('remote', 'CmdRemoteList'))
 
     # Metrics
     METRICS_HELP = 'Get metrics from all branches.'
@@ -652,7 +649,67 @@ def parse_args(argv=None):
                         action='store_true',
                         default=False,
                         help='Show metrics for all branches.')
-    metrics_show_parser.set_defaults(func=CmdMetricsShow)
+    metrics_show_parser.set_defaults(func=LazyCmd('metrics', 'CmdMetricsShow'))
+
+    METRICS_DIFF_HELP = 'Show metrics that changed between revisions.'
+    metrics_diff_parser = metrics_subparsers.add_parser(
+                        'diff',
+                        parents=[parent_parser],
+                        description=METRICS_DIFF_HELP,
+                        help=METRICS_DIFF_HELP)
+    metrics_diff_parser.add_argument(
+                        'a_rev',
+                        nargs='?',
+                        default='HEAD',
+                        help='Old git revision. HEAD by default.')
+    metrics_diff_parser.add_argument(
+                        'b_rev',
+                        nargs='?',
+                        help='New git revision. Workspace by default.')
+    metrics_diff_parser.add_argument(
+                        '-p',
+                        '--path',
+                        help='Path to metrics file.')
+    metrics_diff_parser.add_argument(
+                        '-t',
+                        '--type',
+                        help='Type of metrics(RAW/JSON/TSV/HTSV/CSV/HCSV).')
+    metrics_diff_parser.add_argument(
+                        '-x',
+                        '--xpath',
+                        help='JSON/TSV/HTSV/CSV/HCSV path.')
+    metrics_diff_parser.set_defaults(func=LazyCmd('metrics', 'CmdMetricsDiff'))
+
+    METRICS_HISTORY_HELP = 'Show how metrics changed over commits.'
+    metrics_history_parser = metrics_subparsers.add_parser(
+                        'history',
+                        parents=[parent_parser],
+                        description=METRICS_HISTORY_HELP,
+                        help=METRICS_HISTORY_HELP)
+    metrics_history_parser.add_argument(
+                        'path',
+                        nargs='?',
+                        help='Path to metrics file.')
+    metrics_history_parser.add_argument(
+                        '-t',
+                        '--type',
+                        help='Type of metrics(RAW/JSON/TSV/HTSV/CSV/HCSV).')
+    metrics_history_parser.add_argument(
+                        '-x',
+                        '--xpath',
+                        help='JSON/TSV/HTSV/CSV/HCSV path.')
+    metrics_history_parser.add_argument(
+                        '-r',
+                        '--rev',
+                        default='HEAD',
+                        help='Git revision to start from. HEAD by default.')
+    metrics_history_parser.add_argument(
+                        '-n',
+                        '--max-count',
+                        type=int,
+                        help='Number of commits to show.')
+    metrics_history_parser.set_defaults(
+                        func=LazyCmd('metrics', 'CmdMetricsHistory'))
 
     METRICS_ADD_HELP = 'Add metrics.'
     metrics_add_parser = metrics_subparsers.add_parser(
@@ -671,7 +728,7 @@ def parse_args(argv=None):
     metrics_add_parser.add_argument(
                         'path',
                         help='Path to metrics file.')
-    metrics_add_parser.set_defaults(func=CmdMetricsAdd)
+    metrics_add_parser.set_defaults(func=LazyCmd('metrics', 'CmdMetricsAdd'))
 
     METRICS_MODIFY_HELP = 'Modify metrics.'
     metrics_modify_parser = metrics_subparsers.add_parser(
@@ -690,7 +747,8 @@ def parse_args(argv=None):
     metrics_modify_parser.add_argument(
                         'path',
                         help='Metrics file.')
-    metrics_modify_parser.set_defaults(func=CmdMetricsModify)
+    metrics_modify_parser.set_defaults(
+                        func=LazyCmd('metrics', 'CmdMetricsModify'))
 
     METRICS_REMOVE_HELP = 'Remove metrics.'
     metrics_remove_parser = metrics_subparsers.add_parser(
@@ -701,7 +759,8 @@ def parse_args(argv=None):
     metrics_remove_parser.add_argument(
                         'path',
                         help='Path to metrics file.')
-    metrics_remove_parser.set_defaults(func=CmdMetricsRemove)
+    metrics_remove_parser.set_defaults(
+                        func=LazyCmd('metrics', 'CmdMetricsRemove'))
 
     # Install
     INSTALL_HELP = 'Install dvc hooks into the repository.'
@@ -710,7 +769,7 @@ def parse_args(argv=None):
                         parents=[parent_parser],
                         description=INSTALL_HELP,
                         help=INSTALL_HELP)
-    install_parser.set_defaults(func=CmdInstall)
+    install_parser.set_defaults(func=LazyCmd('install', 'CmdInstall'))
 
     # Root
     ROOT_HELP = 'Relative path to project\'s directory.'
@@ -719,7 +778,7 @@ def parse_args(argv=None):
                         parents=[parent_parser],
                         description=ROOT_HELP,
                         help=ROOT_HELP)
-    root_parser.set_defaults(func=CmdRoot)
+    root_parser.set_defaults(func=LazyCmd('root', 'CmdRoot'))
 
     # Lock
     LOCK_HELP = 'Lock DVC file.'
@@ -732,7 +791,7 @@ def parse_args(argv=None):
                         'targets',
                         nargs='+',
                         help='DVC files.')
-    lock_parser.set_defaults(func=CmdLock)
+    lock_parser.set_defaults(func=LazyCmd('lock', 'CmdLock'))
 
     # Unlock
     UNLOCK_HELP = 'Unlock DVC file.'
@@ -745,7 +804,7 @@ def parse_args(argv=None):
                         'targets',
                         nargs='+',
                         help='DVC files.')
-    unlock_parser.set_defaults(func=CmdUnlock)
+    unlock_parser.set_defaults(func=LazyCmd('lock', 'CmdUnlock'))
 
     # Pipeline
     PIPELINE_HELP = 'Manage pipeline.'
@@ -791,12 +850,42 @@ def parse_args(argv=None):
                         'targets',
                         nargs='*',
                         help="DVC files. 'Dvcfile' by default.")
-    pipeline_show_parser.set_defaults(func=CmdPipelineShow)
+    pipeline_show_parser.set_defaults(
+                        func=LazyCmd('pipeline', 'CmdPipelineShow'))
+
+    # Daemon
+    # NOTE: used internally to run things like update check in the
+    # background, so it is not listed in the help message.
+    daemon_parser = subparsers.add_parser(
+                        'daemon',
+                        parents=[parent_parser],
+                        help=argparse.SUPPRESS)
+
+    daemon_subparsers = daemon_parser.add_subparsers(
+                        dest='cmd',
+                        help='Use dvc daemon CMD --help '
+                             'for command-specific help.')
+
+    _fix_subparsers(daemon_subparsers)
+
+    daemon_updater_parser = daemon_subparsers.add_parser(
+                        'updater',
+                        parents=[parent_parser],
+                        help=argparse.SUPPRESS)
+    daemon_updater_parser.set_defaults(
+                        func=LazyCmd('daemon', 'CmdDaemonUpdater'))
+
+    daemon_propagate_parser = daemon_subparsers.add_parser(
+                        'propagate',
+                        parents=[parent_parser],
+                        help=argparse.SUPPRESS)
+    daemon_propagate_parser.set_defaults(
+                        func=LazyCmd('daemon', 'CmdDaemonPropagate'))
 
     args = parser.parse_args(argv)
 
-    if (issubclass(args.func, CmdRepro)
-        or issubclass(args.func, CmdPipelineShow)) \
+    if (args.func.name == 'CmdRepro'
+        or args.func.name == 'CmdPipelineShow') \
        and hasattr(args, 'targets') \
        and len(args.targets) == 0:
         if hasattr(args, 'cwd'):
@@ -806,13 +895,13 @@ def parse_args(argv=None):
         path = os.path.join(cwd, 'Dvcfile')
         if not os.path.exists(path):
             msg = "default target '{}' does not exist.".format(path)
-            if issubclass(args.func, CmdRepro):
+            if args.func.name == 'CmdRepro':
                 repro_parser.error(msg)
-            elif issubclass(args.func, CmdPipelineShow):
+            elif args.func.name == 'CmdPipelineShow':
                 pipeline_show_parser.error(msg)
         args.targets = ['Dvcfile']
 
-    if issubclass(args.func, CmdRun) \
+    if args.func.name == 'CmdRun' \
        and len(args.deps) == 0 \
        and len(args.outs) == 0 \
        and len(args.outs_no_cache) == 0 \
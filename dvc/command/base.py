@@ -6,6 +6,10 @@ from dvc.lock import LockError
 
 
 class CmdBase(object):
+    # NOTE: commands that don't modify the project could run alongside
+    # each other, so they only need a shared lock.
+    SHARED_LOCK = False
+
     def __init__(self, args):
         from dvc.project import Project
 
@@ -36,12 +40,17 @@ class CmdBase(object):
 
     def run_cmd(self):
         try:
-            with self.project.lock:
-                return self.run()
+            self.project.lock.lock(shared=self.SHARED_LOCK)
         except LockError as ex:
             Logger.error('Failed to lock before running a command', ex)
             return 1
 
+        try:
+            return self.run()
+        finally:
+            self.project.lock.unlock()
+            self.project.cache.local.propagate_async()
+
     # Abstract methods that have to be implemented by any inheritance class
     def run(self):
         pass
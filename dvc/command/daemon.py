@@ -0,0 +1,44 @@
+import os
+
+
+class CmdDaemonBase(object):
+    def __init__(self, args):
+        self.args = args
+
+    def run_cmd(self):
+        return self.run()
+
+    def run(self):
+        pass
+
+
+class CmdDaemonUpdater(CmdDaemonBase):
+    def run(self):
+        from dvc.project import Project
+        from dvc.updater import Updater
+
+        dvc_dir = os.path.join(os.getcwd(), Project.DVC_DIR)
+        Updater(dvc_dir).fetch()
+        return 0
+
+
+class CmdDaemonPropagate(CmdDaemonBase):
+    def run(self):
+        from dvc.project import Project
+        from dvc.lock import LockError
+
+        project = Project(os.getcwd())
+
+        # NOTE: so that gc doesn't remove objects while we are copying
+        # them. If we can't get the lock, the lists stay queued for the
+        # next run.
+        try:
+            project.lock.lock(shared=True)
+        except LockError:
+            return 1
+
+        try:
+            project.cache.local.propagate_queued()
+        finally:
+            project.lock.unlock()
+        return 0
@@ -32,13 +32,18 @@ class CmdDataPull(CmdDataBase):
 
 
 class CmdDataPush(CmdDataBase):
+    # NOTE: push only adds objects to the cache and writes to its own
+    # temporary dirs, while state db handles concurrent writers itself.
+    SHARED_LOCK = True
+
     def do_run(self, target=None):
         try:
             self.project.push(target=target,
                               jobs=self.args.jobs,
                               remote=self.args.remote,
                               show_checksums=self.args.show_checksums,
-                              all_branches=self.args.all_branches)
+                              all_branches=self.args.all_branches,
+                              from_remote=self.args.from_remote)
         except Exception as exc:
             self.project.logger.error('Failed to push data to the cloud', exc)
             return 1
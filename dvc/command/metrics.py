@@ -3,6 +3,8 @@ from dvc.exceptions import DvcException
 
 
 class CmdMetricsShow(CmdBase):
+    SHARED_LOCK = True
+
     def run(self):
         try:
             # backward compatibility
@@ -36,6 +38,40 @@ class CmdMetricsShow(CmdBase):
         return 0
 
 
+class CmdMetricsDiff(CmdBase):
+    SHARED_LOCK = True
+
+    def run(self):
+        try:
+            self.project.metrics_diff(self.args.a_rev,
+                                      self.args.b_rev,
+                                      path=self.args.path,
+                                      typ=self.args.type,
+                                      xpath=self.args.xpath)
+        except DvcException as exc:
+            self.project.logger.error('Failed to diff metrics', exc)
+            return 1
+
+        return 0
+
+
+class CmdMetricsHistory(CmdBase):
+    SHARED_LOCK = True
+
+    def run(self):
+        try:
+            self.project.metrics_history(self.args.path,
+                                         typ=self.args.type,
+                                         xpath=self.args.xpath,
+                                         rev=self.args.rev,
+                                         limit=self.args.max_count)
+        except DvcException as exc:
+            self.project.logger.error('Failed to show metrics history', exc)
+            return 1
+
+        return 0
+
+
 class CmdMetricsModify(CmdBase):
     def run(self):
         try:
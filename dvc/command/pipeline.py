@@ -6,6 +6,8 @@ from dvc.dagascii import Dagascii
 
 
 class CmdPipelineShow(CmdBase):
+    SHARED_LOCK = True
+
     def _show(self, target, commands, outs):
         import networkx
         from dvc.stage import Stage
@@ -4,6 +4,8 @@ from dvc.command.base import CmdBase
 
 
 class CmdRoot(CmdBase):
+    SHARED_LOCK = True
+
     def run(self):
         self.project.logger.info(os.path.relpath(self.project.root_dir))
         return 0
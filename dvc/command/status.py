@@ -2,6 +2,7 @@ from dvc.command.data_sync import CmdDataBase
 
 
 class CmdDataStatus(CmdDataBase):
+    SHARED_LOCK = True
     STATUS_LEN = 10
     STATUS_INDENT = '\t'
     UP_TO_DATE_MSG = "Pipeline is up to date. Nothing to reproduce."
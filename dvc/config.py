@@ -3,7 +3,7 @@ DVC config objects.
 """
 import os
 import configobj
-from schema import Schema, Optional, And, Use, Regex
+from schema import Schema, Optional, And, Use, Regex, SchemaError
 
 from dvc.exceptions import DvcException
 
@@ -29,6 +29,30 @@ def supported_cache_type(types):
     return True
 
 
+def supported_promote(policy):
+    return policy in ['copy', 'symlink']
+
+
+def supported_compression(codec):
+    return codec in ['none', 'gzip', 'zstd']
+
+
+def supported_compress_level(section):
+    """ Checks compress_level of a remote against its codec """
+    from dvc.remote.compress import LEVELS
+
+    level = section.get('compress_level', None)
+    codec = section.get('compress', None)
+    if level is None or codec not in LEVELS:
+        return True
+
+    low, high = LEVELS[codec]
+    if not low <= level <= high:
+        msg = "compress_level for '{}' should be from {} to {}, got {}"
+        raise SchemaError(msg.format(codec, low, high, level))
+    return True
+
+
 def supported_loglevel(level):
     return level in ['info', 'debug', 'warning', 'error']
 
@@ -53,6 +77,15 @@ def is_percent(val):
     return int(val) >= 0 and int(val) <= 100
 
 
+def to_size(val):
+    """ Size in bytes, e.g. '1024', '500M' or '1T' """
+    units = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+    val = str(val).strip().upper()
+    if val and val[-1] in units:
+        return int(float(val[:-1]) * units[val[-1]])
+    return int(val)
+
+
 class Config(object):
     CONFIG = 'config'
     CONFIG_LOCAL = 'config.local'
@@ -63,6 +96,7 @@ class Config(object):
     SECTION_CORE_REMOTE = 'remote'
     SECTION_CORE_INTERACTIVE_SCHEMA = And(str, is_bool, Use(to_bool))
     SECTION_CORE_INTERACTIVE = 'interactive'
+    SECTION_CORE_LOCK_TIMEOUT = 'lock_timeout'
 
     SECTION_CACHE = 'cache'
     SECTION_CACHE_DIR = 'dir'
@@ -74,6 +108,10 @@ class Config(object):
     SECTION_CACHE_SSH = 'ssh'
     SECTION_CACHE_HDFS = 'hdfs'
     SECTION_CACHE_AZURE = 'azure'
+    SECTION_CACHE_SHARED = 'shared'
+    SECTION_CACHE_PROMOTE = 'promote'
+    SECTION_CACHE_PROMOTE_SCHEMA = And(Use(str.lower), supported_promote)
+    SECTION_CACHE_SIZE_LIMIT = 'size_limit'
     SECTION_CACHE_SCHEMA = {
         Optional(SECTION_CACHE_LOCAL): str,
         Optional(SECTION_CACHE_S3): str,
@@ -81,6 +119,9 @@ class Config(object):
         Optional(SECTION_CACHE_HDFS): str,
         Optional(SECTION_CACHE_SSH): str,
         Optional(SECTION_CACHE_AZURE): str,
+        Optional(SECTION_CACHE_SHARED): str,
+        Optional(SECTION_CACHE_PROMOTE): SECTION_CACHE_PROMOTE_SCHEMA,
+        Optional(SECTION_CACHE_SIZE_LIMIT): And(Use(to_size), is_whole),
 
         # backward compatibility
         Optional(SECTION_CACHE_DIR, default='cache'): str,
@@ -99,6 +140,7 @@ class Config(object):
         Optional(SECTION_CORE_REMOTE, default=''): And(str, Use(str.lower)),
         Optional(SECTION_CORE_INTERACTIVE,
                  default=False): SECTION_CORE_INTERACTIVE_SCHEMA,
+        Optional(SECTION_CORE_LOCK_TIMEOUT): And(Use(int), is_whole),
 
         # backward compatibility
         Optional(SECTION_CORE_CLOUD, default=''): SECTION_CORE_CLOUD_SCHEMA,
@@ -145,6 +187,14 @@ class Config(object):
     SECTION_REMOTE_TIMEOUT = 'timeout'
     SECTION_REMOTE_PASSWORD = 'password'
     SECTION_REMOTE_ASK_PASSWORD = 'ask_password'
+    SECTION_REMOTE_PACK = 'pack'
+    SECTION_REMOTE_COMPRESS = 'compress'
+    SECTION_REMOTE_COMPRESS_SCHEMA = And(Use(str.lower), supported_compression)
+    SECTION_REMOTE_COMPRESS_LEVEL = 'compress_level'
+    SECTION_REMOTE_MULTIPART_THRESHOLD = 'multipart_threshold'
+    SECTION_REMOTE_MULTIPART_CHUNKSIZE = 'multipart_chunksize'
+    SECTION_REMOTE_MULTIPART_CONCURRENCY = 'multipart_concurrency'
+    SECTION_REMOTE_MAX_CONNECTIONS = 'max_connections'
     SECTION_REMOTE_SCHEMA = {
         SECTION_REMOTE_URL: And(supported_url, error="Unsupported URL"),
         Optional(SECTION_AWS_REGION): str,
@@ -159,6 +209,16 @@ class Config(object):
         Optional(SECTION_REMOTE_TIMEOUT): Use(int),
         Optional(SECTION_REMOTE_PASSWORD): str,
         Optional(SECTION_REMOTE_ASK_PASSWORD): And(str, is_bool, Use(to_bool)),
+        Optional(SECTION_REMOTE_PACK): And(str, is_bool, Use(to_bool)),
+        Optional(SECTION_REMOTE_COMPRESS): SECTION_REMOTE_COMPRESS_SCHEMA,
+        Optional(SECTION_REMOTE_COMPRESS_LEVEL): And(Use(int), is_whole),
+        Optional(SECTION_REMOTE_MULTIPART_THRESHOLD): And(Use(to_size),
+                                                          is_whole),
+        Optional(SECTION_REMOTE_MULTIPART_CHUNKSIZE): And(Use(to_size),
+                                                          is_whole),
+        Optional(SECTION_REMOTE_MULTIPART_CONCURRENCY): And(Use(int),
+                                                            is_whole),
+        Optional(SECTION_REMOTE_MAX_CONNECTIONS): And(Use(int), is_whole),
     }
 
     SECTION_STATE = 'state'
@@ -171,7 +231,8 @@ class Config(object):
 
     SCHEMA = {
         Optional(SECTION_CORE, default={}): SECTION_CORE_SCHEMA,
-        Optional(Regex(SECTION_REMOTE_REGEX)): SECTION_REMOTE_SCHEMA,
+        Optional(Regex(SECTION_REMOTE_REGEX)): And(SECTION_REMOTE_SCHEMA,
+                                                   supported_compress_level),
         Optional(SECTION_CACHE, default={}): SECTION_CACHE_SCHEMA,
         Optional(SECTION_STATE, default={}): SECTION_STATE_SCHEMA,
 
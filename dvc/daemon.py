@@ -0,0 +1,37 @@
+import os
+import sys
+from subprocess import Popen
+
+from dvc.logger import Logger
+from dvc.utils import fix_env
+
+
+CREATE_NEW_PROCESS_GROUP = 0x00000200
+DETACHED_PROCESS = 0x00000008
+
+
+def daemon(args, cwd=None):
+    """ Launch 'dvc daemon <args>' detached from the current process """
+    cmd = [sys.executable]
+    # NOTE: binary built by PyInstaller is dvc itself
+    if not getattr(sys, 'frozen', False):
+        cmd += ['-m', 'dvc']
+    cmd += ['daemon'] + args + ['-q']
+
+    kwargs = {}
+    if os.name == 'nt':
+        kwargs['creationflags'] = CREATE_NEW_PROCESS_GROUP | DETACHED_PROCESS
+    else:
+        kwargs['preexec_fn'] = os.setsid
+
+    Logger.debug("Launching daemon '{}'".format(' '.join(cmd)))
+
+    with open(os.devnull, 'r+b') as devnull:
+        Popen(cmd,
+              cwd=cwd,
+              env=fix_env(None),
+              stdin=devnull,
+              stdout=devnull,
+              stderr=devnull,
+              close_fds=True,
+              **kwargs)
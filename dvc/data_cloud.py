@@ -81,6 +81,15 @@ class DataCloud(object):
             Logger.warn('Using obsoleted config format. Consider updating.')
 
         cloud = cloud_type(self.project, cloud_config)
+        cloud.pack = cloud_config.get(Config.SECTION_REMOTE_PACK, False)
+
+        # NOTE: 'none' keeps objects with a header, so that the ones that
+        # were compressed earlier can still be decoded
+        codec = cloud_config.get(Config.SECTION_REMOTE_COMPRESS, None)
+        if codec:
+            cloud.compress = codec
+            cloud.compress_level = cloud_config.get(
+                Config.SECTION_REMOTE_COMPRESS_LEVEL, None)
         return cloud
 
     def _get_cloud(self, remote, cmd):
@@ -107,7 +116,12 @@ class DataCloud(object):
                                                                     'push'),
                                              show_checksums=show_checksums)
 
-    def pull(self, targets, jobs=1, remote=None, show_checksums=False):
+    def pull(self,
+             targets,
+             jobs=1,
+             remote=None,
+             show_checksums=False,
+             callback=None):
         """
         Pull data items in a cloud-agnostic way.
         """
@@ -115,7 +129,26 @@ class DataCloud(object):
                                              jobs=jobs,
                                              remote=self._get_cloud(remote,
                                                                     'pull'),
-                                             show_checksums=show_checksums)
+                                             show_checksums=show_checksums,
+                                             callback=callback)
+
+    def transfer(self,
+                 targets,
+                 jobs=1,
+                 from_remote=None,
+                 remote=None,
+                 show_checksums=False):
+        """
+        Copy data items from one remote to another without saving them to
+        the local cache.
+        """
+        src = self._init_remote(from_remote)
+        dest = self._get_cloud(remote, 'push')
+        return self.project.cache.local.transfer(targets,
+                                                 src,
+                                                 dest,
+                                                 jobs=jobs,
+                                                 show_checksums=show_checksums)
 
     def status(self, targets, jobs=1, remote=None, show_checksums=False):
         """
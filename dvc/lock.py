@@ -1,41 +1,91 @@
 import os
 import time
-import zc.lockfile
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+    import msvcrt
 
 from dvc.exceptions import DvcException
+from dvc.logger import Logger
 
 
 class LockError(DvcException):
     pass
 
 
+def try_lock(fobj, shared):
+    """ Non-blocking flock, returns False if somebody else holds it """
+    if fcntl is None:  # pragma: no cover
+        # NOTE: msvcrt has no shared locks, so everyone is a writer on
+        # windows.
+        try:
+            msvcrt.locking(fobj.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except (IOError, OSError):
+            return False
+
+    flags = (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | fcntl.LOCK_NB
+    try:
+        fcntl.flock(fobj.fileno(), flags)
+        return True
+    except (IOError, OSError):
+        return False
+
+
 class Lock(object):
+    """
+    Project lock, shared by read-only commands and exclusive for the ones
+    that modify the project.
+
+    Everyone lines up on a second 'queue' lock before taking the main one,
+    so that a waiting writer holds new readers back instead of being
+    starved by them.
+    """
     LOCK_FILE = 'lock'
+    QUEUE_FILE = 'lock.queue'
     TIMEOUT = 5
+    INTERVAL = 0.1
 
-    def __init__(self, dvc_dir, name=LOCK_FILE):
+    def __init__(self, dvc_dir, name=LOCK_FILE, timeout=None):
         self.lock_file = os.path.join(dvc_dir, name)
+        self.queue_file = os.path.join(dvc_dir, self.QUEUE_FILE)
+        self.timeout = self.TIMEOUT if timeout is None else timeout
         self._lock = None
+        self.shared = False
 
-    def _do_lock(self):
-        try:
-            self._lock = zc.lockfile.LockFile(self.lock_file)
-        except zc.lockfile.LockError:
-            raise LockError('Cannot perform the cmd since DVC is busy and '
-                            'locked. Please retry the cmd later.')
+    def _wait(self, path, shared, deadline):
+        fobj = open(path, 'a+')
+        while not try_lock(fobj, shared):
+            if time.time() >= deadline:
+                fobj.close()
+                raise LockError('Cannot perform the cmd since DVC is busy '
+                                'and locked. Please retry the cmd later.')
+            time.sleep(self.INTERVAL)
+        return fobj
+
+    def lock(self, shared=False):
+        start = time.time()
+        deadline = start + self.timeout
 
-    def lock(self):
+        queue = self._wait(self.queue_file, False, deadline)
         try:
-            self._do_lock()
-            return
-        except LockError:
-            time.sleep(self.TIMEOUT)
+            self._lock = self._wait(self.lock_file, shared, deadline)
+        finally:
+            queue.close()
+        self.shared = shared
 
-        self._do_lock()
+        waited = time.time() - start
+        if waited >= self.INTERVAL:
+            msg = 'Waited {:.2f} seconds for {} lock'
+            Logger.debug(msg.format(waited,
+                                    'shared' if shared else 'exclusive'))
 
     def unlock(self):
         self._lock.close()
         self._lock = None
+        self.shared = False
 
     def __enter__(self):
         self.lock()
@@ -0,0 +1,53 @@
+import os
+import posixpath
+
+from dvc.exceptions import OutputDuplicationError
+
+
+class OutputIndex(object):
+    """ Outputs by path, matched with one dict lookup per path component """
+    def __init__(self, outs=None):
+        self._by_path = {}
+        for out in outs or []:
+            self.add(out)
+
+    def __len__(self):
+        return len(self._by_path)
+
+    def __contains__(self, path):
+        return path in self._by_path
+
+    def add(self, out):
+        existing = self._by_path.get(out.path, None)
+        if existing is not None:
+            stages = [out.stage.relpath, existing.stage.relpath]
+            raise OutputDuplicationError(out.path, stages)
+        self._by_path[out.path] = out
+
+    def get(self, path):
+        return self._by_path.get(path, None)
+
+    @staticmethod
+    def _parents(path, sep):
+        dirname = os.path.dirname if sep == os.sep else posixpath.dirname
+        while True:
+            parent = dirname(path)
+            if not parent or parent == path:
+                return
+            yield parent
+            path = parent
+
+    def find(self, path, sep=os.sep):
+        """ Outputs that are either `path` itself or one of its parents. """
+        ret = []
+
+        out = self._by_path.get(path, None)
+        if out is not None:
+            ret.append(out)
+
+        for parent in self._parents(path, sep):
+            out = self._by_path.get(parent, None)
+            if out is not None and path.startswith(out.path + out.sep):
+                ret.append(out)
+
+        return ret
@@ -18,6 +18,7 @@ class ReproductionError(DvcException):
 
 class Project(object):
     DVC_DIR = '.dvc'
+    TMP_DIR = 'tmp'
 
     def __init__(self, root_dir):
         from dvc.logger import Logger
@@ -26,7 +27,6 @@ class Project(object):
         from dvc.lock import Lock
         from dvc.scm import SCM
         from dvc.cache import Cache
-        from dvc.data_cloud import DataCloud
         from dvc.updater import Updater
         from dvc.prompt import Prompt
 
@@ -34,26 +34,70 @@ class Project(object):
         self.dvc_dir = os.path.join(self.root_dir, self.DVC_DIR)
 
         self.config = Config(self.dvc_dir)
+
+        # NOTE: scratch space for things that shouldn't be left behind in
+        # the cache dir if we get killed
+        self.tmp_dir = os.path.join(self.dvc_dir, self.TMP_DIR)
+        if not os.path.isdir(self.tmp_dir):
+            try:
+                os.mkdir(self.tmp_dir)
+            except OSError:
+                # NOTE: another command has just created it
+                pass
         self.scm = SCM(self.root_dir, project=self)
-        self.lock = Lock(self.dvc_dir)
         # NOTE: storing state and link_state in the repository itself to avoid
         # any possible state corruption in 'shared cache dir' scenario.
         self.state = State(self, self.config._config)
 
         core = self.config._config[Config.SECTION_CORE]
         self.logger = Logger(core.get(Config.SECTION_CORE_LOGLEVEL, None))
+        self.lock = Lock(self.dvc_dir,
+                         timeout=core.get(Config.SECTION_CORE_LOCK_TIMEOUT))
 
         self.cache = Cache(self)
-        self.cloud = DataCloud(self, config=self.config._config)
         self.updater = Updater(self.dvc_dir)
         self.prompt = Prompt()
 
         self._files_to_git_add = []
+        self._cloud = None
+
+        self._reset()
 
         self._ignore()
 
         self.updater.check()
 
+    @property
+    def cloud(self):
+        # NOTE: remotes are only needed by a few commands, so DataCloud is
+        # only constructed on first use.
+        if self._cloud is None:
+            from dvc.data_cloud import DataCloud
+
+            self._cloud = DataCloud(self, config=self.config._config)
+        return self._cloud
+
+    def _reset(self):
+        self._memo = {}
+        self._memo_lock = None
+
+    def _memoize(self, name, func):
+        # NOTE: stages, DAG and pipelines are only reused while we are
+        # holding the project lock, so nobody but us could have changed
+        # stage files in the meantime. Stage.dump() and Stage.remove()
+        # reset them explicitly.
+        if self.lock._lock is None:
+            return func()
+
+        if self._memo_lock is not self.lock._lock:
+            self._memo = {}
+            self._memo_lock = self.lock._lock
+
+        if name not in self._memo:
+            self._memo[name] = func()
+
+        return self._memo[name]
+
     def _remind_to_git_add(self):
         if len(self._files_to_git_add) == 0:
             return
@@ -111,16 +155,19 @@ class Project(object):
     def destroy(self):
         import shutil
 
-        for stage in self.stages():
-            stage.remove()
+        with self.scm:
+            for stage in self.stages():
+                stage.remove()
 
         shutil.rmtree(self.dvc_dir)
 
     def _ignore(self):
         flist = [self.state.state_file,
                  self.lock.lock_file,
+                 self.lock.queue_file,
                  self.config.config_local_file,
-                 self.updater.updater_file]
+                 self.updater.updater_file,
+                 self.tmp_dir]
 
         if self.cache.local.cache_dir.startswith(self.root_dir):
             flist += [self.cache.local.cache_dir]
@@ -133,19 +180,27 @@ class Project(object):
     def to_dvc_path(self, path):
         return os.path.relpath(path, self.root_dir)
 
-    def _check_output_duplication(self, outs):
+    def _outs_index(self, stages):
+        from dvc.output.index import OutputIndex
+
+        return OutputIndex([out for stage in stages for out in stage.outs])
+
+    def _check_output_duplication(self, outs, index=None):
         from dvc.exceptions import OutputDuplicationError
 
-        for stage in self.stages():
-            for o in stage.outs:
-                for out in outs:
-                    if o.path == out.path and o.stage.path != out.stage.path:
-                        stages = [o.stage.relpath, out.stage.relpath]
-                        raise OutputDuplicationError(o.path, stages)
+        if index is None:
+            index = self._outs_index(self.stages())
+
+        for out in outs:
+            o = index.get(out.path)
+            if o is not None and o.stage.path != out.stage.path:
+                stages = [o.stage.relpath, out.stage.relpath]
+                raise OutputDuplicationError(o.path, stages)
 
     def add(self, fname, recursive=False):
         fnames = []
         if recursive and os.path.isdir(fname):
+            tracked = set(self.scm.tracked_files())
             fnames = []
             for root, dirs, files in os.walk(fname):
                 for f in files:
@@ -154,25 +209,46 @@ class Project(object):
                         continue
                     if os.path.basename(path) == self.scm.ignore_file():
                         continue
-                    if self.scm.is_tracked(path):
+                    if os.path.abspath(path) in tracked:
                         continue
                     fnames.append(path)
         else:
             fnames = [fname]
 
+        index = self._outs_index(self.stages())
+
         stages = []
+        for f in fnames:
+            stage = Stage.loads(project=self,
+                                outs=[f],
+                                add=True)
+
+            self._check_output_duplication(stage.outs, index=index)
+            for out in stage.outs:
+                if index.get(out.path) is None:
+                    index.add(out)
+
+            stages.append(stage)
+
+        saved = []
         self._files_to_git_add = []
-        with self.state:
-            for f in fnames:
-                stage = Stage.loads(project=self,
-                                    outs=[f],
-                                    add=True)
+        with self.state, self.scm:
+            if len(fnames) > 1:
+                self.state.update_files([out.path
+                                         for stage in stages
+                                         for out in stage.outs])
 
-                self._check_output_duplication(stage.outs)
+            try:
+                for stage in stages:
+                    stage.save()
+                    saved.append(stage)
+            finally:
+                # NOTE: dumping whatever we've managed to save, so that
+                # data that was already moved to cache is not lost.
+                for stage in saved:
+                    stage.dump()
 
-                stage.save()
-                stage.dump()
-                stages.append(stage)
+            self._evict()
 
         self._remind_to_git_add()
 
@@ -202,7 +278,7 @@ class Project(object):
 
         found = False
         self._files_to_git_add = []
-        with self.state:
+        with self.state, self.scm:
             for stage in self.stages():
                 for out in stage.outs:
                     if out.path != from_out.path:
@@ -336,7 +412,7 @@ class Project(object):
         self._files_to_git_add = []
 
         ret = []
-        with self.state:
+        with self.state, self.scm:
             for target in targets:
                 stages = self._reproduce(target,
                                          recursive=recursive,
@@ -400,9 +476,36 @@ class Project(object):
                 used.append(out.path)
         self.state.remove_unused_links(used)
 
+    def _find_dir_subpath(self, target, stages):
+        """
+        Output and (unix) relpath inside of it for a target that points
+        into a directory output, (None, None) otherwise.
+        """
+        if not target or Stage.is_stage_file(target):
+            return (None, None)
+
+        path = os.path.abspath(target)
+        for out in self._outs_index(stages).find(path):
+            if out.path == path or not out.use_cache:
+                continue
+            if out.path_info['scheme'] != 'local':
+                continue
+            relpath = os.path.relpath(path, out.path)
+            return (out, self.cache.local.unixpath(relpath))
+
+        return (None, None)
+
     def checkout(self, target=None):
         all_stages = self.active_stages()
 
+        out, prefix = self._find_dir_subpath(target, all_stages)
+        if out is not None:
+            with self.state:
+                self.cache.local.checkout(out.path_info,
+                                          out.info,
+                                          prefix=prefix)
+            return
+
         if target:
             stages = [Stage.load(self, target)]
         else:
@@ -419,6 +522,87 @@ class Project(object):
 
                 stage.checkout()
 
+    def _load_tree_stages(self, tree, parsed, loaded):
+        import copy
+        import yaml
+
+        stages = []
+        for relpath, sha in tree:
+            path = os.path.join(self.root_dir, os.path.normpath(relpath))
+            if not Stage.is_stage_filename(path):
+                continue
+
+            if path.startswith(self.dvc_dir + os.sep):
+                continue
+
+            # NOTE: the same stage file is usually the same in most of the
+            # branches, so each blob is only read and parsed once.
+            stage = loaded.get((path, sha), None)
+            if stage is None:
+                d = parsed.get(sha, None)
+                if d is None:
+                    d = yaml.safe_load(self.scm.read_blob(sha))
+                    parsed[sha] = d
+                stage = Stage.loadd(self, copy.deepcopy(d), path)
+                loaded[(path, sha)] = stage
+
+            stages.append(stage)
+
+        return stages
+
+    def _load_branch_stages(self, branch, parsed, loaded):
+        tree = self.scm.list_tree(branch)
+        return tree, self._load_tree_stages(tree, parsed, loaded)
+
+    def _branch_stages(self, target=None, all_branches=False):
+        """
+        Yields (branch, tree, stages) for the workspace and, if all_branches
+        is set, for every other branch, reading stage files straight from git
+        objects instead of checking branches out. Tree is the list of
+        (path, blob sha) committed to the branch or None for the workspace.
+        """
+        from multiprocessing import cpu_count
+        from concurrent.futures import ThreadPoolExecutor
+        from dvc.scm import Git
+        from dvc.stage import StageFileDoesNotExistError
+
+        if target:
+            stages = [Stage.load(self, target)]
+        else:
+            stages = self.stages()
+
+        # NOTE: without git there is nothing but the workspace
+        if not all_branches or not isinstance(self.scm, Git):
+            yield '', None, stages
+            return
+
+        saved = self.scm.active_branch()
+        yield saved or '', None, stages
+
+        branches = [b for b in self.scm.list_branches() or [] if b != saved]
+        if len(branches) == 0:
+            return
+
+        # NOTE: branches are listed and their stage files are parsed in
+        # parallel. Blobs and stages that are shared by branches are
+        # mostly parsed once, a race only means parsing one twice.
+        parsed = {}
+        loaded = {}
+        with ThreadPoolExecutor(max_workers=cpu_count()) as executor:
+            futures = [executor.submit(self._load_branch_stages,
+                                       branch,
+                                       parsed,
+                                       loaded)
+                       for branch in branches]
+            for branch, f in zip(branches, futures):
+                tree, stages = f.result()
+                if target:
+                    path = os.path.abspath(target)
+                    stages = [s for s in stages if s.path == path]
+                    if len(stages) == 0:
+                        raise StageFileDoesNotExistError(target)
+                yield branch, tree, stages
+
     def _used_cache(self, target=None, all_branches=False, active=True):
         cache = {}
         cache['local'] = []
@@ -427,13 +611,9 @@ class Project(object):
         cache['hdfs'] = []
         cache['ssh'] = []
 
-        for branch in self.scm.brancher(all_branches=all_branches):
-            if target:
-                stages = [Stage.load(self, target)]
-            elif active:
-                stages = self.active_stages()
-            else:
-                stages = self.stages()
+        for branch, _, stages in self._branch_stages(target, all_branches):
+            if active and not target:
+                stages = self._active_stages_of(stages)
 
             for stage in stages:
                 if active and not target and stage.locked:
@@ -452,6 +632,15 @@ class Project(object):
 
         return cache
 
+    def _evict(self, all_branches=False):
+        if not self.cache.local.size_limit:
+            return
+
+        clist = self._used_cache(target=None,
+                                 all_branches=all_branches,
+                                 active=False)
+        self.cache.local.evict(clist)
+
     def _do_gc(self, typ, func, clist):
         removed = func(clist)
         if not removed:
@@ -488,9 +677,20 @@ class Project(object):
              jobs=1,
              remote=None,
              all_branches=False,
-             show_checksums=False):
+             show_checksums=False,
+             from_remote=None):
         with self.state:
-            self.cloud.push(self._used_cache(target, all_branches)['local'],
+            clist = self._used_cache(target, all_branches)['local']
+
+            if from_remote:
+                self.cloud.transfer(clist,
+                                    jobs,
+                                    from_remote=from_remote,
+                                    remote=remote,
+                                    show_checksums=show_checksums)
+                return
+
+            self.cloud.push(clist,
                             jobs,
                             remote=remote,
                             show_checksums=show_checksums)
@@ -502,7 +702,15 @@ class Project(object):
               all_branches=False,
               show_checksums=False):
         with self.state:
-            self.cloud.pull(self._used_cache(target, all_branches)['local'],
+            out, prefix = self._find_dir_subpath(target, self.active_stages())
+            if out is not None:
+                info = out.dumpd()
+                info[self.cache.local.PARAM_PREFIX] = prefix
+                clist = [info]
+            else:
+                clist = self._used_cache(target, all_branches)['local']
+
+            self.cloud.pull(clist,
                             jobs,
                             remote=remote,
                             show_checksums=show_checksums)
@@ -513,12 +721,49 @@ class Project(object):
              remote=None,
              all_branches=False,
              show_checksums=False):
-        self.fetch(target,
-                   jobs,
-                   remote=remote,
-                   all_branches=all_branches,
-                   show_checksums=show_checksums)
-        self.checkout(target=target)
+        from dvc.checkout import CheckoutQueue
+
+        all_stages = self.active_stages()
+
+        out, _ = self._find_dir_subpath(target, all_stages)
+        if out is not None:
+            self.fetch(target,
+                       jobs,
+                       remote=remote,
+                       all_branches=all_branches,
+                       show_checksums=show_checksums)
+            self.checkout(target=target)
+            with self.state:
+                self._evict(all_branches=all_branches)
+            return
+
+        if target:
+            stages = [Stage.load(self, target)]
+        else:
+            stages = all_stages
+
+        with self.state:
+            self._cleanup_unused_links(all_stages)
+
+            for stage in stages:
+                if stage.locked:
+                    msg = 'DVC file \'{}\' is locked. Its dependecies are ' \
+                          'not going to be checked out.'
+                    self.logger.warn(msg.format(stage.relpath))
+
+            # NOTE: checking outputs out as soon as their data arrives,
+            # so that stages become ready while the rest is downloading.
+            queue = CheckoutQueue(self, stages)
+            self.cloud.pull(self._used_cache(target, all_branches)['local'],
+                            jobs,
+                            remote=remote,
+                            show_checksums=show_checksums,
+                            callback=queue)
+
+            for stage in queue.pending:
+                stage.checkout()
+
+            self._evict(all_branches=all_branches)
 
     def _local_status(self, target=None):
         status = {}
@@ -576,20 +821,80 @@ class Project(object):
                                           show_checksums=show_checksums)
             return self._local_status(target)
 
+    @staticmethod
+    def _json_prefix(path):
+        """ ijson prefix for plain 'a.b.c' jsonpaths or None otherwise """
+        from jsonpath_rw.jsonpath import Child, Fields
+
+        if isinstance(path, Child):
+            left = Project._json_prefix(path.left)
+            right = Project._json_prefix(path.right)
+            if left is None or right is None:
+                return None
+            return left + '.' + right
+
+        if isinstance(path, Fields) and len(path.fields) == 1:
+            field = path.fields[0]
+            if field != '*' and '.' not in field:
+                return field
+
+        return None
+
+    def _ijson_prefix(self, json_path):
+        """
+        Prefix to parse json_path incrementally with, if it is a plain one
+        and ijson is installed, None otherwise.
+        """
+        from jsonpath_rw import parse
+        from dvc.utils import module_available
+
+        if not module_available('ijson'):
+            return None
+        return self._json_prefix(parse(json_path))
+
     def _read_metric_json(self, fd, json_path):
+        """
+        fd is expected to be binary if there is _ijson_prefix() for
+        json_path and text otherwise.
+        """
         import json
         from jsonpath_rw import parse
 
-        parser = parse(json_path)
-        return [x.value for x in parser.find(json.load(fd))]
+        # NOTE: for plain paths, parse the document incrementally and stop
+        # as soon as we've got the value, so we never load it all.
+        prefix = self._ijson_prefix(json_path)
+        if prefix is not None:
+            import ijson
+
+            for value in ijson.items(fd, prefix, use_float=True):
+                return [value]
+            return []
+
+        return [x.value for x in parse(json_path).find(json.load(fd))]
+
+    @staticmethod
+    def _read_xsv_row(reader, row):
+        import collections
+
+        if row >= 0:
+            for i, r in enumerate(reader):
+                if i == row:
+                    return r
+            raise IndexError('row {} is out of range'.format(row))
+
+        # NOTE: only keeping as many rows as we need to count from the end
+        rows = collections.deque(reader, maxlen=-row)
+        if len(rows) < -row:
+            raise IndexError('row {} is out of range'.format(row))
+        return rows[0]
 
     def _do_read_metric_xsv(self, reader, row, col):
         if col is not None and row is not None:
-            return [reader[row][col]]
+            return [self._read_xsv_row(reader, row)[col]]
         elif col is not None:
             return [r[col] for r in reader]
         elif row is not None:
-            return reader[row]
+            return self._read_xsv_row(reader, row)
         return None
 
     def _read_metric_hxsv(self, fd, hxsv_path, delimiter):
@@ -597,7 +902,7 @@ class Project(object):
 
         col, row = hxsv_path.split(',')
         row = int(row)
-        reader = list(csv.DictReader(fd, delimiter=delimiter))
+        reader = csv.DictReader(fd, delimiter=delimiter)
         return self._do_read_metric_xsv(reader, row, col)
 
     def _read_metric_xsv(self, fd, xsv_path, delimiter):
@@ -606,17 +911,56 @@ class Project(object):
         col, row = xsv_path.split(',')
         row = int(row)
         col = int(col)
-        reader = list(csv.reader(fd, delimiter=delimiter))
+        reader = csv.reader(fd, delimiter=delimiter)
         return self._do_read_metric_xsv(reader, row, col)
 
-    def _read_metric(self, path, typ=None, xpath=None):
-        ret = None
+    def _open_metric(self, path, out=None, blobs=None, binary=False):
+        """
+        Opens metric file as of the workspace or, if blobs (a dict of
+        absolute paths to blob shas) is given, as of the branch it was
+        listed from. Cached outputs are read from the cache by checksum and
+        the rest straight from git objects, so nothing is checked out.
+        """
+        import io
+
+        mode = 'rb' if binary else 'r'
 
-        if not os.path.exists(path):
-            return ret
+        if blobs is None and os.path.exists(path):
+            return open(path, mode)
+
+        if out is not None \
+           and out.path_info['scheme'] == 'local' \
+           and out.use_cache \
+           and out.md5 \
+           and not self.cache.local.is_dir_cache(out.md5) \
+           and os.path.isfile(out.cache):
+            return open(out.cache, mode)
+
+        sha = blobs.get(path, None) if blobs else None
+        if sha is None:
+            return None
+
+        data = self.scm.read_blob(sha)
+        if binary:
+            return io.BytesIO(data)
+        return io.StringIO(data.decode('utf-8'))
+
+    def _read_metric(self, path, typ=None, xpath=None, out=None, blobs=None):
+        ret = None
 
         try:
-            with open(path, 'r') as fd:
+            # NOTE: incremental parser takes json as bytes, so that it
+            # doesn't have to encode it back, while json.load() only takes
+            # text on older pythons.
+            binary = typ == 'json' and self._ijson_prefix(xpath) is not None
+            fd = self._open_metric(path,
+                                   out=out,
+                                   blobs=blobs,
+                                   binary=binary)
+            if fd is None:
+                return ret
+
+            with fd:
                 if typ == 'json':
                     ret = self._read_metric_json(fd, xpath)
                 elif typ == 'csv':
@@ -637,73 +981,92 @@ class Project(object):
 
     def _find_output_by_path(self, path, outs=None):
         from dvc.exceptions import OutputDuplicationError
+        from dvc.output.index import OutputIndex
 
         if not outs:
-            astages = self.active_stages()
-            outs = [out for stage in astages for out in stage.outs]
+            index = self._outs_index(self.active_stages())
+        else:
+            index = OutputIndex()
+            for out in outs:
+                existing = index.get(out.path)
+                if existing is not None:
+                    stages = [existing.stage.relpath, out.stage.relpath]
+                    raise OutputDuplicationError(path, stages)
+                index.add(out)
 
-        abs_path = os.path.abspath(path)
-        matched = [out for out in outs if out.path == abs_path]
-        stages = [out.stage.relpath for out in matched]
-        if len(stages) > 1:
-            raise OutputDuplicationError(path, stages)
+        return index.get(os.path.abspath(path))
+
+    def _metrics_entries(self, outs, path=None, typ=None, xpath=None):
+        if path:
+            out = self._find_output_by_path(path, outs=outs) if outs else None
+            if out and all([out.metric,
+                            not typ,
+                            isinstance(out.metric, dict)]):
+                return [(os.path.abspath(path),
+                         out.metric.get(out.PARAM_METRIC_TYPE, None),
+                         out.metric.get(out.PARAM_METRIC_XPATH, None),
+                         out)]
+            return [(os.path.abspath(path), typ, xpath, out)]
+
+        entries = []
+        for o in outs:
+            if not o.metric:
+                continue
 
-        return matched[0] if matched else None
+            if not typ and isinstance(o.metric, dict):
+                t = o.metric.get(o.PARAM_METRIC_TYPE, typ)
+                x = o.metric.get(o.PARAM_METRIC_XPATH, xpath)
+            else:
+                t = typ
+                x = xpath
+            entries.append((o.path, t, x, o))
+        return entries
 
     def metrics_show(self,
                      path=None,
                      typ=None,
                      xpath=None,
                      all_branches=False):
+        """
+        Returns {branch: {metric path: value}} for the workspace and, if
+        all_branches is set, for every other branch as committed, without
+        checking any of them out.
+        """
         res = {}
-        for branch in self.scm.brancher(all_branches=all_branches):
-            astages = self.active_stages()
+        for branch, tree, stages in self._branch_stages(
+                                        all_branches=all_branches):
+            if tree is None:
+                astages = self.active_stages()
+                blobs = None
+            else:
+                astages = self._active_stages_of(stages)
+                blobs = {}
+                for relpath, sha in tree:
+                    fname = os.path.join(self.root_dir,
+                                         os.path.normpath(relpath))
+                    blobs[fname] = sha
+
             outs = [out for stage in astages for out in stage.outs]
+            entries = self._metrics_entries(outs, path, typ, xpath)
 
-            if path:
-                out = self._find_output_by_path(path, outs=outs)
-                stage = out.stage.path if out else None
-                if out and all([out.metric,
-                                not typ,
-                                isinstance(out.metric, dict)]):
-                    entries = [(path,
-                                out.metric.get(out.PARAM_METRIC_TYPE, None),
-                                out.metric.get(out.PARAM_METRIC_XPATH, None))]
-                else:
-                    entries = [(path, typ, xpath)]
-            else:
-                metrics = filter(lambda o: o.metric, outs)
-                stage = None
-                entries = []
-                for o in metrics:
-                    if not typ and isinstance(o.metric, dict):
-                        t = o.metric.get(o.PARAM_METRIC_TYPE, typ)
-                        x = o.metric.get(o.PARAM_METRIC_XPATH, xpath)
-                    else:
-                        t = typ
-                        x = xpath
-                    entries.append((o.path, t, x))
-
-            for fname, t, x in entries:
-                if stage:
-                    self.checkout(stage)
-
-                rel = os.path.relpath(fname)
+            for fname, t, x, out in entries:
                 metric = self._read_metric(fname,
                                            typ=t,
-                                           xpath=x)
+                                           xpath=x,
+                                           out=out,
+                                           blobs=blobs)
                 if not metric:
                     continue
 
                 if branch not in res:
                     res[branch] = {}
 
-                res[branch][rel] = metric
+                res[branch][os.path.relpath(fname)] = metric
 
-        for branch, val in res.items():
+        for branch in sorted(res.keys()):
             if all_branches:
                 self.logger.info('{}:'.format(branch))
-            for fname, metric in val.items():
+            for fname, metric in sorted(res[branch].items()):
                 self.logger.info('\t{}: {}'.format(fname, metric))
 
         if res:
@@ -716,6 +1079,131 @@ class Project(object):
                   'Use \'dvc metrics add\' to add a metric file to track.'
         raise DvcException(msg)
 
+    def _metric_at(self, rev, fname, typ, xpath, out, parsed, loaded):
+        """
+        Metric value as of commit rev, remembered in the state db, so that
+        every commit is only read from git once.
+        """
+        relpath = os.path.relpath(fname, self.root_dir).replace(os.sep, '/')
+        found, value = self.state.get_metric(rev, relpath, typ, xpath)
+        if found:
+            return value
+
+        if out is not None and out.use_cache:
+            # NOTE: cached metrics are found by the checksum that rev's
+            # version of the stage file has for them.
+            tree = []
+            sha = self.scm.find_blob(rev, out.stage.path)
+            if sha:
+                tree.append((os.path.relpath(out.stage.path, self.root_dir),
+                             sha))
+            stages = self._load_tree_stages(tree, parsed, loaded)
+            outs = [o for stage in stages for o in stage.outs
+                    if o.path == fname]
+            if outs:
+                value = self._read_metric(fname,
+                                          typ=typ,
+                                          xpath=xpath,
+                                          out=outs[0],
+                                          blobs={})
+                if value is None:
+                    # NOTE: not in the local cache, might be pulled later
+                    return None
+        else:
+            sha = self.scm.find_blob(rev, fname)
+            value = self._read_metric(fname,
+                                      typ=typ,
+                                      xpath=xpath,
+                                      blobs={fname: sha} if sha else {})
+
+        self.state.update_metric(rev, relpath, typ, xpath, value)
+        return value
+
+    def _metrics_workspace_entries(self, path=None, typ=None, xpath=None):
+        outs = [out for stage in self.active_stages() for out in stage.outs]
+        entries = self._metrics_entries(outs, path, typ, xpath)
+        if entries:
+            return entries
+
+        msg = 'No metric files in this repository. ' \
+              'Use \'dvc metrics add\' to add a metric file to track.'
+        raise DvcException(msg)
+
+    def metrics_history(self,
+                        path=None,
+                        typ=None,
+                        xpath=None,
+                        rev='HEAD',
+                        limit=None):
+        """
+        Returns {metric path: [(commit, value)]} for rev and its ancestors,
+        newest first.
+        """
+        entries = self._metrics_workspace_entries(path, typ, xpath)
+        commits = self.scm.rev_list(rev, limit)
+
+        res = {}
+        parsed = {}
+        loaded = {}
+        with self.state:
+            for fname, t, x, out in entries:
+                res[os.path.relpath(fname)] = [
+                    (commit, self._metric_at(commit, fname, t, x, out,
+                                             parsed, loaded))
+                    for commit in commits]
+
+        for fname in sorted(res.keys()):
+            self.logger.info('{}:'.format(fname))
+            for commit, metric in res[fname]:
+                self.logger.info('\t{}: {}'.format(commit[:7], metric))
+
+        return res
+
+    def _resolve_rev(self, rev):
+        commits = self.scm.rev_list(rev, 1)
+        if not commits:
+            raise DvcException('\'{}\' is not a valid revision'.format(rev))
+        return commits[0]
+
+    def metrics_diff(self,
+                     a_rev='HEAD',
+                     b_rev=None,
+                     path=None,
+                     typ=None,
+                     xpath=None):
+        """
+        Returns {metric path: (old, new)} for metrics that differ between
+        a_rev and b_rev, where b_rev of None stands for the workspace.
+        """
+        entries = self._metrics_workspace_entries(path, typ, xpath)
+        a_commit = self._resolve_rev(a_rev)
+        b_commit = self._resolve_rev(b_rev) if b_rev else None
+
+        res = {}
+        parsed = {}
+        loaded = {}
+        with self.state:
+            for fname, t, x, out in entries:
+                old = self._metric_at(a_commit, fname, t, x, out,
+                                      parsed, loaded)
+                if b_commit:
+                    new = self._metric_at(b_commit, fname, t, x, out,
+                                          parsed, loaded)
+                else:
+                    new = self._read_metric(fname, typ=t, xpath=x, out=out)
+
+                if old != new:
+                    res[os.path.relpath(fname)] = (old, new)
+
+        if not res:
+            self.logger.info('Metrics didn\'t change.')
+
+        for fname in sorted(res.keys()):
+            old, new = res[fname]
+            self.logger.info('\t{}: {} -> {}'.format(fname, old, new))
+
+        return res
+
     def _metrics_modify(self, path, typ=None, xpath=None, delete=False):
         out = self._find_output_by_path(path)
         if not out:
@@ -759,23 +1247,16 @@ class Project(object):
         self._metrics_modify(path, delete=True)
 
     def graph(self):
+        return self._memoize('graph',
+                             lambda: self._build_graph(self.stages()))
+
+    def _build_graph(self, stages):
         import networkx as nx
-        from dvc.exceptions import OutputDuplicationError
 
         G = nx.DiGraph()
         G_active = nx.DiGraph()
-        stages = self.stages()
 
-        outs = []
-        outs_by_path = {}
-        for stage in stages:
-            for o in stage.outs:
-                existing = outs_by_path.get(o.path, None)
-                if existing is not None:
-                    stages = [o.stage.relpath, existing.stage.relpath]
-                    raise OutputDuplicationError(o.path, stages)
-                outs.append(o)
-                outs_by_path[o.path] = o
+        outs = self._outs_index(stages)
 
         # collect the whole DAG
         for stage in stages:
@@ -785,11 +1266,7 @@ class Project(object):
             G_active.add_node(node, stage=stage)
 
             for dep in stage.deps:
-                for out in outs:
-                    if out.path != dep.path \
-                       and not dep.path.startswith(out.path + out.sep):
-                        continue
-
+                for out in outs.find(dep.path, dep.sep):
                     dep_stage = out.stage
                     dep_node = os.path.relpath(dep_stage.path, self.root_dir)
                     G.add_node(dep_node, stage=dep_stage)
@@ -801,9 +1278,12 @@ class Project(object):
         return G, G_active
 
     def pipelines(self):
-        import networkx as nx
+        return list(self._memoize('pipelines',
+                                  lambda: self._collect_pipelines(
+                                      *self.graph())))
 
-        G, G_active = self.graph()
+    def _collect_pipelines(self, G, G_active):
+        import networkx as nx
 
         if len(G.nodes()) == 0:
             return []
@@ -826,8 +1306,11 @@ class Project(object):
         return pipelines
 
     def stages(self):
+        return list(self._memoize('stages', self._collect_stages))
+
+    def _collect_stages(self):
         stages = []
-        outs = []
+        outs = set()
         for root, dirs, files in os.walk(self.root_dir):
             for fname in files:
                 path = os.path.join(root, fname)
@@ -835,16 +1318,17 @@ class Project(object):
                     continue
                 stage = Stage.load(self, path)
                 for out in stage.outs:
-                    outs.append(out.path + out.sep)
+                    outs.add(os.path.normpath(out.path))
                 stages.append(stage)
 
             def filter_dirs(dname):
                 path = os.path.join(root, dname)
                 if path == self.dvc_dir or path == self.scm.dir:
                     return False
-                for out in outs:
-                    if path == os.path.normpath(out) or path.startswith(out):
+                while path != self.root_dir:
+                    if path in outs:
                         return False
+                    path = os.path.dirname(path)
                 return True
 
             dirs[:] = list(filter(filter_dirs, dirs))
@@ -852,9 +1336,19 @@ class Project(object):
         return stages
 
     def active_stages(self):
+        return list(self._memoize('active_stages',
+                                  lambda: self._collect_active_stages(
+                                      self.pipelines())))
+
+    def _collect_active_stages(self, pipelines):
         import networkx as nx
 
         stages = []
-        for G in self.pipelines():
+        for G in pipelines:
             stages.extend(list(nx.get_node_attributes(G, 'stage').values()))
         return stages
+
+    def _active_stages_of(self, stages):
+        G, G_active = self._build_graph(stages)
+        pipelines = self._collect_pipelines(G, G_active)
+        return self._collect_active_stages(pipelines)
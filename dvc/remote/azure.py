@@ -1,11 +1,8 @@
 from __future__ import absolute_import
 import os
 import re
-
-try:
-    from azure.storage.blob import BlockBlobService
-except ImportError:
-    BlockBlobService = None
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
 
 from dvc.logger import Logger
 from dvc.progress import progress
@@ -26,9 +23,14 @@ class RemoteAzure(RemoteBase):
     REGEX = (r'^azure://'
              r'(ContainerName=(?P<container_name>[^;]+);?)?'
              r'(?P<connection_string>.+)?$')
-    REQUIRES = {'azure-storage-blob': BlockBlobService}
+    REQUIRES = {'azure-storage-blob': 'azure.storage.blob'}
     PARAM_ETAG = 'etag'
     COPY_POLL_SECONDS = 5
+    # NOTE: limits of the blob service API version that we use
+    BLOCK_SIZE_LIMIT = 100 * 1024 * 1024
+    SINGLE_PUT_SIZE_LIMIT = 256 * 1024 * 1024
+    # NOTE: number of prefixes that are listed at once in exists()
+    LIST_JOBS = 16
 
     def __init__(self, project, config):
         super(RemoteAzure, self).__init__(project, config)
@@ -37,9 +39,14 @@ class RemoteAzure(RemoteBase):
         self.url = config.get(Config.SECTION_REMOTE_URL)
         match = re.match(self.REGEX, self.url)
 
-        self.bucket = (
+        # NOTE: 'ContainerName=container/some/prefix' lets remotes share
+        # a container
+        container_name = (
             match.group('container_name')
-            or os.getenv('AZURE_STORAGE_CONTAINER_NAME'))
+            or os.getenv('AZURE_STORAGE_CONTAINER_NAME')
+            or '')
+        self.bucket, _, prefix = container_name.partition('/')
+        self.prefix = prefix.strip('/')
 
         self.connection_string = (
             match.group('connection_string')
@@ -51,15 +58,31 @@ class RemoteAzure(RemoteBase):
         if not self.connection_string:
             raise ValueError('Azure Storage connection string missing')
 
-        self.__blob_service = None
+        self._init_multipart(config)
+
+        self._blob_service = None
 
     @property
     def blob_service(self):
-        if self.__blob_service is None:
-            self.__blob_service = BlockBlobService(
+        if self._blob_service is None:
+            from azure.storage.blob import BlockBlobService
+
+            service = BlockBlobService(
                 connection_string=self.connection_string)
-            self.__blob_service.create_container(self.bucket)
-        return self.__blob_service
+            service.create_container(self.bucket)
+
+            # NOTE: blobs larger than that are transferred in blocks over
+            # several connections
+            threshold = min(self.multipart_threshold,
+                            self.SINGLE_PUT_SIZE_LIMIT)
+            block_size = min(self.multipart_chunksize, self.BLOCK_SIZE_LIMIT)
+            service.MAX_SINGLE_PUT_SIZE = threshold
+            service.MAX_BLOCK_SIZE = block_size
+            service.MAX_SINGLE_GET_SIZE = threshold
+            service.MAX_CHUNK_GET_SIZE = block_size
+
+            self._blob_service = service
+        return self._blob_service
 
 # FIXME: temporarily disabled because of the lack of test for external azure
 # dependencies/outputs/cache.
@@ -134,24 +157,43 @@ class RemoteAzure(RemoteBase):
         return [{
             'scheme': self.scheme,
             'bucket': self.bucket,
-            'key': '{}/{}'.format(md5[0:2], md5[2:])
+            'key': posixpath.join(self.prefix, md5[0:2], md5[2:])
         } for md5 in md5s]
 
-    def exists(self, path_infos):
-        keys = {blob.name
-                for blob in self.blob_service.list_blobs(self.bucket)}
+    def _list(self, service, bucket, prefix):
+        blobs = service.list_blobs(bucket, prefix=prefix)
+        return [(bucket, blob.name) for blob in blobs]
 
-        ret = []
+    def exists(self, path_infos):
+        # NOTE: only listing the fan-out directories that we need instead
+        # of the whole container, which might be shared with others.
+        prefixes = set()
         for path_info in path_infos:
             if path_info['scheme'] != self.scheme:
                 raise NotImplementedError
 
-            key = path_info['key']
-            ret.append(key in keys)
-
-        return ret
-
-    def upload(self, from_infos, to_infos, names=None):
+            dirname = posixpath.dirname(path_info['key'])
+            prefix = dirname + '/' if dirname else ''
+            prefixes.add((path_info['bucket'], prefix))
+
+        keys = set()
+        if prefixes:
+            # NOTE: creating the service once, before the threads need it
+            service = self.blob_service
+            jobs = min(len(prefixes), self.LIST_JOBS)
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                futures = [executor.submit(self._list,
+                                           service,
+                                           bucket,
+                                           prefix)
+                           for bucket, prefix in sorted(prefixes)]
+                for f in futures:
+                    keys.update(f.result())
+
+        return [(path_info['bucket'], path_info['key']) in keys
+                for path_info in path_infos]
+
+    def upload(self, from_infos, to_infos, names=None, jobs=1):
         names = self._verify_path_args(to_infos, from_infos, names)
 
         for from_info, to_info, name in zip(from_infos, to_infos, names):
@@ -174,7 +216,11 @@ class RemoteAzure(RemoteBase):
 
             try:
                 self.blob_service.create_blob_from_path(
-                    bucket, key, from_info['path'], progress_callback=cb)
+                    bucket,
+                    key,
+                    from_info['path'],
+                    progress_callback=cb,
+                    max_connections=self.multipart_concurrency(jobs))
             except Exception as ex:
                 Logger.error("Failed to upload '{}'".format(from_info['path']),
                              ex)
@@ -185,7 +231,8 @@ class RemoteAzure(RemoteBase):
                  from_infos,
                  to_infos,
                  no_progress_bar=False,
-                 names=None):
+                 names=None,
+                 jobs=1):
         names = self._verify_path_args(from_infos, to_infos, names)
 
         for to_info, from_info, name in zip(to_infos, from_infos, names):
@@ -211,7 +258,11 @@ class RemoteAzure(RemoteBase):
 
             try:
                 self.blob_service.get_blob_to_path(
-                    bucket, key, tmp_file, progress_callback=cb)
+                    bucket,
+                    key,
+                    tmp_file,
+                    progress_callback=cb,
+                    max_connections=self.multipart_concurrency(jobs))
             except Exception as exc:
                 Logger.error("Failed to download '{}/{}'".format(
                     bucket, key), exc)
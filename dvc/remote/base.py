@@ -5,6 +5,7 @@ import errno
 from dvc.config import Config
 from dvc.logger import Logger
 from dvc.exceptions import DvcException
+from dvc.utils import module_available
 
 
 STATUS_OK = 1
@@ -31,16 +32,55 @@ class RemoteBase(object):
     REGEX = None
     REQUIRES = {}
 
+    # NOTE: whether small objects of directories are transferred to this
+    # remote in pack files, see dvc/remote/pack.py
+    pack = False
+    # NOTE: codec and level objects are compressed with on the way to this
+    # remote, see dvc/remote/compress.py
+    compress = None
+    compress_level = None
+
+    # NOTE: large files are transferred in parts over several connections
+    # each, see multipart_concurrency()
+    MULTIPART_THRESHOLD = 64 * 1024 * 1024
+    MULTIPART_CHUNKSIZE = 64 * 1024 * 1024
+    MULTIPART_CONCURRENCY = 16
+    MAX_CONNECTIONS = 64
+
     def __init__(self, project, config):
         pass
 
+    def _init_multipart(self, config):
+        self.multipart_threshold = config.get(
+            Config.SECTION_REMOTE_MULTIPART_THRESHOLD,
+            self.MULTIPART_THRESHOLD)
+        self.multipart_chunksize = config.get(
+            Config.SECTION_REMOTE_MULTIPART_CHUNKSIZE,
+            self.MULTIPART_CHUNKSIZE)
+        self.multipart_max_concurrency = config.get(
+            Config.SECTION_REMOTE_MULTIPART_CONCURRENCY,
+            self.MULTIPART_CONCURRENCY)
+        self.max_connections = config.get(
+            Config.SECTION_REMOTE_MAX_CONNECTIONS,
+            self.MAX_CONNECTIONS)
+
+    def multipart_concurrency(self, jobs=1):
+        """
+        Connections a single file can use, so that all of the jobs files
+        that are being transferred at once stay within max_connections.
+        """
+        budget = self.max_connections // max(1, jobs)
+        return max(1, min(self.multipart_max_concurrency, budget))
+
     @classmethod
     def supported(cls, config):
         url = config[Config.SECTION_REMOTE_URL]
-        url_ok = cls.match(url)
-        deps_ok = all(cls.REQUIRES.values())
-        if url_ok and not deps_ok:
-            missing = [k for k, v in cls.REQUIRES.items() if v is None]
+        if not cls.match(url):
+            return False
+
+        missing = [k for k, v in cls.REQUIRES.items()
+                   if not module_available(v)]
+        if missing:
             msg = "URL \'{}\' is supported but requires these missing " \
                   "dependencies: {}. If you have installed dvc using pip, " \
                   "choose one of these options to proceed: \n" \
@@ -59,8 +99,9 @@ class RemoteBase(object):
                   "using https://github.com/iterative/dvc/issues. Thank you!"
             msg = msg.format(url, missing, " ".join(missing), cls.scheme)
             Logger.warn(msg)
+            return False
 
-        return url_ok and deps_ok
+        return True
 
     @classmethod
     def match(cls, url):
@@ -78,6 +119,13 @@ class RemoteBase(object):
         # FIXME probably better use uuid()
         return fname + '.part'
 
+    def can_copy(self, remote):
+        """
+        Whether download() can copy objects straight into remote, without
+        them going through this machine.
+        """
+        return False
+
     def save_info(self, path_info):
         raise NotImplementedError
 
@@ -90,10 +138,15 @@ class RemoteBase(object):
     def checkout(self, path_info, checksum_info):
         raise NotImplementedError
 
-    def download(self, from_infos, to_infos, no_progress_bar=False, name=None):
+    def download(self,
+                 from_infos,
+                 to_infos,
+                 no_progress_bar=False,
+                 names=None,
+                 jobs=1):
         raise NotImplementedError
 
-    def upload(self, from_infos, to_infos, path_info, name=None):
+    def upload(self, from_infos, to_infos, names=None, jobs=1):
         raise NotImplementedError
 
     def remove(self, path_info):
@@ -0,0 +1,153 @@
+"""
+Transparent compression of objects sent to remotes. Remote objects keep
+the checksum of their uncompressed content as a name, so deduplication
+doesn't change, and carry a small header saying how the rest of them is
+encoded. Headers are only looked for on remotes that have compression
+configured, objects of other remotes are stored as is.
+"""
+import os
+import zlib
+import uuid
+
+from dvc.exceptions import DvcException
+from dvc.utils import module_available, LOCAL_CHUNK_SIZE
+
+
+MAGIC = b'\x00DVCZ'
+
+NONE = 'none'
+GZIP = 'gzip'
+ZSTD = 'zstd'
+CODECS = [NONE, GZIP, ZSTD]
+CODEC_IDS = {NONE: 0, GZIP: 1, ZSTD: 2}
+DEFAULT_LEVELS = {GZIP: 6, ZSTD: 3}
+# NOTE: (min, max) levels that the codecs take
+LEVELS = {GZIP: (0, 9), ZSTD: (1, 22)}
+
+# NOTE: leading bytes of formats that are compressed already
+COMPRESSED_SIGNATURES = [
+    b'\x1f\x8b',                  # gzip
+    b'BZh',                       # bzip2
+    b'\xfd7zXZ\x00',              # xz
+    b'\x28\xb5\x2f\xfd',          # zstd
+    b'PK\x03\x04',                # zip, jar, docx, npz, ...
+    b'7z\xbc\xaf\x27\x1c',        # 7z
+    b'Rar!',                      # rar
+    b'\x89PNG',                   # png
+    b'\xff\xd8\xff',              # jpeg
+    b'GIF8',                      # gif
+    b'OggS',                      # ogg
+    b'fLaC',                      # flac
+    b'ID3',                       # mp3
+]
+SAMPLE_SIZE = 64 * 1024
+# NOTE: not worth it if the sample doesn't shrink by at least 10%
+SAMPLE_RATIO = 0.9
+
+
+class CompressionError(DvcException):
+    def __init__(self, msg):
+        super(CompressionError, self).__init__('Compression error: ' + msg)
+
+
+def _check_codec(codec):
+    if codec == ZSTD and not module_available('zstandard'):
+        raise CompressionError("'zstd' requires 'zstandard' package, "
+                               "please install it with "
+                               "'pip install zstandard'")
+
+
+def compressible(path):
+    """ Cheap guess whether compressing path is going to pay off """
+    with open(path, 'rb') as fd:
+        sample = fd.read(SAMPLE_SIZE)
+
+    if not sample:
+        return False
+
+    for signature in COMPRESSED_SIGNATURES:
+        if sample.startswith(signature):
+            return False
+
+    # NOTE: mp4/mov/heic
+    if sample[4:8] == b'ftyp':
+        return False
+
+    return len(zlib.compress(sample, 1)) < len(sample) * SAMPLE_RATIO
+
+
+def encode(src, dest, codec=GZIP, level=None):
+    """ Writes src to dest compressed with codec, if it is worth it """
+    _check_codec(codec)
+
+    if codec != NONE and not compressible(src):
+        codec = NONE
+
+    if level is None:
+        level = DEFAULT_LEVELS.get(codec, None)
+
+    with open(src, 'rb') as fsrc, open(dest, 'wb') as fdest:
+        fdest.write(MAGIC + bytearray([CODEC_IDS[codec]]))
+
+        if codec == ZSTD:
+            import zstandard
+
+            zstandard.ZstdCompressor(level=level).copy_stream(fsrc, fdest)
+            return
+
+        compressor = None
+        if codec == GZIP:
+            compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+        while True:
+            buf = fsrc.read(LOCAL_CHUNK_SIZE)
+            if not buf:
+                break
+            if compressor is not None:
+                buf = compressor.compress(buf)
+            fdest.write(buf)
+
+        if compressor is not None:
+            fdest.write(compressor.flush())
+
+
+def decode(path):
+    """ Decompresses path in place if it was written by encode() """
+    header_size = len(MAGIC) + 1
+    with open(path, 'rb') as fd:
+        header = fd.read(header_size)
+
+    if len(header) != header_size or not header.startswith(MAGIC):
+        return
+
+    codecs = dict((v, k) for k, v in CODEC_IDS.items())
+    codec = codecs.get(bytearray(header)[-1], None)
+    if codec is None:
+        raise CompressionError("unknown codec in '{}'".format(path))
+    _check_codec(codec)
+
+    tmp = '{}.{}'.format(path, str(uuid.uuid4()))
+    with open(path, 'rb') as fsrc, open(tmp, 'wb') as fdest:
+        fsrc.seek(header_size)
+
+        if codec == ZSTD:
+            import zstandard
+
+            zstandard.ZstdDecompressor().copy_stream(fsrc, fdest)
+        else:
+            decompressor = None
+            if codec == GZIP:
+                decompressor = zlib.decompressobj(31)
+
+            while True:
+                buf = fsrc.read(LOCAL_CHUNK_SIZE)
+                if not buf:
+                    break
+                if decompressor is not None:
+                    buf = decompressor.decompress(buf)
+                fdest.write(buf)
+
+            if decompressor is not None:
+                fdest.write(decompressor.flush())
+
+    os.rename(tmp, path)
@@ -1,10 +1,8 @@
 import os
+import math
+import uuid
 import posixpath
-
-try:
-    from google.cloud import storage
-except ImportError:
-    storage = None
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     from urlparse import urlparse
@@ -22,8 +20,15 @@ from dvc.exceptions import DvcException
 class RemoteGS(RemoteBase):
     scheme = 'gs'
     REGEX = r'^gs://(?P<path>.*)$'
-    REQUIRES = {'google.cloud.storage': storage}
+    REQUIRES = {'google.cloud.storage': 'google.cloud.storage'}
     PARAM_ETAG = 'etag'
+    # NOTE: max number of objects that can be composed into one
+    COMPOSE_LIMIT = 32
+    # NOTE: content type of objects composed of parts, which is what
+    # upload_from_filename() would guess for files dvc stores
+    CONTENT_TYPE = 'application/octet-stream'
+    # NOTE: number of prefixes that are listed at once in exists()
+    LIST_JOBS = 16
 
     def __init__(self, project, config):
         self.project = project
@@ -33,6 +38,10 @@ class RemoteGS(RemoteBase):
         self.url = config.get(Config.SECTION_REMOTE_URL, storagepath)
         self.projectname = config.get(Config.SECTION_GCP_PROJECTNAME, None)
 
+        self._init_multipart(config)
+
+        self._gs = None
+
     @property
     def bucket(self):
         return urlparse(self.url).netloc
@@ -43,7 +52,11 @@ class RemoteGS(RemoteBase):
 
     @property
     def gs(self):
-        return storage.Client()
+        if self._gs is None:
+            from google.cloud import storage
+
+            self._gs = storage.Client()
+        return self._gs
 
     def get_etag(self, bucket, key):
         blob = self.gs.bucket(bucket).get_blob(key)
@@ -98,9 +111,9 @@ class RemoteGS(RemoteBase):
             msg = '{} doesn\'t exist in the cloud'
             raise DvcException(msg.format(from_info['key']))
 
-        bucket = self.gs.bucket(to_info['bucket'])
+        bucket = gs.bucket(from_info['bucket'])
         bucket.copy_blob(blob,
-                         self.gs.bucket(to_info['bucket']),
+                         gs.bucket(to_info['bucket']),
                          new_name=to_info['key'])
 
     def save(self, path_info):
@@ -160,27 +173,91 @@ class RemoteGS(RemoteBase):
 
         blob.delete()
 
+    def can_copy(self, remote):
+        return isinstance(remote, RemoteGS)
+
     def md5s_to_path_infos(self, md5s):
         return [{'scheme': 'gs',
                  'bucket': self.bucket,
                  'key': posixpath.join(self.prefix,
                                        md5[0:2], md5[2:])} for md5 in md5s]
 
-    def exists(self, path_infos):
-        ret = []
-        gs = self.gs
-
-        bucket = gs.bucket(self.bucket)
-        keys = [blob.name for blob in bucket.list_blobs(prefix=self.prefix)]
+    def _list(self, gs, bucket, prefix):
+        blobs = gs.bucket(bucket).list_blobs(prefix=prefix)
+        return [(bucket, blob.name) for blob in blobs]
 
+    def exists(self, path_infos):
+        # NOTE: listing fan-out directories that we need in parallel
+        # instead of everything under the prefix in one go.
+        prefixes = set()
         for path_info in path_infos:
-            exists = False
-            if path_info['key'] in keys:
-                exists = True
-            ret.append(exists)
-        return ret
-
-    def upload(self, from_infos, to_infos, names=None):
+            dirname = posixpath.dirname(path_info['key'])
+            prefix = dirname + '/' if dirname else ''
+            prefixes.add((path_info['bucket'], prefix))
+
+        keys = set()
+        if prefixes:
+            # NOTE: creating the client once, before the threads need it
+            gs = self.gs
+            jobs = min(len(prefixes), self.LIST_JOBS)
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                futures = [executor.submit(self._list, gs, bucket, prefix)
+                           for bucket, prefix in sorted(prefixes)]
+                for f in futures:
+                    keys.update(f.result())
+
+        return [(path_info['bucket'], path_info['key']) in keys
+                for path_info in path_infos]
+
+    def _parts(self, size):
+        """ (offset, length) of parts to upload a file of size in """
+        nparts = int(math.ceil(float(size) / self.multipart_chunksize))
+        nparts = max(1, min(nparts, self.COMPOSE_LIMIT))
+        part_size = int(math.ceil(float(size) / nparts))
+        return [(offset, min(part_size, size - offset))
+                for offset in range(0, size, part_size)]
+
+    def _upload_part(self, bucket, path, key, offset, length):
+        with open(path, 'rb') as fobj:
+            fobj.seek(offset)
+            bucket.blob(key).upload_from_file(fobj, size=length)
+
+    def _upload_composite(self, bucket, path, key, jobs=1):
+        """
+        Uploads parts of a large file in parallel as separate objects and
+        composes them into one. jobs is the number of files that are being
+        uploaded at once, see multipart_concurrency().
+        """
+        parts = self._parts(os.path.getsize(path))
+        tmp = '{}.{}'.format(key, str(uuid.uuid4()))
+        keys = ['{}.{}'.format(tmp, i) for i in range(len(parts))]
+
+        try:
+            with ThreadPoolExecutor(
+                    max_workers=self.multipart_concurrency(jobs)) as executor:
+                futures = [executor.submit(self._upload_part,
+                                           bucket,
+                                           path,
+                                           k,
+                                           offset,
+                                           length)
+                           for k, (offset, length) in zip(keys, parts)]
+                for f in futures:
+                    f.result()
+
+            # NOTE: compose() refuses to create an object without a
+            # content type
+            blob = bucket.blob(key)
+            blob.content_type = self.CONTENT_TYPE
+            blob.compose([bucket.blob(k) for k in keys])
+        finally:
+            for k in keys:
+                try:
+                    bucket.delete_blob(k)
+                except Exception:
+                    pass
+
+    def upload(self, from_infos, to_infos, names=None, jobs=1):
         names = self._verify_path_args(to_infos, from_infos, names)
 
         gs = self.gs
@@ -203,8 +280,15 @@ class RemoteGS(RemoteBase):
 
             try:
                 bucket = gs.bucket(to_info['bucket'])
-                blob = bucket.blob(to_info['key'])
-                blob.upload_from_filename(from_info['path'])
+                size = os.path.getsize(from_info['path'])
+                if size > self.multipart_threshold:
+                    self._upload_composite(bucket,
+                                           from_info['path'],
+                                           to_info['key'],
+                                           jobs=jobs)
+                else:
+                    blob = bucket.blob(to_info['key'])
+                    blob.upload_from_filename(from_info['path'])
             except Exception as exc:
                 msg = "Failed to upload '{}' to '{}/{}'"
                 Logger.error(msg.format(from_info['path'],
@@ -218,7 +302,8 @@ class RemoteGS(RemoteBase):
                  from_infos,
                  to_infos,
                  no_progress_bar=False,
-                 names=None):
+                 names=None,
+                 jobs=1):
         names = self._verify_path_args(from_infos, to_infos, names)
 
         gs = self.gs
@@ -278,10 +363,13 @@ class RemoteGS(RemoteBase):
     def gc(self, cinfos):
         used = [info[self.PARAM_ETAG] for info in cinfos['gs']]
         used += [info[RemoteLOCAL.PARAM_MD5] for info in cinfos['local']]
+        # NOTE: packs and indexes are not named after checksums of data
+        used_packs = self.project.cache.local.used_packs(cinfos['local'],
+                                                         self)
 
         removed = False
         for etag in self._all_etags():
-            if etag in used:
+            if etag in used or etag in used_packs:
                 continue
             path_info = {'scheme': 'gs',
                          'bucket': self.bucket,
@@ -163,6 +163,9 @@ class RemoteHDFS(RemoteBase):
 
         self.rm(path_info)
 
+    def can_copy(self, remote):
+        return isinstance(remote, RemoteHDFS) and remote.user == self.user
+
     def md5s_to_path_infos(self, md5s):
         return [{'scheme': 'hdfs',
                  'user': self.user,
@@ -191,7 +194,7 @@ class RemoteHDFS(RemoteBase):
 
         return ret
 
-    def upload(self, from_infos, to_infos, names=None):
+    def upload(self, from_infos, to_infos, names=None, jobs=1):
         names = self._verify_path_args(to_infos, from_infos, names)
 
         for from_info, to_info, name in zip(from_infos, to_infos, names):
@@ -212,7 +215,8 @@ class RemoteHDFS(RemoteBase):
                  from_infos,
                  to_infos,
                  no_progress_bar=False,
-                 names=None):
+                 names=None,
+                 jobs=1):
         names = self._verify_path_args(from_infos, to_infos, names)
 
         for to_info, from_info, name in zip(to_infos, from_infos, names):
@@ -250,10 +254,13 @@ class RemoteHDFS(RemoteBase):
     def gc(self, cinfos):
         used = [info[self.PARAM_CHECKSUM] for info in cinfos['hdfs']]
         used += [info[RemoteLOCAL.PARAM_MD5] for info in cinfos['local']]
+        # NOTE: packs and indexes are not named after checksums of data
+        used_packs = self.project.cache.local.used_packs(cinfos['local'],
+                                                         self)
 
         removed = False
         for checksum in self._all_checksums():
-            if checksum in used:
+            if checksum in used or checksum in used_packs:
                 continue
             path_info = {'scheme': 'hdfs',
                          'user': self.user,
@@ -1,20 +1,28 @@
 import os
+import time
 import uuid
 import json
 import ntpath
 import shutil
+import tempfile
 import posixpath
 from operator import itemgetter
+from collections import OrderedDict
 
 from dvc.system import System
+from dvc.lock import try_lock
 from dvc.remote.base import RemoteBase, STATUS_MAP
+from dvc.remote import pack
+from dvc.remote import compress
+from dvc.remote.manifest import DirManifest
 from dvc.logger import Logger
 from dvc.utils import remove, move, copyfile, dict_md5, to_chunks
+from dvc.utils import file_md5
 from dvc.utils import LARGE_DIR_SIZE
 from dvc.config import Config
 from dvc.exceptions import DvcException
 from dvc.progress import progress
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 
 class RemoteLOCAL(RemoteBase):
@@ -23,7 +31,36 @@ class RemoteLOCAL(RemoteBase):
     PARAM_MD5 = 'md5'
     PARAM_PATH = 'path'
     PARAM_RELPATH = 'relpath'
+    # NOTE: limits a directory checksum info to the entries inside of a
+    # (unix) relpath
+    PARAM_PREFIX = 'prefix'
     MD5_DIR_SUFFIX = '.dir'
+    MANIFEST_SUFFIX = '.manifest'
+    # NOTE: object locks live in the cache dir itself, so that everyone
+    # that shares it, over nfs too, sees them. Objects are spread over a
+    # fixed number of lock files, which are never removed.
+    LOCK_DIR = '.locks'
+    LOCK_SUFFIX = '.lock'
+    LOCK_STRIPE = 3
+    LOCK_INTERVAL = 0.1
+    LOCK_TIMEOUT = 60
+
+    # NOTE: memory that parsed dir manifests are allowed to take
+    MANIFEST_MEMO_SIZE = 512 * 1024 * 1024
+
+    # NOTE: objects per download when someone waits for them to arrive
+    PULL_BATCH_SIZE = 64
+
+    # NOTE: bytes that a job of transfer() keeps on the local disk before
+    # sending them on to the destination remote
+    SPOOL_SIZE = 256 * 1024 * 1024
+
+    # NOTE: lists of objects to propagate to the tiers, see
+    # propagate_async()
+    PROPAGATE_DIR = 'propagate'
+
+    PROMOTE_COPY = 'copy'
+    PROMOTE_SYMLINK = 'symlink'
 
     CACHE_TYPES = ['reflink', 'hardlink', 'symlink', 'copy']
     CACHE_TYPE_MAP = {
@@ -50,6 +87,19 @@ class RemoteLOCAL(RemoteBase):
         if self.cache_dir is not None and not os.path.exists(self.cache_dir):
             os.mkdir(self.cache_dir)
 
+        self.tiers = config.get(Config.SECTION_CACHE_SHARED, [])
+        self.promote = config.get(Config.SECTION_CACHE_PROMOTE,
+                                  self.PROMOTE_COPY)
+        # NOTE: objects that have been written to this cache by us
+        self._saved = set()
+
+        self.size_limit = config.get(Config.SECTION_CACHE_SIZE_LIMIT, None)
+
+        self._manifests = OrderedDict()
+        self._manifests_size = 0
+        self._manifests_hits = 0
+        self._manifests_misses = 0
+
     @property
     def url(self):
         return self.cache_dir
@@ -62,10 +112,16 @@ class RemoteLOCAL(RemoteBase):
         clist = []
         for entry in os.listdir(self.cache_dir):
             subdir = os.path.join(self.cache_dir, entry)
-            if not os.path.isdir(subdir):
+            if entry == self.LOCK_DIR or not os.path.isdir(subdir):
                 continue
 
             for cache in os.listdir(subdir):
+                # NOTE: skipping temporary files of the objects
+                # that are being written right now
+                name, ext = os.path.splitext(cache)
+                if ext and (ext != self.MD5_DIR_SUFFIX or '.' in name):
+                    continue
+
                 path = os.path.join(subdir, cache)
                 clist.append(self.path_to_md5(path))
 
@@ -88,13 +144,148 @@ class RemoteLOCAL(RemoteBase):
                 msg = 'Corrupted cache file {}'
                 Logger.warn(msg.format(os.path.relpath(cache)))
                 remove(cache)
-            return True
+            return not self._promote(md5)
+
+        return False
+
+    def _tier_get(self, tier, md5):
+        return os.path.join(tier, md5[0:2], md5[2:])
+
+    def _promote(self, md5):
+        """
+        Looks the object up in the slower cache tiers, in order, and brings
+        it into this cache, so that the following lookups are local.
+        """
+        cache = self.get(md5)
+        for tier in self.tiers:
+            src = self._tier_get(tier, md5)
+            if not os.path.exists(src):
+                continue
+
+            msg = "Promoting '{}' from cache '{}'"
+            Logger.debug(msg.format(md5, tier))
+
+            fobj = self._lock_object(cache)
+            try:
+                if os.path.islink(cache):
+                    # NOTE: dangling link to an object that is gone
+                    remove(cache)
+
+                if self.promote == self.PROMOTE_SYMLINK:
+                    if not os.path.exists(cache):
+                        System.symlink(src, cache)
+                else:
+                    tmp = '{}.{}'.format(cache, str(uuid.uuid4()))
+                    copyfile(src, tmp, no_progress_bar=True)
+                    self._place(tmp, cache)
+            finally:
+                self._unlock_object(cache, fobj)
+
+            if not self.state.changed(cache, md5=md5):
+                return True
+
+            msg = 'Corrupted cache file {}'
+            Logger.warn(msg.format(os.path.relpath(src)))
+            remove(cache)
 
         return False
 
+    def propagate(self, md5s):
+        """
+        Copies the objects of this cache that the slower tiers don't have
+        yet over there.
+        """
+        for md5 in md5s:
+            cache = self.get(md5)
+            if not os.path.exists(cache) or os.path.islink(cache):
+                # NOTE: promoted from one of the tiers by a link
+                continue
+
+            for tier in self.tiers:
+                dest = self._tier_get(tier, md5)
+                if os.path.exists(dest):
+                    continue
+
+                fobj = self._lock_object(dest)
+                try:
+                    if not os.path.exists(dest):
+                        tmp = '{}.{}'.format(dest, str(uuid.uuid4()))
+                        copyfile(cache, tmp, no_progress_bar=True)
+                        self._place(tmp, dest)
+                finally:
+                    self._unlock_object(dest, fobj)
+
+    def _propagate_dir(self):
+        return os.path.join(self.project.tmp_dir, self.PROPAGATE_DIR)
+
+    def queue_propagation(self):
+        """
+        Records objects that have been saved to this cache so far, for
+        propagate_queued() to copy them to the tiers.
+        """
+        if not self.tiers or not self._saved:
+            return False
+
+        dname = self._propagate_dir()
+        if not os.path.isdir(dname):
+            os.makedirs(dname)
+
+        # NOTE: writing first and renaming after that, so that the daemon
+        # never sees a partial list
+        path = os.path.join(dname, str(uuid.uuid4()))
+        tmp = path + '.tmp'
+        with open(tmp, 'w+') as fd:
+            json.dump(sorted(self._saved), fd)
+        os.rename(tmp, path)
+
+        self._saved = set()
+        return True
+
+    def propagate_queued(self):
+        """ Propagates objects from every list queue_propagation() wrote """
+        dname = self._propagate_dir()
+        if not os.path.isdir(dname):
+            return
+
+        for fname in os.listdir(dname):
+            if fname.endswith('.tmp'):
+                continue
+
+            path = os.path.join(dname, fname)
+            try:
+                with open(path, 'r') as fd:
+                    md5s = json.load(fd)
+            except (IOError, OSError):
+                # NOTE: another daemon has just taken care of it
+                continue
+
+            self.propagate(md5s)
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    def propagate_async(self):
+        """
+        Launches propagation of objects that have been saved to this
+        cache in the background.
+        """
+        if not self.queue_propagation():
+            return
+
+        from dvc.daemon import daemon
+
+        try:
+            daemon(['propagate'], cwd=self.project.root_dir)
+        except Exception as exc:
+            msg = 'Failed to launch cache propagation: {}'.format(str(exc))
+            Logger.debug(msg)
+
     def link(self, cache, path):
         assert os.path.isfile(cache)
 
+        self.state.touch(cache)
+
         dname = os.path.dirname(path)
         if not os.path.exists(dname):
             os.makedirs(dname)
@@ -173,28 +364,85 @@ class RemoteLOCAL(RemoteBase):
 
         return (md5, dir_info)
 
-    def load_dir_cache(self, md5):
+    def load_dir_manifest(self, md5):
+        """
+        Directory listing as a DirManifest. The ones that were loaded
+        recently are kept in memory, since they never change for the same
+        checksum.
+        """
+        manifest = self._manifests.pop(md5, None)
+        if manifest is not None:
+            self._manifests[md5] = manifest
+            self._manifests_hits += 1
+            msg = "Dir manifest '{}' is in memory ({} hits, {} misses)"
+            Logger.debug(msg.format(md5,
+                                    self._manifests_hits,
+                                    self._manifests_misses))
+            return manifest
+
+        self._manifests_misses += 1
+        manifest = self._load_dir_manifest(md5)
+        if manifest is None:
+            return DirManifest()
+
+        self._manifests[md5] = manifest
+        self._manifests_size += manifest.nbytes
+        while self._manifests_size > self.MANIFEST_MEMO_SIZE and \
+                len(self._manifests) > 1:
+            _, evicted = self._manifests.popitem(last=False)
+            self._manifests_size -= evicted.nbytes
+
+        return manifest
+
+    def _load_dir_manifest(self, md5):
+        """
+        Loads DirManifest from the binary sidecar if there is one, or from
+        the '.dir' file otherwise. Returns None if it is broken.
+        """
         path = self.get(md5)
 
         assert self.is_dir_cache(path)
 
+        if not os.path.exists(path):
+            self._promote(md5)
+
+        sidecar = path + self.MANIFEST_SUFFIX
+        if os.path.exists(sidecar):
+            try:
+                return DirManifest.load(sidecar, path)
+            except Exception as exc:
+                msg = u'Failed to load dir manifest \'{}\': {}'
+                Logger.debug(msg.format(os.path.relpath(sidecar), str(exc)))
+
         try:
             with open(path, 'r') as fd:
                 d = json.load(fd)
         except Exception as exc:
             msg = u'Failed to load dir cache \'{}\''
             Logger.error(msg.format(os.path.relpath(path)), exc)
-            return []
+            return None
 
         if not isinstance(d, list):
             msg = u'Dir cache file format error \'{}\': skipping the file'
             Logger.error(msg.format(os.path.relpath(path)))
-            return []
+            return None
 
-        for info in d:
-            info['relpath'] = self.ospath(info['relpath'])
+        manifest = DirManifest.from_list(d, self.PARAM_RELPATH, self.PARAM_MD5)
+        self._dump_manifest(manifest, path)
+        return manifest
+
+    def _dump_manifest(self, manifest, path):
+        sidecar = path + self.MANIFEST_SUFFIX
+        try:
+            manifest.dump(sidecar, path)
+        except Exception as exc:
+            msg = u'Failed to save dir manifest \'{}\': {}'
+            Logger.debug(msg.format(os.path.relpath(sidecar), str(exc)))
 
-        return d
+    def load_dir_cache(self, md5):
+        return [{self.PARAM_RELPATH: self.ospath(relpath),
+                 self.PARAM_MD5: m}
+                for relpath, m in self.load_dir_manifest(md5)]
 
     def dump_dir_cache(self, md5, dir_info):
         path = self.get(md5)
@@ -212,12 +460,100 @@ class RemoteLOCAL(RemoteBase):
         with open(tmp, 'w+') as fd:
             json.dump(dir_info, fd, sort_keys=True)
         move(tmp, path)
+        self._saved.add(md5)
+
+        manifest = DirManifest.from_list(dir_info,
+                                         self.PARAM_RELPATH,
+                                         self.PARAM_MD5)
+        self._dump_manifest(manifest, path)
 
     @classmethod
     def is_dir_cache(cls, cache):
         return cache.endswith(cls.MD5_DIR_SUFFIX)
 
-    def checkout(self, path_info, checksum_info):
+    def _entries(self, md5, prefix=None):
+        manifest = self.load_dir_manifest(md5)
+        if prefix:
+            return manifest.prefixed(prefix)
+        return iter(manifest)
+
+    def _checkout_prefix(self, path_info, checksum_info, prefix):
+        path = path_info['path']
+        md5 = checksum_info.get(self.PARAM_MD5, None)
+
+        if not md5 or not self.is_dir_cache(md5):
+            msg = u'\'{}\' is not a directory output. Skipping checkout.'
+            Logger.warn(msg.format(os.path.relpath(path)))
+            return
+
+        if self.changed_cache(md5):
+            msg = u'Cache \'{}\' not found. \'{}\' won\'t be created.'
+            Logger.warn(msg.format(md5, os.path.join(os.path.relpath(path),
+                                                     prefix)))
+            return
+
+        entries = list(self._entries(md5, prefix))
+        if not entries:
+            msg = u'\'{}\' is not in \'{}\'. Skipping checkout.'
+            Logger.warn(msg.format(prefix, os.path.relpath(path)))
+            return
+
+        partial = self.state.get_partial(path)
+        if partial is None and not self.changed(path_info, checksum_info):
+            msg = "Data '{}' didn't change."
+            Logger.info(msg.format(os.path.relpath(path)))
+            return
+
+        prefixes = [prefix]
+        if partial is not None and partial[0] == md5:
+            prefixes = sorted(set(partial[1] + prefixes))
+        elif os.path.exists(path):
+            msg = u'Data \'{}\' exists. Removing before checkout.'
+            Logger.warn(msg.format(os.path.relpath(path)))
+            remove(path)
+
+        msg = u'Checking out \'{}\' of \'{}\' with cache \'{}\'.'
+        Logger.info(msg.format(prefix, os.path.relpath(path), md5))
+
+        for relpath, m in entries:
+            c = self.get(m)
+            p = os.path.join(path, self.ospath(relpath))
+            if os.path.exists(p):
+                if not self.state.changed(p, md5=m):
+                    continue
+                remove(p)
+            if not os.path.exists(c):
+                self._promote(m)
+            if not os.path.exists(c):
+                msg = u'Cache \'{}\' not found. File \'{}\' won\'t be ' \
+                      u'created.'
+                Logger.warn(msg.format(m, os.path.relpath(p)))
+                continue
+            self.link(c, p)
+
+        self.state.update_partial(path, md5, prefixes)
+        self.state.update_link(path)
+
+    def _changed_partial(self, path, md5, partial):
+        if partial[0] != md5:
+            return True
+
+        for prefix in partial[1]:
+            for relpath, m in self._entries(md5, prefix):
+                p = os.path.join(path, self.ospath(relpath))
+                if not os.path.exists(p) or self.state.changed(p, md5=m):
+                    return True
+
+        return False
+
+    def checkout(self, path_info, checksum_info, prefix=None):
+        """
+        Checks out the output or, if prefix (unix relpath) is given, only
+        the entries of a directory output that are inside of it.
+        """
+        if prefix:
+            return self._checkout_prefix(path_info, checksum_info, prefix)
+
         path = path_info['path']
         md5 = checksum_info.get(self.PARAM_MD5, None)
         cache = self.get(md5)
@@ -227,7 +563,11 @@ class RemoteLOCAL(RemoteBase):
             Logger.warn(msg.format(os.path.relpath(path)))
             return
 
-        if not self.changed(path_info, checksum_info):
+        partial = self.state.get_partial(path)
+        if partial is not None:
+            # NOTE: the rest of it is going to be checked out below
+            self.state.remove_partial(path)
+        elif not self.changed(path_info, checksum_info):
             msg = "Data '{}' didn't change."
             Logger.info(msg.format(os.path.relpath(path)))
             return
@@ -256,20 +596,105 @@ class RemoteLOCAL(RemoteBase):
         if not os.path.exists(path):
             os.makedirs(path)
 
-        for entry in self.load_dir_cache(md5):
-            md5 = entry[self.PARAM_MD5]
+        for relpath, md5 in self.load_dir_manifest(md5):
             c = self.get(md5)
-            relpath = entry[self.PARAM_RELPATH]
-            p = os.path.join(path, relpath)
+            p = os.path.join(path, self.ospath(relpath))
+            if not os.path.exists(c):
+                self._promote(md5)
             self.link(c, p)
         self.state.update_link(path)
 
+    def _lock_object(self, cache):
+        """
+        Waits for whoever is writing the same cache object to finish, so
+        that we don't copy the same data again. Nothing relies on it for
+        correctness, see _place(), so after LOCK_TIMEOUT seconds we go
+        ahead without the lock.
+        """
+        dname = os.path.dirname(cache)
+        if not os.path.exists(dname):
+            os.makedirs(dname)
+
+        path = self._lock_path(cache)
+        try:
+            if not os.path.exists(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+        except OSError:
+            # NOTE: somebody else has just created it
+            pass
+
+        try:
+            fobj = open(path, 'a+')
+        except (IOError, OSError):
+            # NOTE: e.g. read-only cache dir of another user, which only
+            # means that we might copy the same data twice
+            return None
+
+        if try_lock(fobj, False):
+            return fobj
+
+        msg = "Waiting for another process to finish writing '{}'"
+        Logger.debug(msg.format(os.path.relpath(cache)))
+        start = time.time()
+        while not try_lock(fobj, False):
+            if time.time() - start > self.LOCK_TIMEOUT:
+                msg = "Timed out waiting for a lock on '{}', writing it " \
+                      "anyway"
+                Logger.warn(msg.format(os.path.relpath(cache)))
+                fobj.close()
+                return None
+            time.sleep(self.LOCK_INTERVAL)
+        return fobj
+
+    def _lock_path(self, cache):
+        """
+        Lock file of the object, in the lock dir of the cache it belongs
+        to, shared with the objects whose names start with the same
+        LOCK_STRIPE characters.
+        """
+        dname, name = os.path.split(os.path.abspath(cache))
+        root, prefix = os.path.split(dname)
+        stripe = (prefix + name)[0:self.LOCK_STRIPE]
+        return os.path.join(root, self.LOCK_DIR, stripe + self.LOCK_SUFFIX)
+
+    def _unlock_object(self, cache, fobj):
+        # NOTE: lock file is left in place, since unlinking it while
+        # somebody is waiting on it would let a newcomer take a lock on a
+        # new file at the same time.
+        if fobj is not None:
+            fobj.close()
+
+    def _place(self, tmp, cache):
+        # NOTE: unlike rename, link never replaces an existing object, so
+        # the first writer wins and everyone else just drops their copy,
+        # which has the same content anyway.
+        try:
+            System.hardlink(tmp, cache)
+        except Exception:
+            if not os.path.exists(cache):
+                # NOTE: filesystem doesn't support hardlinks
+                os.rename(tmp, cache)
+
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+
     def _move(self, inp, outp):
-        # moving in two stages to make last the move atomic in
-        # case inp and outp are in different filesystems
-        tmp = '{}.{}'.format(outp, str(uuid.uuid4()))
-        move(inp, tmp)
-        move(tmp, outp)
+        fobj = self._lock_object(outp)
+        try:
+            md5 = self.path_to_md5(outp)
+            if os.path.exists(outp) and not self.changed_cache(md5):
+                # NOTE: somebody else has just saved the same object
+                remove(inp)
+                return
+
+            # moving in two stages to make the last step atomic in
+            # case inp and outp are in different filesystems
+            tmp = '{}.{}'.format(outp, str(uuid.uuid4()))
+            move(inp, tmp)
+            self._place(tmp, outp)
+            self._saved.add(md5)
+        finally:
+            self._unlock_object(outp, fobj)
 
     def _save_file(self, path_info):
         path = path_info['path']
@@ -290,6 +715,17 @@ class RemoteLOCAL(RemoteBase):
 
     def _save_dir(self, path_info):
         path = path_info['path']
+
+        partial = self.state.get_partial(path)
+        if partial is not None:
+            if not self._changed_partial(path, partial[0], partial):
+                msg = u'Directory \'{}\' is only partially checked out. ' \
+                      u'Check it out fully with \'dvc checkout\' first.'
+                raise DvcException(msg.format(os.path.relpath(path)))
+            # NOTE: it was modified or replaced since then, so it is not
+            # that partial checkout anymore
+            self.state.remove_partial(path)
+
         md5, dir_info = self.state.update_info(path)
 
         for entry in dir_info:
@@ -341,6 +777,10 @@ class RemoteLOCAL(RemoteBase):
         if self.changed_cache(md5):
             return True
 
+        partial = self.state.get_partial(path_info['path'])
+        if partial is not None:
+            return self._changed_partial(path_info['path'], md5, partial)
+
         return checksum_info != self.save_info(path_info)
 
     def remove(self, path_info):
@@ -355,6 +795,9 @@ class RemoteLOCAL(RemoteBase):
 
         move(from_info['path'], to_info['path'])
 
+    def can_copy(self, remote):
+        return isinstance(remote, RemoteLOCAL)
+
     def md5s_to_path_infos(self, md5s):
         return [{'scheme': 'local',
                  'path': os.path.join(self.prefix,
@@ -366,7 +809,7 @@ class RemoteLOCAL(RemoteBase):
             ret.append(os.path.exists(path_info['path']))
         return ret
 
-    def upload(self, from_infos, to_infos, names=None):
+    def upload(self, from_infos, to_infos, names=None, jobs=1):
         names = self._verify_path_args(to_infos, from_infos, names)
 
         for from_info, to_info, name in zip(from_infos, to_infos, names):
@@ -395,7 +838,8 @@ class RemoteLOCAL(RemoteBase):
                  from_infos,
                  to_infos,
                  no_progress_bar=False,
-                 names=None):
+                 names=None,
+                 jobs=1):
         names = self._verify_path_args(from_infos, to_infos, names)
 
         for to_info, from_info, name in zip(to_infos, from_infos, names):
@@ -440,12 +884,15 @@ class RemoteLOCAL(RemoteBase):
                 missing.append(info)
                 continue
 
-            for i in self.load_dir_cache(md5):
+            prefix = info.get(self.PARAM_PREFIX, None)
+            for relpath, m in self._entries(md5, prefix):
+                i = {self.PARAM_RELPATH: self.ospath(relpath),
+                     self.PARAM_MD5: m}
                 if info.get('branch'):
                     i['branch'] = info['branch']
                 i[self.PARAM_PATH] = posixpath.join(info[self.PARAM_PATH],
                                                     i[self.PARAM_RELPATH])
-                collected.append(i.copy())
+                collected.append(i)
 
         collected.extend(checksum_infos)
         return collected, missing
@@ -474,19 +921,362 @@ class RemoteLOCAL(RemoteBase):
 
         return list(by_md5.keys()), list(by_md5.values())
 
+    def _used_md5s(self, checksum_infos):
+        used_md5s = set()
+        for info in checksum_infos:
+            md5 = info[self.PARAM_MD5]
+            used_md5s.add(md5)
+            if self.is_dir_cache(md5) and os.path.exists(self.get(md5)):
+                used_md5s.update(self.load_dir_manifest(md5).md5s())
+        return used_md5s
+
+    def _remove_object(self, md5):
+        path = self.get(md5)
+        remove(path)
+        if self.is_dir_cache(path):
+            remove(path + self.MANIFEST_SUFFIX)
+
+    def _pack_files(self):
+        flist = []
+        for entry in os.listdir(self.cache_dir):
+            subdir = os.path.join(self.cache_dir, entry)
+            if entry == self.LOCK_DIR or not os.path.isdir(subdir):
+                continue
+
+            flist += [entry + name for name in os.listdir(subdir)
+                      if pack.is_pack_file(name)]
+        return flist
+
     def gc(self, checksum_infos):
-        checksum_infos = self._collect(checksum_infos['local'])[0]
-        used_md5s = [info[self.PARAM_MD5] for info in checksum_infos]
+        used_md5s = self._used_md5s(checksum_infos['local'])
+        used_md5s.update(self.project.cache.local.used_packs(
+            checksum_infos['local'], self))
 
         removed = False
-        for md5 in self.all():
+        for md5 in self.all() + self._pack_files():
             if md5 in used_md5s:
                 continue
-            remove(self.get(md5))
+            self._remove_object(md5)
             removed = True
 
         return removed
 
+    def evict(self, checksum_infos):
+        """
+        Removes least recently used objects, except for the ones in
+        checksum_infos, until the cache fits into its size limit.
+        """
+        if not self.size_limit:
+            return
+
+        used_md5s = self._used_md5s(checksum_infos['local'])
+
+        total = 0
+        unused = []
+        for md5 in self.all():
+            path = self.get(md5)
+            # NOTE: objects promoted by a link take no space
+            size = os.lstat(path).st_size
+            total += size
+            if md5 in used_md5s:
+                continue
+            unused.append((self.state.atime(path), md5, size))
+
+        if total <= self.size_limit:
+            return
+
+        start = time.time()
+        count = 0
+        reclaimed = 0
+        for _, md5, size in sorted(unused):
+            if total - reclaimed <= self.size_limit:
+                break
+            self._remove_object(md5)
+            reclaimed += size
+            count += 1
+
+        elapsed = max(time.time() - start, 1e-6)
+        msg = 'Evicted {} objects ({} bytes) from cache in {:.2f}s ' \
+              '({:.1f} MB/s)'
+        Logger.info(msg.format(count,
+                               reclaimed,
+                               elapsed,
+                               reclaimed / elapsed / 1024 / 1024))
+
+        if total - reclaimed > self.size_limit:
+            msg = 'Cache is still {} bytes over the limit, since the rest ' \
+                  'of it is used by the workspace.'
+            Logger.warn(msg.format(total - reclaimed - self.size_limit))
+
+    def _upload(self, remote, from_infos, to_infos, names=None, jobs=1):
+        """ remote.upload() that compresses the objects first if asked to """
+        if not remote.compress:
+            return remote.upload(from_infos, to_infos, names=names, jobs=jobs)
+
+        names = self._verify_path_args(to_infos, from_infos, names)
+
+        for from_info, to_info, name in zip(from_infos, to_infos, names):
+            if not name:
+                name = os.path.basename(from_info['path'])
+
+            # NOTE: not next to the object, so that the cache dir never
+            # holds anything but objects
+            tmp = os.path.join(self.project.tmp_dir, str(uuid.uuid4()))
+            compress.encode(from_info['path'],
+                            tmp,
+                            remote.compress,
+                            remote.compress_level)
+            try:
+                remote.upload([{'scheme': 'local', 'path': tmp}],
+                              [to_info],
+                              names=[name],
+                              jobs=jobs)
+            finally:
+                os.unlink(tmp)
+
+    def _download(self,
+                  remote,
+                  from_infos,
+                  to_infos,
+                  names=None,
+                  no_progress_bar=False,
+                  jobs=1):
+        """
+        remote.download() that decompresses the objects afterwards, if the
+        remote is configured for compression. Any codec, 'none' included,
+        means that objects there carry a header, while objects of remotes
+        without it are taken as is, whatever they start with.
+        """
+        remote.download(from_infos,
+                        to_infos,
+                        no_progress_bar=no_progress_bar,
+                        names=names,
+                        jobs=jobs)
+
+        if not remote.compress:
+            return
+
+        for to_info in to_infos:
+            if os.path.exists(to_info['path']):
+                compress.decode(to_info['path'])
+
+    def _pack_index(self, md5, remote, tmp_dir):
+        """ Downloads pack index of the directory, None if there is none """
+        name = pack.index_name(md5)
+        from_info = remote.md5s_to_path_infos([name])[0]
+        if not remote.exists([from_info])[0]:
+            return None
+
+        return self._load_pack_index(name, remote, tmp_dir)
+
+    def _load_pack_index(self, name, remote, tmp_dir):
+        from_info = remote.md5s_to_path_infos([name])[0]
+        to_info = {'scheme': 'local', 'path': os.path.join(tmp_dir, name)}
+        self._download(remote, [from_info], [to_info], no_progress_bar=True)
+
+        try:
+            return pack.load_index(to_info['path'])
+        except Exception as exc:
+            msg = u'Failed to load pack index \'{}\''
+            Logger.error(msg.format(name), exc)
+            return None
+
+    def _remote_packed(self, remote, tmp_dir):
+        """
+        Objects that are in packs on the remote already, according to the
+        indexes of the directories that are in the cache, as
+        {md5: (pack md5, offset, length)}.
+        """
+        packed = {}
+        names = [pack.index_name(m) for m in self.all()
+                 if self.is_dir_cache(m)]
+        if not names:
+            return packed
+
+        exists = remote.exists(remote.md5s_to_path_infos(names))
+        for name, e in zip(names, exists):
+            index = self._load_pack_index(name, remote, tmp_dir) if e else None
+            if index is None:
+                continue
+
+            for m, (n, offset, length) in index['objects'].items():
+                packed[m] = (index['packs'][n], offset, length)
+        return packed
+
+    def _upload_packs(self, md5, remote, tmp_dir, packed):
+        """
+        Packs objects of the directory that the remote doesn't have yet
+        and uploads them with an index, which points to the packs of other
+        directories for the rest. packed is updated with the new packs.
+        """
+        md5s = sorted(set(self.load_dir_manifest(md5).md5s()))
+
+        objects = []
+        for m in md5s:
+            if m in packed:
+                continue
+            path = self.get(m)
+            if self.changed_cache(m):
+                continue
+            if os.path.getsize(path) > pack.PACK_THRESHOLD:
+                continue
+            objects.append((m, path))
+
+        # NOTE: objects that were pushed one by one earlier stay that way
+        if objects:
+            path_infos = remote.md5s_to_path_infos([m for m, _ in objects])
+            objects = [obj for obj, e in zip(objects,
+                                             remote.exists(path_infos))
+                       if not e]
+
+        index = {'packs': [], 'objects': {}}
+        numbers = {}
+
+        def add(m, pack_md5, offset, length):
+            if pack_md5 not in numbers:
+                numbers[pack_md5] = len(index['packs'])
+                index['packs'].append(pack_md5)
+            index['objects'][m] = [numbers[pack_md5], offset, length]
+
+        for m in md5s:
+            if m in packed:
+                add(m, *packed[m])
+
+        for pack_md5, path, entries in pack.write_packs(objects, tmp_dir):
+            from_info = {'scheme': 'local', 'path': path}
+            to_info = remote.md5s_to_path_infos([pack.pack_name(pack_md5)])[0]
+            self._upload(remote, [from_info], [to_info], names=[pack_md5])
+            os.unlink(path)
+
+            if not remote.exists([to_info])[0]:
+                # NOTE: objects are going to be pushed one by one then
+                return {'packs': [], 'objects': {}}
+
+            for m, offset, length in entries:
+                add(m, pack_md5, offset, length)
+                packed[m] = (pack_md5, offset, length)
+
+        name = pack.index_name(md5)
+        from_info = {'scheme': 'local', 'path': os.path.join(tmp_dir, name)}
+        to_info = remote.md5s_to_path_infos([name])[0]
+        pack.dump_index(index, from_info['path'])
+        self._upload(remote, [from_info], [to_info], names=[name])
+
+        return index
+
+    def _packed(self, checksum_infos, remote, push=False):
+        """
+        Checksums of the objects of directories in checksum_infos that are
+        on the remote in packs. Packs missing ones first if push is True.
+        """
+        packed = set()
+        if not getattr(remote, 'pack', False):
+            return packed
+
+        tmp_dir = tempfile.mkdtemp(dir=self.project.tmp_dir)
+        try:
+            remote_packed = None
+            for info in checksum_infos:
+                md5 = info[self.PARAM_MD5]
+                if not self.is_dir_cache(md5):
+                    continue
+                if not os.path.exists(self.get(md5)):
+                    continue
+
+                index = self._pack_index(md5, remote, tmp_dir)
+                if index is None and push:
+                    if remote_packed is None:
+                        remote_packed = self._remote_packed(remote, tmp_dir)
+                    index = self._upload_packs(md5,
+                                               remote,
+                                               tmp_dir,
+                                               remote_packed)
+                if index is not None:
+                    packed.update(index['objects'].keys())
+        finally:
+            shutil.rmtree(tmp_dir)
+
+        return packed
+
+    def used_packs(self, checksum_infos, remote):
+        """
+        Names of the pack indexes of directories in checksum_infos on the
+        remote and of the packs that they point to, for gc to keep.
+        """
+        used = set()
+        tmp_dir = tempfile.mkdtemp(dir=self.project.tmp_dir)
+        try:
+            for info in checksum_infos:
+                md5 = info[self.PARAM_MD5]
+                if not self.is_dir_cache(md5):
+                    continue
+
+                index = self._pack_index(md5, remote, tmp_dir)
+                if index is None:
+                    continue
+
+                used.add(pack.index_name(md5))
+                used.update(pack.pack_name(p) for p in index['packs'])
+        finally:
+            shutil.rmtree(tmp_dir)
+
+        return used
+
+    def _pull_packs(self, checksum_infos, remote, callback=None):
+        if not getattr(remote, 'pack', False):
+            return
+
+        tmp_dir = tempfile.mkdtemp(dir=self.project.tmp_dir)
+        try:
+            for info in checksum_infos:
+                md5 = info[self.PARAM_MD5]
+                if not self.is_dir_cache(md5) or self.changed_cache(md5):
+                    continue
+
+                prefix = info.get(self.PARAM_PREFIX, None)
+                wanted = set(m for _, m in self._entries(md5, prefix))
+                wanted = [m for m in wanted if self.changed_cache(m)]
+                if not wanted:
+                    continue
+
+                index = self._pack_index(md5, remote, tmp_dir)
+                if index is None:
+                    continue
+
+                by_pack = {}
+                for m in wanted:
+                    entry = index['objects'].get(m, None)
+                    if entry is not None:
+                        by_pack.setdefault(entry[0], []).append(m)
+
+                for n, md5s in by_pack.items():
+                    self._extract_pack(index, n, md5s, remote, tmp_dir)
+                    if callback is not None:
+                        callback(md5s)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def _extract_pack(self, index, n, md5s, remote, tmp_dir):
+        name = pack.pack_name(index['packs'][n])
+        from_info = remote.md5s_to_path_infos([name])[0]
+        to_info = {'scheme': 'local', 'path': os.path.join(tmp_dir, name)}
+        self._download(remote, [from_info], [to_info], names=[name])
+        if not os.path.exists(to_info['path']):
+            return
+
+        for m in md5s:
+            _, offset, length = index['objects'][m]
+            tmp = os.path.join(tmp_dir, m + '.tmp')
+            pack.read_object(to_info['path'], offset, length, tmp)
+            if file_md5(tmp)[0] != m:
+                msg = "Object '{}' in pack '{}' is corrupted, skipping it."
+                Logger.warn(msg.format(m, name))
+                os.unlink(tmp)
+                continue
+            self._move(tmp, self.get(m))
+
+        os.unlink(to_info['path'])
+
     def status(self, checksum_infos, remote, jobs=1, show_checksums=False):
         Logger.info("Preparing to pull data from {}".format(remote.url))
         title = "Collecting information"
@@ -494,6 +1284,7 @@ class RemoteLOCAL(RemoteBase):
         progress.set_n_total(1)
         progress.update_target(title, 0, 100)
 
+        packed = self._packed(checksum_infos, remote)
         checksum_infos, missing = self._collect(checksum_infos)
         checksum_infos += missing
 
@@ -509,6 +1300,8 @@ class RemoteLOCAL(RemoteBase):
         progress.update_target(title, 30, 100)
 
         remote_exists = remote.exists(path_infos)
+        remote_exists = [exists or md5 in packed
+                         for exists, md5 in zip(remote_exists, md5s)]
 
         progress.update_target(title, 90, 100)
 
@@ -524,7 +1317,8 @@ class RemoteLOCAL(RemoteBase):
                  checksum_infos,
                  remote,
                  jobs=1,
-                 show_checksums=False):
+                 show_checksums=False,
+                 callback=None):
         title = "Collecting information"
 
         progress.set_n_total(1)
@@ -555,9 +1349,16 @@ class RemoteLOCAL(RemoteBase):
 
         assert len(path_infos) == len(cache) == len(md5s) == len(names)
 
-        chunks = list(zip(to_chunks(path_infos, jobs),
-                          to_chunks(cache, jobs),
-                          to_chunks(names, jobs)))
+        # NOTE: smaller batches let the caller act on the objects that
+        # have already arrived while the rest are still downloading.
+        nchunks = jobs
+        if callback is not None:
+            nchunks = max(jobs, len(md5s) // self.PULL_BATCH_SIZE)
+
+        chunks = list(zip(to_chunks(path_infos, nchunks),
+                          to_chunks(cache, nchunks),
+                          to_chunks(names, nchunks),
+                          to_chunks(md5s, nchunks)))
 
         progress.finish_target(title)
 
@@ -566,19 +1367,36 @@ class RemoteLOCAL(RemoteBase):
         if len(chunks) == 0:
             return
 
-        futures = []
-        with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
-            for from_infos, to_infos, names in chunks:
-                res = executor.submit(remote.download,
-                                      from_infos,
-                                      to_infos,
-                                      names=names)
-                futures.append(res)
-
-        for f in futures:
-            f.result()
-
-    def pull(self, checksum_infos, remote, jobs=1, show_checksums=False):
+        futures = {}
+        jobs = min(jobs, len(chunks))
+        with ThreadPoolExecutor(max_workers=jobs) as ex:
+            for from_infos, to_infos, names, batch in chunks:
+                res = ex.submit(self._download,
+                                remote,
+                                from_infos,
+                                to_infos,
+                                names=names,
+                                jobs=jobs)
+                futures[res] = batch
+
+            # NOTE: callback is called from this thread only, since it
+            # is going to use the state db.
+            for f in as_completed(futures):
+                f.result()
+                if callback is not None:
+                    callback(futures[f])
+
+    def pull(self,
+             checksum_infos,
+             remote,
+             jobs=1,
+             show_checksums=False,
+             callback=None):
+        """
+        Downloads objects that are missing from the cache. If callback is
+        specified, it is called with a list of md5s every time a batch of
+        objects is downloaded, some of which might have failed to.
+        """
         Logger.info("Preparing to pull data from {}".format(remote.url))
 
         # NOTE: try fetching missing dir info
@@ -587,13 +1405,17 @@ class RemoteLOCAL(RemoteBase):
             self._do_pull(missing,
                           remote,
                           jobs,
-                          show_checksums=show_checksums)
+                          show_checksums=show_checksums,
+                          callback=callback)
             checksum_infos += self._collect(missing)[0]
 
+        self._pull_packs(checksum_infos, remote, callback=callback)
+
         self._do_pull(checksum_infos,
                       remote,
                       jobs,
-                      show_checksums=show_checksums)
+                      show_checksums=show_checksums,
+                      callback=callback)
 
     def push(self, checksum_infos, remote, jobs=1, show_checksums=False):
         Logger.info("Preparing to push data to {}".format(remote.url))
@@ -602,12 +1424,16 @@ class RemoteLOCAL(RemoteBase):
         progress.set_n_total(1)
         progress.update_target(title, 0, 100)
 
+        packed = self._packed(checksum_infos, remote, push=True)
         checksum_infos = self._collect(checksum_infos)[0]
 
         progress.update_target(title, 10, 100)
 
-        # NOTE: verifying that our cache is not corrupted
+        # NOTE: verifying that our cache is not corrupted and skipping
+        # whatever went into packs
         def func(info):
+            if info[self.PARAM_MD5] in packed:
+                return False
             return not self.changed_cache(info[self.PARAM_MD5])
         checksum_infos = list(filter(func, checksum_infos))
 
@@ -654,11 +1480,175 @@ class RemoteLOCAL(RemoteBase):
         futures = []
         with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
             for to_infos, from_infos, names in chunks:
-                res = executor.submit(remote.upload,
+                res = executor.submit(self._upload,
+                                      remote,
                                       from_infos,
                                       to_infos,
-                                      names=names)
+                                      names=names,
+                                      jobs=len(chunks))
                 futures.append(res)
 
         for f in futures:
             f.result()
+
+    def _copy_batch(self, src, dest, md5s, names, tmp_dir, jobs=1):
+        from_infos = src.md5s_to_path_infos(md5s)
+        to_infos = dest.md5s_to_path_infos(md5s)
+
+        if src.can_copy(dest):
+            # NOTE: server-side copies raise instead of logging failures
+            # the way transfers through a local file do, so that one
+            # missing object doesn't stop the rest of them.
+            for from_info, to_info, name in zip(from_infos, to_infos, names):
+                try:
+                    src.download([from_info],
+                                 [to_info],
+                                 names=[name],
+                                 jobs=jobs)
+                except Exception as exc:
+                    msg = "Failed to copy '{}' from {} to {}"
+                    Logger.error(msg.format(name, src.url, dest.url), exc)
+            return
+
+        # NOTE: remotes only know how to transfer files, so objects go
+        # through a spool dir, which is sent on to dest as soon as it
+        # holds SPOOL_SIZE bytes. They are sent as is, compressed or not.
+        spool = tempfile.mkdtemp(dir=tmp_dir)
+        try:
+            ready = []
+            size = 0
+            for md5, from_info, to_info, name in zip(md5s,
+                                                     from_infos,
+                                                     to_infos,
+                                                     names):
+                tmp_info = {'scheme': 'local',
+                            'path': os.path.join(spool, md5)}
+                src.download([from_info], [tmp_info], names=[name], jobs=jobs)
+                if not os.path.exists(tmp_info['path']):
+                    continue
+
+                ready.append((tmp_info, to_info, name))
+                size += os.path.getsize(tmp_info['path'])
+                if size >= self.SPOOL_SIZE:
+                    self._flush_spool(dest, ready, jobs)
+                    ready = []
+                    size = 0
+
+            self._flush_spool(dest, ready, jobs)
+        finally:
+            shutil.rmtree(spool)
+
+    @staticmethod
+    def _flush_spool(dest, ready, jobs):
+        """ Uploads spooled objects to dest and removes them """
+        if not ready:
+            return
+
+        tmp_infos, to_infos, names = [list(x) for x in zip(*ready)]
+        try:
+            dest.upload(tmp_infos, to_infos, names=names, jobs=jobs)
+        finally:
+            for tmp_info in tmp_infos:
+                os.unlink(tmp_info['path'])
+
+    def transfer(self,
+                 checksum_infos,
+                 src,
+                 dest,
+                 jobs=1,
+                 show_checksums=False):
+        """
+        Copies objects that dest doesn't have from src to dest, without
+        saving them to this cache. Only '.dir' objects that are missing
+        here are fetched, since their entries are needed to know what to
+        copy.
+        """
+        Logger.info("Preparing to transfer data from {} to {}"
+                    .format(src.url, dest.url))
+        title = "Collecting information"
+
+        progress.set_n_total(1)
+        progress.update_target(title, 0, 100)
+
+        checksum_infos, missing = self._collect(checksum_infos)
+        if len(missing) > 0:
+            self._do_pull(missing, src, jobs, show_checksums=show_checksums)
+            checksum_infos += self._collect(missing)[0]
+
+        progress.update_target(title, 10, 100)
+
+        md5s, names = self._group(checksum_infos,
+                                  show_checksums=show_checksums)
+
+        tmp_dir = tempfile.mkdtemp(dir=self.project.tmp_dir)
+        try:
+            # NOTE: packs go along with the objects and their indexes go
+            # last, so that an index never points to a missing pack.
+            packed = set()
+            packs = []
+            indexes = []
+            for md5 in md5s:
+                if not self.is_dir_cache(md5):
+                    continue
+
+                index = self._pack_index(md5, src, tmp_dir)
+                if index is None:
+                    continue
+
+                packed.update(index['objects'].keys())
+                packs += [pack.pack_name(p) for p in index['packs']
+                          if pack.pack_name(p) not in packs]
+                indexes.append(pack.index_name(md5))
+
+            progress.update_target(title, 30, 100)
+
+            md5s += packs
+            names += packs
+            src_exists = src.exists(src.md5s_to_path_infos(md5s))
+
+            progress.update_target(title, 60, 100)
+
+            dest_exists = dest.exists(dest.md5s_to_path_infos(md5s +
+                                                              indexes))
+            indexes = [i for i, exists in zip(indexes,
+                                              dest_exists[len(md5s):])
+                       if not exists]
+
+            progress.update_target(title, 90, 100)
+
+            todo = []
+            for md5, name, s, d in zip(md5s, names, src_exists, dest_exists):
+                if d:
+                    continue
+
+                if s:
+                    todo.append((md5, name))
+                elif md5 not in packed:
+                    msg = "'{}' is missing from {}, skipping it."
+                    Logger.warn(msg.format(name, src.url))
+
+            progress.finish_target(title)
+
+            progress.set_n_total(len(todo))
+
+            batches = to_chunks(todo, max(jobs,
+                                          len(todo) // self.PULL_BATCH_SIZE))
+            batches = [b for b in batches if b]
+            if batches:
+                jobs = min(jobs, len(batches))
+                with ThreadPoolExecutor(max_workers=jobs) as ex:
+                    futures = [ex.submit(self._copy_batch,
+                                         src,
+                                         dest,
+                                         [m for m, _ in batch],
+                                         [n for _, n in batch],
+                                         tmp_dir,
+                                         jobs)
+                               for batch in batches]
+                    for f in futures:
+                        f.result()
+
+            if indexes:
+                self._copy_batch(src, dest, indexes, indexes, tmp_dir)
+        finally:
+            shutil.rmtree(tmp_dir)
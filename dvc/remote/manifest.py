@@ -0,0 +1,195 @@
+"""
+Compact in-memory form of '.dir' cache files. Instead of a dict per
+entry it keeps three flat arrays: md5 digests, relpath offsets and one
+blob with all relpaths, sorted by relpath. The JSON '.dir' objects stay
+what is pushed to and pulled from remotes, while the same arrays are
+dumped as is into a binary sidecar next to them in the local cache, so
+that the following loads don't need to parse JSON at all. The sidecar
+records size and mtime of its '.dir' and is only used while they match.
+"""
+import os
+import uuid
+import struct
+import binascii
+from array import array
+
+
+MAGIC = b'DVCMAN2\n'
+HEADER = '<BQQd'
+DIGEST_SIZE = 16
+
+
+def _frombytes(arr, data):
+    if hasattr(arr, 'frombytes'):
+        arr.frombytes(data)
+    else:  # pragma: no cover
+        arr.fromstring(data)
+
+
+def _tobytes(arr):
+    if hasattr(arr, 'tobytes'):
+        return arr.tobytes()
+    return arr.tostring()  # pragma: no cover
+
+
+def _stat(path):
+    st = os.stat(path)
+    return (st.st_size, st.st_mtime)
+
+
+class DirManifest(object):
+    """ Sorted (relpath, md5) entries of a directory with unix relpaths """
+    def __init__(self, digests=b'', offsets=None, blob=b''):
+        self._digests = digests
+        self._offsets = offsets if offsets is not None else array('L', [0])
+        self._blob = blob
+
+    @classmethod
+    def from_list(cls, dir_info, relpath_key='relpath', md5_key='md5'):
+        entries = sorted((entry[relpath_key].encode('utf-8'),
+                          binascii.unhexlify(entry[md5_key]))
+                         for entry in dir_info)
+
+        offsets = array('L', [0])
+        for relpath, _ in entries:
+            offsets.append(offsets[-1] + len(relpath))
+
+        return cls(b''.join(digest for _, digest in entries),
+                   offsets,
+                   b''.join(relpath for relpath, _ in entries))
+
+    @classmethod
+    def load(cls, path, source):
+        """ Loads manifest that was dumped for the '.dir' file source """
+        with open(path, 'rb') as fd:
+            data = fd.read()
+
+        header_size = len(MAGIC) + struct.calcsize(HEADER)
+        if not data.startswith(MAGIC):
+            raise ValueError("'{}' is not a dir manifest".format(path))
+
+        itemsize, count, size, mtime = struct.unpack(
+            HEADER, data[len(MAGIC):header_size])
+        if (size, mtime) != _stat(source):
+            raise ValueError("'{}' doesn't match '{}'".format(path, source))
+
+        offsets = array('L')
+        if offsets.itemsize != itemsize:
+            raise ValueError("'{}' was written on another platform"
+                             .format(path))
+
+        pos = header_size
+        digests = data[pos:pos + count * DIGEST_SIZE]
+        pos += count * DIGEST_SIZE
+        _frombytes(offsets, data[pos:pos + (count + 1) * itemsize])
+        pos += (count + 1) * itemsize
+        blob = data[pos:]
+
+        if len(digests) != count * DIGEST_SIZE or \
+           len(offsets) != count + 1 or \
+           len(blob) != offsets[-1]:
+            raise ValueError("'{}' is truncated".format(path))
+
+        return cls(digests, offsets, blob)
+
+    def dump(self, path, source):
+        size, mtime = _stat(source)
+        # NOTE: writing first and renaming after that to make sure that
+        # concurrent readers never see a partial file.
+        tmp = '{}.{}'.format(path, str(uuid.uuid4()))
+        with open(tmp, 'wb') as fd:
+            fd.write(MAGIC)
+            fd.write(struct.pack(HEADER,
+                                 self._offsets.itemsize,
+                                 len(self),
+                                 size,
+                                 mtime))
+            fd.write(self._digests)
+            fd.write(_tobytes(self._offsets))
+            fd.write(self._blob)
+        os.rename(tmp, path)
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    @property
+    def nbytes(self):
+        """ Approximate memory taken by the entries """
+        return len(self._digests) + \
+            len(self._offsets) * self._offsets.itemsize + \
+            len(self._blob)
+
+    def _key(self, i):
+        return self._blob[self._offsets[i]:self._offsets[i + 1]]
+
+    def relpath(self, i):
+        return self._key(i).decode('utf-8')
+
+    def md5(self, i):
+        digest = self._digests[i * DIGEST_SIZE:(i + 1) * DIGEST_SIZE]
+        return binascii.hexlify(digest).decode('ascii')
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield (self.relpath(i), self.md5(i))
+
+    def md5s(self):
+        for i in range(len(self)):
+            yield self.md5(i)
+
+    def _bisect(self, key):
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def find(self, relpath):
+        """ md5 of the entry with a (unix) relpath, None if there is none """
+        key = relpath.encode('utf-8')
+        i = self._bisect(key)
+        if i < len(self) and self._key(i) == key:
+            return self.md5(i)
+        return None
+
+    def prefixed(self, prefix):
+        """ Entries that are either (unix) prefix itself or inside of it """
+        md5 = self.find(prefix)
+        if md5 is not None:
+            yield (prefix, md5)
+
+        key = prefix.encode('utf-8') + b'/'
+        i = self._bisect(key)
+        while i < len(self) and self._key(i).startswith(key):
+            yield (self.relpath(i), self.md5(i))
+            i += 1
+
+    def diff(self, other):
+        """
+        Yields (relpath, md5 here, md5 in other) for every entry that is
+        different, with None for the side that doesn't have it.
+        """
+        i, j = 0, 0
+        while i < len(self) or j < len(other):
+            a = self._key(i) if i < len(self) else None
+            b = other._key(j) if j < len(other) else None
+
+            if b is None or (a is not None and a < b):
+                yield (self.relpath(i), self.md5(i), None)
+                i += 1
+            elif a is None or b < a:
+                yield (other.relpath(j), None, other.md5(j))
+                j += 1
+            else:
+                if self._digests[i * DIGEST_SIZE:(i + 1) * DIGEST_SIZE] != \
+                   other._digests[j * DIGEST_SIZE:(j + 1) * DIGEST_SIZE]:
+                    yield (self.relpath(i), self.md5(i), other.md5(j))
+                i += 1
+                j += 1
+
+    def to_list(self, relpath_key='relpath', md5_key='md5'):
+        return [{relpath_key: relpath, md5_key: md5}
+                for relpath, md5 in self]
@@ -0,0 +1,104 @@
+"""
+Pack files bundle lots of small cache objects into a few large remote
+objects, so that pushing/pulling a directory doesn't take a request per
+file.
+
+For a directory with checksum '<md5>.dir' the remote gets '<md5>.idx',
+which lists its packs and where each object is in them:
+
+    {"packs": ["<pack md5>", ...],
+     "objects": {"<md5>": [<pack number>, <offset>, <length>], ...}}
+
+and the packs themselves as '<pack md5>.pack'. Only objects that the
+remote doesn't have are packed, the index points to packs of other
+directories for the rest. The index is uploaded last, so it only exists
+once all of its packs do.
+"""
+import os
+import json
+import uuid
+import hashlib
+
+
+PACK_SUFFIX = '.pack'
+INDEX_SUFFIX = '.idx'
+# NOTE: objects larger than that are transferred as is
+PACK_THRESHOLD = 1024 * 1024
+PACK_SIZE = 64 * 1024 * 1024
+
+
+def index_name(dir_md5):
+    return os.path.splitext(dir_md5)[0] + INDEX_SUFFIX
+
+
+def pack_name(md5):
+    return md5 + PACK_SUFFIX
+
+
+def is_pack_file(name):
+    """
+    Whether a remote object is a pack or an index. They are not named
+    after checksums of data, so gc keeps the ones that used indexes need.
+    """
+    return name.endswith(PACK_SUFFIX) or name.endswith(INDEX_SUFFIX)
+
+
+def write_packs(objects, dname, size=PACK_SIZE):
+    """
+    Writes (md5, path) objects into packs of about `size` bytes in dname.
+    Yields (pack md5, pack path, [(md5, offset, length), ...]) for every
+    pack as soon as it is complete.
+    """
+    def finish(fobj, tmp, hasher, entries):
+        fobj.close()
+        md5 = hasher.hexdigest()
+        path = os.path.join(dname, pack_name(md5))
+        os.rename(tmp, path)
+        return (md5, path, entries)
+
+    fobj = None
+    for md5, path in objects:
+        if fobj is None:
+            tmp = os.path.join(dname, str(uuid.uuid4()))
+            fobj = open(tmp, 'wb')
+            hasher = hashlib.md5()
+            entries = []
+            offset = 0
+
+        with open(path, 'rb') as fd:
+            data = fd.read()
+
+        fobj.write(data)
+        hasher.update(data)
+        entries.append((md5, offset, len(data)))
+        offset += len(data)
+
+        if offset >= size:
+            yield finish(fobj, tmp, hasher, entries)
+            fobj = None
+
+    if fobj is not None:
+        yield finish(fobj, tmp, hasher, entries)
+
+
+def read_object(path, offset, length, dest):
+    with open(path, 'rb') as fd:
+        fd.seek(offset)
+        data = fd.read(length)
+
+    with open(dest, 'wb') as fd:
+        fd.write(data)
+
+
+def dump_index(index, path):
+    with open(path, 'w+') as fd:
+        json.dump(index, fd, sort_keys=True)
+
+
+def load_index(path):
+    with open(path, 'r') as fd:
+        index = json.load(fd)
+
+    assert isinstance(index['packs'], list)
+    assert isinstance(index['objects'], dict)
+    return index
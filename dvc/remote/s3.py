@@ -2,11 +2,6 @@ import os
 import threading
 import posixpath
 
-try:
-    import boto3
-except ImportError:
-    boto3 = None
-
 try:
     from urlparse import urlparse
 except ImportError:
@@ -36,8 +31,17 @@ class Callback(object):
 class RemoteS3(RemoteBase):
     scheme = 's3'
     REGEX = r'^s3://(?P<path>.*)$'
-    REQUIRES = {'boto3': boto3}
+    REQUIRES = {'boto3': 'boto3'}
     PARAM_ETAG = 'etag'
+    # NOTE: multipart copies get an etag of their own, so the one of the
+    # original object is kept in metadata of the copy
+    META_ETAG = 'dvc-etag'
+    # NOTE: headers that multipart copies don't carry over by themselves
+    COPY_HEADERS = ['CacheControl',
+                    'ContentDisposition',
+                    'ContentEncoding',
+                    'ContentLanguage',
+                    'ContentType']
 
     def __init__(self, project, config):
         import configobj
@@ -62,6 +66,8 @@ class RemoteS3(RemoteBase):
         self.aws_access_key_id = creds.get('aws_access_key_id', None)
         self.aws_secret_access_key = creds.get('aws_secret_access_key', None)
 
+        self._init_multipart(config)
+
     @property
     def bucket(self):
         return urlparse(self.url).netloc
@@ -72,6 +78,8 @@ class RemoteS3(RemoteBase):
 
     @property
     def s3(self):
+        import boto3
+
         if not self.creds:
             session = boto3.session.Session(profile_name=self.profile)
         else:
@@ -81,13 +89,29 @@ class RemoteS3(RemoteBase):
                              region_name=self.region)
         return session.client('s3', endpoint_url=self.endpoint_url)
 
+    def transfer_config(self, jobs=1):
+        from boto3.s3.transfer import TransferConfig
+
+        return TransferConfig(multipart_threshold=self.multipart_threshold,
+                              multipart_chunksize=self.multipart_chunksize,
+                              max_concurrency=self.multipart_concurrency(jobs))
+
     def get_etag(self, bucket, key):
         try:
             obj = self.s3.head_object(Bucket=bucket, Key=key)
         except Exception:
             raise DvcException('s3://{}/{} does not exist'.format(bucket, key))
 
-        return obj['ETag'].strip('"')
+        etag = obj['ETag'].strip('"')
+        # NOTE: only etags of multipart uploads and copies have a '-N'
+        # suffix, anything else is the etag of the content itself
+        if self._is_multipart(etag):
+            etag = obj.get('Metadata', {}).get(self.META_ETAG, etag)
+        return etag
+
+    @staticmethod
+    def _is_multipart(etag):
+        return '-' in etag
 
     def save_info(self, path_info):
         if path_info['scheme'] != 's3':
@@ -109,12 +133,41 @@ class RemoteS3(RemoteBase):
 
         return checksum_info != self.save_info(path_info)
 
-    def _copy(self, from_info, to_info, s3=None):
+    def _copy(self, from_info, to_info, s3=None, etag=None, jobs=1):
+        """
+        Server-side copy, done in parts in parallel for large objects. A
+        copy in parts gets an etag of its own and nothing of the original
+        but what we pass along, so it is given metadata of the original
+        and etag, if specified, to be returned by get_etag().
+        """
         s3 = s3 if s3 else self.s3
+        config = self.transfer_config(jobs)
 
         source = {'Bucket': from_info['bucket'],
                   'Key': from_info['key']}
-        self.s3.copy(source, to_info['bucket'], to_info['key'])
+        obj = s3.head_object(**source)
+
+        extra_args = None
+        if self._is_multipart(obj['ETag'].strip('"')) or \
+           obj['ContentLength'] >= config.multipart_threshold:
+            # NOTE: copies of multipart objects are done in parts even if
+            # they are small, so that their etags keep the suffix
+            config.multipart_threshold = 0
+
+            metadata = dict(obj.get('Metadata', {}))
+            if etag:
+                metadata[self.META_ETAG] = etag
+
+            extra_args = {'Metadata': metadata}
+            for header in self.COPY_HEADERS:
+                if obj.get(header, None):
+                    extra_args[header] = obj[header]
+
+        s3.copy(source,
+                to_info['bucket'],
+                to_info['key'],
+                ExtraArgs=extra_args,
+                Config=config)
 
     def save(self, path_info):
         if path_info['scheme'] != 's3':
@@ -124,7 +177,7 @@ class RemoteS3(RemoteBase):
         key = posixpath.join(self.prefix, etag[0:2], etag[2:])
         to_info = {'scheme': 's3', 'bucket': self.bucket, 'key': key}
 
-        self._copy(path_info, to_info)
+        self._copy(path_info, to_info, etag=etag)
 
         return {self.PARAM_ETAG: etag}
 
@@ -175,7 +228,7 @@ class RemoteS3(RemoteBase):
         key = posixpath.join(self.prefix, etag[0:2], etag[2:])
         from_info = {'scheme': 's3', 'bucket': self.bucket, 'key': key}
 
-        self._copy(from_info, path_info)
+        self._copy(from_info, path_info, etag=etag)
 
     def remove(self, path_info):
         if path_info['scheme'] != 's3':
@@ -187,6 +240,15 @@ class RemoteS3(RemoteBase):
         self.s3.delete_object(Bucket=path_info['bucket'],
                               Key=path_info['key'])
 
+    def can_copy(self, remote):
+        # NOTE: copy is done with our credentials, so it has to be the
+        # same service and the same account.
+        return isinstance(remote, RemoteS3) and \
+            (remote.endpoint_url, remote.profile,
+             remote.aws_access_key_id, remote.region) == \
+            (self.endpoint_url, self.profile,
+             self.aws_access_key_id, self.region)
+
     def md5s_to_path_infos(self, md5s):
         return [{'scheme': self.scheme,
                  'bucket': self.bucket,
@@ -233,10 +295,11 @@ class RemoteS3(RemoteBase):
 
         return ret
 
-    def upload(self, from_infos, to_infos, names=None):
+    def upload(self, from_infos, to_infos, names=None, jobs=1):
         names = self._verify_path_args(to_infos, from_infos, names)
 
         s3 = self.s3
+        config = self.transfer_config(jobs)
 
         for from_info, to_info, name in zip(from_infos, to_infos, names):
             if to_info['scheme'] != 's3':
@@ -259,7 +322,8 @@ class RemoteS3(RemoteBase):
                 s3.upload_file(from_info['path'],
                                to_info['bucket'],
                                to_info['key'],
-                               Callback=cb)
+                               Callback=cb,
+                               Config=config)
             except Exception as exc:
                 msg = "Failed to upload '{}'".format(from_info['path'])
                 Logger.error(msg, exc)
@@ -271,17 +335,19 @@ class RemoteS3(RemoteBase):
                  from_infos,
                  to_infos,
                  no_progress_bar=False,
-                 names=None):
+                 names=None,
+                 jobs=1):
         names = self._verify_path_args(from_infos, to_infos, names)
 
         s3 = self.s3
+        config = self.transfer_config(jobs)
 
         for to_info, from_info, name in zip(to_infos, from_infos, names):
             if from_info['scheme'] != 's3':
                 raise NotImplementedError
 
             if to_info['scheme'] == 's3':
-                self._copy(from_info, to_info, s3=s3)
+                self._copy(from_info, to_info, s3=s3, jobs=jobs)
                 continue
 
             if to_info['scheme'] != 'local':
@@ -309,7 +375,8 @@ class RemoteS3(RemoteBase):
                 s3.download_file(from_info['bucket'],
                                  from_info['key'],
                                  tmp_file,
-                                 Callback=cb)
+                                 Callback=cb,
+                                 Config=config)
             except Exception as exc:
                 msg = "Failed to download '{}/{}'".format(from_info['bucket'],
                                                           from_info['key'])
@@ -332,10 +399,13 @@ class RemoteS3(RemoteBase):
     def gc(self, cinfos):
         used_etags = [info[self.PARAM_ETAG] for info in cinfos['s3']]
         used_etags += [info[RemoteLOCAL.PARAM_MD5] for info in cinfos['local']]
+        # NOTE: packs and indexes are not named after checksums of data
+        used_packs = self.project.cache.local.used_packs(cinfos['local'],
+                                                         self)
 
         removed = False
         for etag in self._all():
-            if etag in used_etags:
+            if etag in used_etags or etag in used_packs:
                 continue
             path_info = {'scheme': 's3',
                          'key': posixpath.join(self.prefix,
@@ -2,11 +2,6 @@ import os
 import getpass
 import posixpath
 
-try:
-    import paramiko
-except ImportError:
-    paramiko = None
-
 from dvc.logger import Logger
 from dvc.progress import progress
 from dvc.remote.base import RemoteBase
@@ -43,7 +38,7 @@ class RemoteSSH(RemoteBase):
     # NOTE: temporarily only absolute paths are allowed
     REGEX = r'^ssh://((?P<user>.*)@)?(?P<host>[^/]*):(?P<path>/.*)$'
 
-    REQUIRES = {'paramiko': paramiko}
+    REQUIRES = {'paramiko': 'paramiko'}
     PARAM_MD5 = 'md5'
 
     DEFAULT_PORT = 22
@@ -65,6 +60,12 @@ class RemoteSSH(RemoteBase):
         self.ask_password = config.get(Config.SECTION_REMOTE_ASK_PASSWORD,
                                        False)
 
+    def can_copy(self, remote):
+        # NOTE: cp is run on the remote machine
+        return isinstance(remote, RemoteSSH) and \
+            (remote.host, remote.user, remote.port) == \
+            (self.host, self.user, self.port)
+
     def md5s_to_path_infos(self, md5s):
         return [{'scheme': 'ssh',
                  'host': self.host,
@@ -78,6 +79,8 @@ class RemoteSSH(RemoteBase):
               "through port '{}' as user '{}'"
         Logger.debug(msg.format(host, port, user))
 
+        import paramiko
+
         ssh = paramiko.SSHClient()
 
         ssh.load_system_host_keys()
@@ -309,7 +312,8 @@ class RemoteSSH(RemoteBase):
                  from_infos,
                  to_infos,
                  no_progress_bar=False,
-                 names=None):
+                 names=None,
+                 jobs=1):
         names = self._verify_path_args(from_infos, to_infos, names)
 
         ssh = self.ssh(host=from_infos[0]['host'],
@@ -356,7 +360,7 @@ class RemoteSSH(RemoteBase):
 
         ssh.close()
 
-    def upload(self, from_infos, to_infos, names=None):
+    def upload(self, from_infos, to_infos, names=None, jobs=1):
         names = self._verify_path_args(to_infos, from_infos, names)
 
         ssh = self.ssh(host=to_infos[0]['host'],
@@ -415,10 +419,13 @@ class RemoteSSH(RemoteBase):
     def gc(self, cinfos):
         used = [info[self.PARAM_MD5] for info in cinfos['ssh']]
         used += [info[RemoteLOCAL.PARAM_MD5] for info in cinfos['local']]
+        # NOTE: packs and indexes are not named after checksums of data
+        used_packs = self.project.cache.local.used_packs(cinfos['local'],
+                                                         self)
 
         removed = False
         for md5 in self._all_md5s():
-            if md5 in used:
+            if md5 in used or md5 in used_packs:
                 continue
             path_info = {'scheme': 'ssh',
                          'user': self.user,
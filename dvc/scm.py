@@ -1,4 +1,6 @@
 import os
+import binascii
+import threading
 
 from dvc.exceptions import DvcException
 from dvc.logger import Logger
@@ -32,7 +34,14 @@ class Base(object):
         pass
 
     def ignore_list(self, p_list):
-        return [self.ignore(path) for path in p_list]
+        with self:
+            return [self.ignore(path) for path in p_list]
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, type, value, tb):
+        pass
 
     def add(self, paths):
         pass
@@ -56,8 +65,15 @@ class Base(object):
             branches = self.list_branches() if all_branches else [saved]
         for branch in branches:
             self.checkout(branch)
+            self._reset_project()
             yield branch
         self.checkout(saved)
+        self._reset_project()
+
+    def _reset_project(self):
+        # NOTE: stage files might differ between branches
+        if self.project is not None:
+            self.project._reset()
 
     def untracked_files(self):
         pass
@@ -65,6 +81,24 @@ class Base(object):
     def is_tracked(self, path):
         pass
 
+    def tracked_files(self):
+        return []
+
+    def list_tree(self, rev):
+        return []
+
+    def read_blob(self, sha):
+        # NOTE: there is no history without scm, so neither list_tree()
+        # nor find_blob() ever return a sha to read.
+        raise SCMError("no blob '{}' in '{}', since it is not tracked by "
+                       "any supported scm tool".format(sha, self.root_dir))
+
+    def rev_list(self, rev, limit=None):
+        return []
+
+    def find_blob(self, rev, path):
+        return None
+
     def active_branch(self):
         pass
 
@@ -82,19 +116,40 @@ class Git(Base):
     def __init__(self, root_dir=os.curdir, project=None):
         super(Git, self).__init__(root_dir, project=project)
 
+        # NOTE: GitPython is slow to import and a lot of commands never
+        # need it, so the repo is only opened on first use.
+        self._repo = None
+        self._odb_lock = threading.Lock()
+
+        self._tracked = None
+        self._tracked_stat = None
+
+        # NOTE: gitignore changes are collected while inside of the
+        # 'with scm:' block and written once per gitignore on exit.
+        self._ignore_depth = 0
+        self._ignore_changes = {}
+
+    @property
+    def repo(self):
+        if self._repo is not None:
+            return self._repo
+
         import git
         from git.exc import InvalidGitRepositoryError
         try:
-            self.repo = git.Repo(root_dir)
+            repo = git.Repo(self.root_dir)
         except InvalidGitRepositoryError:
             msg = '{} is not a git repository'
-            raise SCMError(msg.format(root_dir))
+            raise SCMError(msg.format(self.root_dir))
 
         # NOTE: fixing LD_LIBRARY_PATH for binary built by PyInstaller.
         # http://pyinstaller.readthedocs.io/en/stable/runtime-information.html
         env = fix_env(None)
         lp = env.get('LD_LIBRARY_PATH', None)
-        self.repo.git.update_environment(LD_LIBRARY_PATH=lp)
+        repo.git.update_environment(LD_LIBRARY_PATH=lp)
+
+        self._repo = repo
+        return self._repo
 
     @staticmethod
     def is_repo(root_dir):
@@ -118,48 +173,76 @@ class Git(Base):
 
         return entry, gitignore
 
-    def ignore(self, path):
-        entry, gitignore = self._get_gitignore(path)
+    def __enter__(self):
+        self._ignore_depth += 1
 
-        ignore_list = []
-        if os.path.exists(gitignore):
-            ignore_list = open(gitignore, 'r').readlines()
-            filtered = list(filter(lambda x: x.strip() == entry.strip(),
-                                   ignore_list))
-            if len(filtered) != 0:
-                return
+    def __exit__(self, type, value, tb):
+        self._ignore_depth -= 1
+        if self._ignore_depth == 0:
+            self._flush_ignore()
 
-        msg = "Adding '{}' to '{}'.".format(os.path.relpath(path),
-                                            os.path.relpath(gitignore))
-        Logger.info(msg)
+    def _change_ignore(self, path, add):
+        entry, gitignore = self._get_gitignore(path)
 
-        content = entry
-        if len(ignore_list) > 0:
-            content = '\n' + content
+        changes = self._ignore_changes.setdefault(gitignore, [])
+        changes.append((entry.strip(), path, add))
 
-        with open(gitignore, 'a') as fd:
-            fd.write(content)
+        if self._ignore_depth == 0:
+            self._flush_ignore()
 
-        if self.project is not None:
-            self.project._files_to_git_add.append(os.path.relpath(gitignore))
+    def _flush_ignore(self):
+        changes = self._ignore_changes
+        self._ignore_changes = {}
 
-    def ignore_remove(self, path):
-        entry, gitignore = self._get_gitignore(path)
+        for gitignore, entries in changes.items():
+            self._update_gitignore(gitignore, entries)
 
-        if not os.path.exists(gitignore):
+    def _update_gitignore(self, gitignore, changes):
+        lines = []
+        if os.path.exists(gitignore):
+            with open(gitignore, 'r') as fd:
+                lines = fd.readlines()
+
+        existing = set(line.strip() for line in lines)
+
+        removed = set()
+        added = []
+        for entry, path, add in changes:
+            if add:
+                removed.discard(entry)
+                if entry not in existing and entry not in added:
+                    added.append(entry)
+                    msg = "Adding '{}' to '{}'."
+                    Logger.info(msg.format(os.path.relpath(path),
+                                           os.path.relpath(gitignore)))
+            else:
+                if entry in added:
+                    added.remove(entry)
+                removed.add(entry)
+
+        removed &= existing
+        if not added and not removed:
             return
 
-        with open(gitignore, 'r') as fd:
-            lines = fd.readlines()
-
-        filtered = list(filter(lambda x: x.strip() != entry.strip(), lines))
+        lines = [line for line in lines if line.strip() not in removed]
+        content = ''.join(lines)
+        if added:
+            if len(content) > 0 and not content.endswith('\n'):
+                content += '\n'
+            content += '\n'.join(added)
 
         with open(gitignore, 'w') as fd:
-            fd.writelines(filtered)
+            fd.write(content)
 
         if self.project is not None:
             self.project._files_to_git_add.append(os.path.relpath(gitignore))
 
+    def ignore(self, path):
+        self._change_ignore(path, add=True)
+
+    def ignore_remove(self, path):
+        self._change_ignore(path, add=False)
+
     def add(self, paths):
         # NOTE: GitPython is not currently able to handle index version >= 3.
         # See https://github.com/iterative/dvc/issues/610 for more details.
@@ -188,8 +271,88 @@ class Git(Base):
         files = self.repo.untracked_files
         return [os.path.join(self.repo.working_dir, fname) for fname in files]
 
+    def _index_stat(self):
+        index = os.path.join(self.repo.git_dir, 'index')
+        if not os.path.exists(index):
+            return None
+        st = os.stat(index)
+        return (st.st_ino, st.st_size, st.st_mtime)
+
+    def _tracked_paths(self):
+        # NOTE: reading the whole index once instead of running
+        # 'git ls-files' for each path. Re-read it only if the index file
+        # has changed since then.
+        stat = self._index_stat()
+        if self._tracked is not None and stat == self._tracked_stat:
+            return self._tracked
+
+        files = set()
+        dirs = set()
+        for f in self.repo.git.ls_files('-z').split('\0'):
+            if not f:
+                continue
+            path = os.path.join(self.repo.working_dir, os.path.normpath(f))
+            files.add(path)
+            parent = os.path.dirname(path)
+            while parent not in dirs and parent != self.repo.working_dir:
+                dirs.add(parent)
+                parent = os.path.dirname(parent)
+
+        self._tracked = (files, dirs)
+        self._tracked_stat = stat
+        return self._tracked
+
     def is_tracked(self, path):
-        return len(self.repo.git.ls_files(path)) != 0
+        files, dirs = self._tracked_paths()
+        path = os.path.abspath(path)
+        return path in files or path in dirs
+
+    def tracked_files(self):
+        return list(self._tracked_paths()[0])
+
+    def list_tree(self, rev):
+        """ List (relpath, blob sha) of all files in rev's tree """
+        ret = []
+        out = self.repo.git.ls_tree('-r', '-z', '--full-tree', rev)
+        for entry in out.split('\0'):
+            if not entry:
+                continue
+            info, path = entry.split('\t', 1)
+            mode, typ, sha = info.split()
+            if typ != 'blob':
+                continue
+            ret.append((path, sha))
+        return ret
+
+    def read_blob(self, sha):
+        # NOTE: odb reuses a single 'git cat-file --batch' process
+        # instead of spawning one per blob, so threads take turns on it.
+        with self._odb_lock:
+            return self.repo.odb.stream(binascii.unhexlify(sha)).read()
+
+    def rev_list(self, rev, limit=None):
+        """ Shas of rev and its ancestors, newest first """
+        from git.exc import GitCommandError
+
+        args = [rev]
+        if limit is not None:
+            args.insert(0, '--max-count={}'.format(limit))
+        try:
+            return self.repo.git.rev_list(*args).split()
+        except GitCommandError:
+            raise SCMError('\'{}\' is not a valid revision'.format(rev))
+
+    def find_blob(self, rev, path):
+        """ Sha of the blob for path in rev's tree or None """
+        relpath = os.path.relpath(os.path.abspath(path), self.root_dir)
+        relpath = relpath.replace(os.sep, '/')
+        try:
+            obj = self.repo.commit(rev).tree[relpath]
+        except KeyError:
+            return None
+        if obj.type != 'blob':
+            return None
+        return obj.hexsha
 
     def active_branch(self):
         return self.repo.active_branch.name
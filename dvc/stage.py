@@ -182,6 +182,7 @@ class Stage(object):
     def remove(self):
         self.remove_outs(ignore_remove=True)
         os.unlink(self.path)
+        self.project._reset()
 
     def reproduce(self, force=False, dry=False, interactive=False):
         if not self.changed() and not force:
@@ -367,6 +368,7 @@ class Stage(object):
             yaml.safe_dump(self.dumpd(), fd, default_flow_style=False)
 
         self.project._files_to_git_add.append(os.path.relpath(fname))
+        self.project._reset()
 
     def save(self):
         for dep in self.deps:
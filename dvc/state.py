@@ -1,7 +1,10 @@
 import os
+import json
 import time
 import sqlite3
 import nanotime
+from multiprocessing import cpu_count
+from concurrent.futures import ThreadPoolExecutor
 
 from dvc.config import Config
 from dvc.system import System
@@ -14,6 +17,13 @@ class StateDuplicateError(DvcException):
     pass
 
 
+class StateLockedError(DvcException):
+    def __init__(self, path):
+        msg = "state db '{}' is locked by another dvc process, please " \
+              "retry the cmd later".format(path)
+        super(StateLockedError, self).__init__(msg)
+
+
 class State(object):
     STATE_FILE = 'state'
     STATE_TABLE = 'state'
@@ -31,9 +41,26 @@ class State(object):
                               "inode INTEGER NOT NULL, " \
                               "mtime TEXT NOT NULL"
 
+    METRICS_TABLE = 'metrics'
+    METRICS_TABLE_LAYOUT = "rev TEXT NOT NULL, " \
+                           "path TEXT NOT NULL, " \
+                           "type TEXT NOT NULL, " \
+                           "xpath TEXT NOT NULL, " \
+                           "value TEXT NOT NULL, " \
+                           "PRIMARY KEY (rev, path, type, xpath)"
+
+    PARTIAL_TABLE = 'partial'
+    PARTIAL_TABLE_LAYOUT = "path TEXT PRIMARY KEY, " \
+                           "md5 TEXT NOT NULL, " \
+                           "prefixes TEXT NOT NULL"
+
     STATE_ROW_LIMIT = 10000000
     STATE_ROW_CLEANUP_QUOTA = 50
 
+    # NOTE: seconds to wait for other processes that write to state db
+    # at the same time, see _commit_shared()
+    BUSY_TIMEOUT = 30
+
     def __init__(self, project, config):
         self.project = project
         self.dvc_dir = project.dvc_dir
@@ -67,9 +94,11 @@ class State(object):
     def init(project):
         return State(project)
 
-    def _collect(self, path):
+    def _collect(self, path, md5=None):
         if os.path.isdir(path):
             return self.project.cache.local.collect_dir_cache(path)
+        elif md5 is not None:
+            return (md5, None)
         else:
             return (file_md5(path)[0], None)
 
@@ -87,7 +116,8 @@ class State(object):
             assert self.db is None
             assert self.c is None
             assert self.inserts == 0
-            self.db = sqlite3.connect(self.state_file)
+            self.db = sqlite3.connect(self.state_file,
+                                      timeout=self.BUSY_TIMEOUT)
             self.c = self.db.cursor()
 
             # Try loading once to check that the file is indeed a database
@@ -101,25 +131,47 @@ class State(object):
                                           self.STATE_INFO_TABLE_LAYOUT))
                 self.c.execute(cmd.format(self.LINK_STATE_TABLE,
                                           self.LINK_STATE_TABLE_LAYOUT))
+                self.c.execute(cmd.format(self.METRICS_TABLE,
+                                          self.METRICS_TABLE_LAYOUT))
+                self.c.execute(cmd.format(self.PARTIAL_TABLE,
+                                          self.PARTIAL_TABLE_LAYOUT))
 
                 cmd = "INSERT OR IGNORE INTO {} (count) SELECT 0 " \
                       "WHERE NOT EXISTS (SELECT * FROM {})"
                 self.c.execute(cmd.format(self.STATE_INFO_TABLE,
                                           self.STATE_INFO_TABLE))
+                self.db.commit()
 
                 return
-            except sqlite3.DatabaseError:
+            except sqlite3.DatabaseError as exc:
                 self.c.close()
                 self.db.close()
                 self.db = None
                 self.c = None
                 self.inserts = 0
+                # NOTE: somebody else is using it, it is not corrupted
+                if self._is_locked(exc):
+                    raise StateLockedError(self.state_file)
                 if retries > 0:
                     os.unlink(self.state_file)
                     retries -= 1
                 else:
                     raise
 
+    @staticmethod
+    def _is_locked(exc):
+        return isinstance(exc, sqlite3.OperationalError) and \
+            'locked' in str(exc)
+
+    def _commit_shared(self):
+        """
+        Commands that hold a shared project lock run alongside each other,
+        so they commit their changes right away instead of keeping state
+        db locked until dump().
+        """
+        if self.project.lock.shared:
+            self.db.commit()
+
     def dump(self):
         assert self.db is not None
 
@@ -182,21 +234,25 @@ class State(object):
     def inode(path):
         return System.inode(path)
 
-    def _do_update(self, path):
+    def _get(self, inode):
+        cmd = 'SELECT * from {} WHERE inode={}'.format(self.STATE_TABLE,
+                                                       inode)
+
+        self.c.execute(cmd)
+        return self.c.fetchall()
+
+    def _do_update(self, path, known_md5=None):
         if not os.path.exists(path):
             return (None, None)
 
         mtime = self.mtime(path)
         inode = self.inode(path)
 
-        cmd = 'SELECT * from {} WHERE inode={}'.format(self.STATE_TABLE,
-                                                       inode)
-
-        self.c.execute(cmd)
-        ret = self.c.fetchall()
+        ret = self._get(inode)
         if len(ret) == 0:
-            md5, info = self._collect(path)
-            cmd = 'INSERT INTO {}(inode, mtime, md5, timestamp) ' \
+            md5, info = self._collect(path, known_md5)
+            # NOTE: REPLACE in case another process has just added it
+            cmd = 'REPLACE INTO {}(inode, mtime, md5, timestamp) ' \
                   'VALUES ({}, "{}", "{}", "{}")'
             self.c.execute(cmd.format(self.STATE_TABLE,
                                       inode,
@@ -210,7 +266,7 @@ class State(object):
             i, m, md5, timestamp = ret[0]
             assert i == inode
             if mtime != m:
-                md5, info = self._collect(path)
+                md5, info = self._collect(path, known_md5)
                 cmd = 'UPDATE {} SET ' \
                       'mtime = "{}", md5 = "{}", timestamp = "{}" ' \
                       'WHERE inode = {}'
@@ -229,10 +285,53 @@ class State(object):
         return (md5, info)
 
     def update(self, path):
-        return self._do_update(path)[0]
+        md5 = self._do_update(path)[0]
+        self._commit_shared()
+        return md5
+
+    def touch(self, path):
+        """ Marks path as just used, if state knows about it """
+        cmd = 'UPDATE {} SET timestamp = "{}" WHERE inode = {}'
+        self.c.execute(cmd.format(self.STATE_TABLE,
+                                  int(nanotime.timestamp(time.time())),
+                                  self.inode(path)))
+        self._commit_shared()
+
+    def atime(self, path):
+        """
+        Last time path was used according to state, falls back to its
+        mtime for the files that state doesn't know about.
+        """
+        ret = self._get(self.inode(path))
+        if len(ret) == 1:
+            return int(ret[0][3])
+        return int(nanotime.timestamp(os.path.getmtime(path)))
+
+    def update_files(self, paths, jobs=None):
+        """ Update state for a bulk of files, computing md5s in parallel """
+        stale = []
+        for path in paths:
+            if not os.path.isfile(path):
+                continue
+
+            ret = self._get(self.inode(path))
+            if len(ret) == 0 or ret[0][1] != self.mtime(path):
+                stale.append(path)
+
+        if len(stale) == 0:
+            return
+
+        jobs = jobs if jobs else cpu_count()
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            md5s = list(executor.map(lambda p: file_md5(p)[0], stale))
+
+        for path, md5 in zip(stale, md5s):
+            self._do_update(path, known_md5=md5)
+        self._commit_shared()
 
     def update_info(self, path):
         md5, info = self._do_update(path)
+        self._commit_shared()
         if not info:
             info = self.project.cache.local.load_dir_cache(md5)
         return (md5, info)
@@ -251,6 +350,7 @@ class State(object):
                                                inode,
                                                mtime)
         self.c.execute(cmd)
+        self._commit_shared()
 
     def remove_unused_links(self, used):
         unused = []
@@ -277,3 +377,52 @@ class State(object):
         for p in unused:
             cmd = 'DELETE FROM {} WHERE path = "{}"'
             self.c.execute(cmd.format(self.LINK_STATE_TABLE, p))
+        self._commit_shared()
+
+    def get_partial(self, path):
+        """
+        Returns (md5, prefixes) if only the prefixes of directory path
+        are checked out, None otherwise.
+        """
+        relpath = os.path.relpath(path, self.root_dir)
+        cmd = 'SELECT md5, prefixes FROM {} WHERE path = ?'
+        self.c.execute(cmd.format(self.PARTIAL_TABLE), (relpath,))
+        ret = self.c.fetchall()
+        if len(ret) == 0:
+            return None
+        return (ret[0][0], json.loads(ret[0][1]))
+
+    def update_partial(self, path, md5, prefixes):
+        relpath = os.path.relpath(path, self.root_dir)
+        cmd = 'REPLACE INTO {}(path, md5, prefixes) VALUES (?, ?, ?)'
+        self.c.execute(cmd.format(self.PARTIAL_TABLE),
+                       (relpath, md5, json.dumps(prefixes)))
+        self._commit_shared()
+
+    def remove_partial(self, path):
+        relpath = os.path.relpath(path, self.root_dir)
+        cmd = 'DELETE FROM {} WHERE path = ?'
+        self.c.execute(cmd.format(self.PARTIAL_TABLE), (relpath,))
+        self._commit_shared()
+
+    def get_metric(self, rev, path, typ, xpath):
+        """
+        Returns (found, value) for the metric extracted from path as of
+        commit rev by an earlier get_metric()/update_metric() round.
+        """
+        cmd = 'SELECT value FROM {} WHERE ' \
+              'rev = ? AND path = ? AND type = ? AND xpath = ?'
+        self.c.execute(cmd.format(self.METRICS_TABLE),
+                       (rev, path, typ or '', xpath or ''))
+        ret = self.c.fetchall()
+        if len(ret) == 0:
+            return (False, None)
+        return (True, json.loads(ret[0][0]))
+
+    def update_metric(self, rev, path, typ, xpath, value):
+        # NOTE: values are user data, so let sqlite do the quoting
+        cmd = 'REPLACE INTO {}(rev, path, type, xpath, value) ' \
+              'VALUES (?, ?, ?, ?, ?)'
+        self.c.execute(cmd.format(self.METRICS_TABLE),
+                       (rev, path, typ or '', xpath or '', json.dumps(value)))
+        self._commit_shared()
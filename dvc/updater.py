@@ -1,6 +1,6 @@
 import os
+import json
 import time
-import requests
 
 from dvc import VERSION_BASE
 from dvc.logger import Logger
@@ -16,46 +16,87 @@ class Updater(object):
     def __init__(self, dvc_dir):
         self.dvc_dir = dvc_dir
         self.updater_file = os.path.join(dvc_dir, self.UPDATER_FILE)
+        self.current = VERSION_BASE
 
     @staticmethod
     def init(dvc_dir):
         return Updater(dvc_dir)
 
     def check(self):
-        current = VERSION_BASE
-
+        """
+        Print a notice if the last fetched version is newer than ours and
+        launch a background fetch if that information is outdated. Never
+        waits for the network.
+        """
         if os.getenv('CI'):
             return
 
+        self._notify()
+
         if os.path.isfile(self.updater_file):
-            ctime = os.path.getctime(self.updater_file)
-            if time.time() - ctime < self.TIMEOUT:
+            mtime = os.path.getmtime(self.updater_file)
+            if time.time() - mtime < self.TIMEOUT:
                 msg = '{} is not old enough to check for updates'
                 Logger.debug(msg.format(self.UPDATER_FILE))
                 return
 
-            os.unlink(self.updater_file)
+        # NOTE: touching the file right away, so that the commands that
+        # are run while we are fetching, or if we fail to fetch at all,
+        # won't try again until the timeout expires.
+        with open(self.updater_file, 'a'):
+            os.utime(self.updater_file, None)
 
-        Logger.info('Checking for updates...')
+        self._spawn()
+
+    def fetch(self):
+        """
+        Obtain the latest version and save it to the updater file. Runs in
+        a background 'dvc daemon updater' process.
+        """
+        import requests
 
         try:
             r = requests.get(self.URL, timeout=self.TIMEOUT_GET)
-            j = r.json()
-            latest = j['version']
-            open(self.updater_file, 'w+').close()
+            latest = r.json()['version']
         except Exception as exc:
             msg = 'Failed to obtain latest version: {}'.format(str(exc))
             Logger.debug(msg)
             return
 
-        l_major, l_minor, l_patch = [int(x) for x in latest.split('.')]
-        c_major, c_minor, c_patch = [int(x) for x in current.split('.')]
+        with open(self.updater_file, 'w+') as fd:
+            json.dump({'version': latest}, fd)
 
-        if l_major <= c_major and \
-           l_minor <= c_minor and \
-           l_patch <= c_patch:
+    def latest(self):
+        try:
+            with open(self.updater_file, 'r') as fd:
+                return json.load(fd)['version']
+        except Exception:
+            # NOTE: no file yet, empty file or the old format
+            return None
+
+    def is_outdated(self, latest):
+        def parse(version):
+            return tuple(int(x) for x in version.split('.'))
+
+        try:
+            return parse(latest) > parse(self.current)
+        except ValueError:
+            return False
+
+    def _notify(self):
+        latest = self.latest()
+        if latest is None or not self.is_outdated(latest):
             return
 
         msg = 'You are using dvc version {}, however version {} is ' \
               'available. Consider upgrading.'
-        Logger.warn(msg.format(current, latest))
+        Logger.warn(msg.format(self.current, latest))
+
+    def _spawn(self):
+        from dvc.daemon import daemon
+
+        try:
+            daemon(['updater'], cwd=os.path.dirname(self.dvc_dir))
+        except Exception as exc:
+            msg = 'Failed to launch update check: {}'.format(str(exc))
+            Logger.debug(msg)
@@ -156,3 +156,16 @@ def fix_env(env):
             env.pop(lp_key, None)
 
     return env
+
+
+def module_available(name):
+    """ Check that module could be imported without importing it """
+    try:
+        from importlib.util import find_spec
+    except ImportError:  # pragma: no cover
+        from pkgutil import find_loader as find_spec
+
+    try:
+        return find_spec(name) is not None
+    except ImportError:
+        return False
@@ -0,0 +1,2 @@
+# AUTOGENERATED by dvc/__init__.py
+version = "0.18.15+09d5a3.mod"
@@ -8,7 +8,6 @@ from dvc import VERSION
 install_requires = [
     "ply>=3.9", # See https://github.com/pyinstaller/pyinstaller/issues/1945
     "configparser>=3.5.0",
-    "zc.lockfile>=1.2.1",
     "future>=0.16.0",
     "colorama>=0.3.9",
     "configobj>=5.0.6",
@@ -40,6 +39,15 @@ azure = [
 ssh = [
     "paramiko>=2.4.1",
 ]
+# Extra dependencies for remote compression
+zstd = [
+    "zstandard>=0.10.0",
+]
+# Extra dependencies for reading large json metrics incrementally, see
+# Project._read_metric_json()
+ijson = [
+    'ijson>=3.0; python_version>="3"',
+]
 all_remotes = gs + s3 + azure + ssh
 
 setup(
@@ -58,6 +66,8 @@ setup(
         's3': s3,
         'azure': azure,
         'ssh': ssh,
+        'zstd': zstd,
+        'ijson': ijson,
         # NOTE: https://github.com/inveniosoftware/troubleshooting/issues/1
         ':python_version=="2.7"': ['futures'],
     },
@@ -7,7 +7,7 @@ import tempfile
 from dvc.main import main
 from dvc.utils import file_md5
 from dvc.stage import Stage
-from dvc.exceptions import DvcException
+from dvc.exceptions import DvcException, OutputDuplicationError
 from dvc.output.base import OutputAlreadyTrackedError
 from dvc.output.base import OutputDoesNotExistError, OutputIsNotFileOrDirError
 from dvc.command.add import CmdAdd
@@ -63,6 +63,27 @@ class TestAddDirectoryRecursive(TestDvc):
         self.assertEqual(len(stages), 2)
 
 
+class TestAddDirectoryRecursiveSkipTracked(TestDvc):
+    def test(self):
+        self.dvc.scm.add([self.DATA])
+        self.dvc.scm.commit('add {}'.format(self.DATA))
+
+        stages = self.dvc.add(self.DATA_DIR, recursive=True)
+        self.assertEqual(len(stages), 1)
+        self.assertEqual(stages[0].outs[0].path,
+                         os.path.abspath(self.DATA_SUB))
+
+
+class TestAddDirectoryRecursiveDuplication(TestDvc):
+    def test(self):
+        self.dvc.run(outs_no_cache=[self.DATA], fname='other.dvc')
+
+        with self.assertRaises(OutputDuplicationError):
+            self.dvc.add(self.DATA_DIR, recursive=True)
+
+        self.assertFalse(os.path.exists(self.DATA_SUB + '.dvc'))
+
+
 class TestAddCmdDirectoryRecursive(TestDvc):
     def test(self):
         ret = main(['add',
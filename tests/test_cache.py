@@ -1,6 +1,7 @@
 import os
 import shutil
 import tempfile
+import time
 
 from dvc.cache import Cache
 from dvc.system import System
@@ -99,7 +100,315 @@ class TestSharedCacheDir(TestDir):
         self.assertFalse(os.path.exists(os.path.join('dir2', '.dvc', 'cache')))
 
         subdirs = list(filter(lambda x: os.path.isdir(os.path.join(cache_dir, x)), os.listdir(cache_dir)))
+        subdirs.remove(RemoteLOCAL.LOCK_DIR)
         self.assertEqual(len(subdirs), 3)
         self.assertEqual(len(os.listdir(os.path.join(cache_dir, subdirs[0]))), 1)
         self.assertEqual(len(os.listdir(os.path.join(cache_dir, subdirs[1]))), 1)
         self.assertEqual(len(os.listdir(os.path.join(cache_dir, subdirs[2]))), 1)
+
+
+class TestCacheConcurrentWriters(TestDvc):
+    def test_all_skips_unfinished(self):
+        cache = self.dvc.cache.local
+        md5 = '123'
+        path = cache.get(md5)
+        self.create(path, '1')
+        self.create(path + '.lock', '')
+        self.create('{}.{}'.format(path, 'c0ffee-00'), '1')
+        self.create(cache.get('234.dir') + '.lock', '')
+
+        self.assertEqual(cache.all(), [md5])
+
+    def test_locks(self):
+        cache = self.dvc.cache.local
+        self.dvc.add(self.FOO)
+
+        path = cache._lock_path(cache.get('123456'))
+        self.assertEqual(path, os.path.join(cache.cache_dir,
+                                            cache.LOCK_DIR,
+                                            '123' + cache.LOCK_SUFFIX))
+        self.assertEqual(path, cache._lock_path(cache.get('123abc')))
+        self.assertNotEqual(path, cache._lock_path(cache.get('124abc')))
+
+        locks = os.listdir(os.path.join(cache.cache_dir, cache.LOCK_DIR))
+        self.assertNotEqual(locks, [])
+
+        self.dvc.gc()
+        self.assertEqual(locks, os.listdir(os.path.join(cache.cache_dir,
+                                                        cache.LOCK_DIR)))
+
+    def test_lock_timeout(self):
+        cache = self.dvc.cache.local
+        cache.LOCK_TIMEOUT = 0.2
+        path = cache.get('123456')
+
+        held = cache._lock_object(path)
+        self.assertIsNotNone(held)
+        try:
+            # NOTE: flock is per open file, so this is another writer
+            self.assertIsNone(cache._lock_object(path))
+        finally:
+            cache._unlock_object(path, held)
+
+        fobj = cache._lock_object(path)
+        self.assertIsNotNone(fobj)
+        cache._unlock_object(path, fobj)
+
+
+class TestCacheConcurrentAdd(TestDir):
+    def test(self):
+        import sys
+        from subprocess import Popen
+
+        cache_dir = os.path.abspath('shared_cache')
+        dirs = ['proj{}'.format(i) for i in range(4)]
+        for d in dirs:
+            os.mkdir(d)
+            with open(os.path.join(d, 'data'), 'w+') as fd:
+                fd.write('same data')
+            os.chdir(d)
+            self.assertEqual(main(['init', '--no-scm']), 0)
+            self.assertEqual(main(['config', 'cache.dir', cache_dir]), 0)
+            os.chdir('..')
+
+        env = os.environ.copy()
+        env['CI'] = 'true'
+        env['PYTHONPATH'] = os.path.dirname(os.path.dirname(
+            os.path.abspath(__file__)))
+
+        cmd = [sys.executable, '-m', 'dvc', 'add', 'data']
+        procs = [Popen(cmd, cwd=d, env=env) for d in dirs]
+        for p in procs:
+            self.assertEqual(p.wait(), 0)
+
+        subdirs = [x for x in os.listdir(cache_dir)
+                   if os.path.isdir(os.path.join(cache_dir, x)) and
+                   x != RemoteLOCAL.LOCK_DIR]
+        self.assertEqual(len(subdirs), 1)
+        self.assertEqual(len(os.listdir(os.path.join(cache_dir,
+                                                     subdirs[0]))), 1)
+        for d in dirs:
+            with open(os.path.join(d, 'data'), 'r') as fd:
+                self.assertEqual(fd.read(), 'same data')
+
+
+class TestCacheTiers(TestDvc):
+    def setUp(self):
+        super(TestCacheTiers, self).setUp()
+        self.shared = os.path.abspath('shared_cache')
+        os.mkdir(self.shared)
+
+    def _project(self, promote=None):
+        from dvc.project import Project
+
+        ret = main(['config', 'cache.shared', self.shared])
+        self.assertEqual(ret, 0)
+        if promote:
+            ret = main(['config', 'cache.promote', promote])
+            self.assertEqual(ret, 0)
+        return Project('.')
+
+    def _test(self, promote):
+        project = self._project(promote)
+        stages = project.add(self.DATA_DIR)
+        self.assertEqual(len(stages), 1)
+
+        cache = project.cache.local
+        self.assertEqual(cache.tiers, [self.shared])
+        self.assertTrue(cache.queue_propagation())
+        self.assertEqual(main(['daemon', 'propagate']), 0)
+        self.assertEqual(os.listdir(cache._propagate_dir()), [])
+        self.assertEqual(sorted(os.listdir(self.shared)),
+                         sorted(os.listdir(cache.cache_dir)))
+
+        # NOTE: fresh node that only has the shared cache
+        shutil.rmtree(cache.cache_dir)
+        shutil.rmtree(self.DATA_DIR)
+        os.mkdir(cache.cache_dir)
+
+        project.checkout()
+        self.assertTrue(os.path.isfile(self.DATA))
+        with open(self.DATA, 'r') as fd:
+            self.assertEqual(fd.read(), self.DATA_CONTENTS)
+
+        md5 = stages[0].outs[0].md5
+        self.assertTrue(os.path.exists(cache.get(md5)))
+        return cache.get(md5)
+
+    def test_copy(self):
+        path = self._test(None)
+        self.assertFalse(os.path.islink(path))
+
+    def test_symlink(self):
+        path = self._test('symlink')
+        self.assertTrue(os.path.islink(path))
+
+    def test_only_saved(self):
+        project = self._project()
+        cache = project.cache.local
+        other = cache.get('d3b07384d113edec49eaa6238ad5ff00')
+        self.create(other, 'foo')
+
+        md5 = project.add(self.FOO)[0].outs[0].md5
+        self.assertTrue(cache.queue_propagation())
+        self.assertFalse(cache.queue_propagation())
+        self.assertEqual(main(['daemon', 'propagate']), 0)
+
+        self.assertTrue(os.path.exists(cache._tier_get(self.shared, md5)))
+        self.assertFalse(os.path.exists(cache._tier_get(self.shared,
+                                                        'd3b07384d113edec'
+                                                        '49eaa6238ad5ff00')))
+
+    def test_missing(self):
+        project = self._project()
+        cache = project.cache.local
+        with project.state:
+            self.assertTrue(cache.changed_cache('0' * 32))
+
+
+class TestCacheSizeLimit(TestDvc):
+    def _add(self, contents):
+        from dvc.project import Project
+
+        if os.path.exists('data'):
+            os.unlink('data')
+        self.create('data', contents)
+
+        project = Project('.')
+        stage = project.add('data')[0]
+        return project, project.cache.local.get(stage.outs[0].md5)
+
+    def test_to_size(self):
+        from dvc.config import to_size
+
+        self.assertEqual(to_size('10'), 10)
+        self.assertEqual(to_size('1k'), 1024)
+        self.assertEqual(to_size('1.5G'), 3 * 512 * 1024 * 1024)
+
+    def test(self):
+        ret = main(['config', 'cache.size_limit', '10'])
+        self.assertEqual(ret, 0)
+
+        _, first = self._add('1111')
+        time.sleep(0.01)
+        _, second = self._add('2222')
+        time.sleep(0.01)
+
+        project, _ = self._add('3333')
+        self.assertEqual(project.cache.local.size_limit, 10)
+        self.assertFalse(os.path.exists(first))
+        self.assertTrue(os.path.exists(second))
+
+        # NOTE: using an object makes it the most recently used one
+        time.sleep(0.01)
+        with project.state:
+            project.state.touch(second)
+        time.sleep(0.01)
+
+        _, fourth = self._add('4444')
+        self.assertTrue(os.path.exists(second))
+        self.assertTrue(os.path.exists(fourth))
+        self.assertEqual(len(project.cache.local.all()), 2)
+
+
+class TestDirManifest(TestDvc):
+    def _manifest(self, entries):
+        from dvc.remote.manifest import DirManifest
+
+        return DirManifest.from_list([{'relpath': r, 'md5': m}
+                                      for r, m in entries])
+
+    def test(self):
+        from dvc.remote.manifest import DirManifest
+
+        a = self._manifest([('b/c', '1' * 32),
+                            (u'\u0444', '2' * 32),
+                            ('a', '3' * 32)])
+        self.assertEqual(len(a), 3)
+        self.assertEqual(list(a), [('a', '3' * 32),
+                                   ('b/c', '1' * 32),
+                                   (u'\u0444', '2' * 32)])
+        self.assertEqual(a.find('b/c'), '1' * 32)
+        self.assertEqual(a.find(u'\u0444'), '2' * 32)
+        self.assertEqual(a.find('b'), None)
+        self.assertEqual(a.find('z'), None)
+
+        self.create('source', '[]')
+        a.dump('manifest', 'source')
+        b = DirManifest.load('manifest', 'source')
+        self.assertEqual(list(a), list(b))
+
+        # NOTE: source has changed since the manifest was dumped
+        self.create('source', '[{}]')
+        with self.assertRaises(ValueError):
+            DirManifest.load('manifest', 'source')
+
+        c = self._manifest([('a', '3' * 32),
+                            ('b/c', '4' * 32),
+                            ('d', '5' * 32)])
+        self.assertEqual(list(a.diff(c)), [('b/c', '1' * 32, '4' * 32),
+                                           ('d', None, '5' * 32),
+                                           (u'\u0444', '2' * 32, None)])
+        self.assertEqual(list(c.diff(c)), [])
+
+    def test_sidecar(self):
+        cache = self.dvc.cache.local
+        stage = self.dvc.add(self.DATA_DIR)[0]
+        md5 = stage.outs[0].md5
+        sidecar = cache.get(md5) + cache.MANIFEST_SUFFIX
+
+        self.assertTrue(os.path.isfile(sidecar))
+        self.assertTrue(md5 in cache.all())
+        self.assertFalse(any(m.endswith(cache.MANIFEST_SUFFIX)
+                             for m in cache.all()))
+
+        expected = cache.load_dir_cache(md5)
+        os.unlink(sidecar)
+        cache._manifests.clear()
+        with self.dvc.state:
+            self.assertEqual(cache.load_dir_cache(md5), expected)
+        self.assertTrue(os.path.isfile(sidecar))
+
+        self.dvc.remove(stage.path)
+        self.dvc.gc()
+        self.assertFalse(os.path.exists(sidecar))
+
+    def test_stale_sidecar(self):
+        import json
+
+        cache = self.dvc.cache.local
+        md5 = self.dvc.add(self.DATA_DIR)[0].outs[0].md5
+        path = cache.get(md5)
+
+        # NOTE: '.dir' was replaced, while the sidecar is left behind
+        dir_info = [{'relpath': 'data', 'md5': '1' * 32}]
+        os.chmod(path, 0o644)
+        with open(path, 'w') as fd:
+            json.dump(dir_info, fd)
+        os.utime(path, (0, 0))
+
+        cache._manifests.clear()
+        self.assertEqual(cache.load_dir_cache(md5), dir_info)
+
+        cache._manifests.clear()
+        self.assertEqual(cache.load_dir_cache(md5), dir_info)
+
+    def test_memo(self):
+        cache = self.dvc.cache.local
+        md5 = self.dvc.add(self.DATA_DIR)[0].outs[0].md5
+        other = self.dvc.add(self.FOO)[0]
+
+        cache._manifests.clear()
+        first = cache.load_dir_manifest(md5)
+        self.assertTrue(cache.load_dir_manifest(md5) is first)
+        self.assertEqual(cache._manifests_hits, 1)
+
+        os.mkdir('other_dir')
+        shutil.move(self.FOO, os.path.join('other_dir', self.FOO))
+        self.dvc.remove(other.path)
+        other_md5 = self.dvc.add('other_dir')[0].outs[0].md5
+
+        cache.MANIFEST_MEMO_SIZE = first.nbytes
+        cache.load_dir_manifest(other_md5)
+        self.assertEqual(list(cache._manifests.keys()), [other_md5])
+        self.assertFalse(cache.load_dir_manifest(md5) is first)
@@ -165,6 +165,34 @@ class TestStartupTime(TestDvc):
         self.assertTrue(t < 0.3)
 
 
+class TestStartupImports(TestDvc):
+    HEAVY = ['boto3',
+             'google.cloud.storage',
+             'azure.storage.blob',
+             'paramiko',
+             'requests',
+             'dvc.data_cloud']
+
+    def test(self):
+        import sys
+        from subprocess import check_output
+
+        code = 'import sys\n' \
+               'from dvc.main import main\n' \
+               'from dvc.project import Project\n' \
+               'Project(".")\n' \
+               'print(",".join(m for m in {} if m in sys.modules))'
+
+        env = os.environ.copy()
+        env['CI'] = 'true'
+        env['PYTHONPATH'] = os.path.dirname(os.path.dirname(
+                                            os.path.abspath(__file__)))
+        out = check_output([sys.executable, '-c', code.format(self.HEAVY)],
+                           env=env)
+
+        self.assertEqual(out.decode().strip(), '')
+
+
 class TestFindRoot(TestDvc):
     def test(self):
         os.chdir("..")
@@ -14,6 +14,9 @@ from dvc.config import Config, ConfigError
 from dvc.data_cloud import (DataCloud, RemoteS3, RemoteGS, RemoteAzure,
                             RemoteLOCAL, RemoteSSH, RemoteHDFS)
 from dvc.remote.base import STATUS_OK, STATUS_NEW, STATUS_DELETED
+from dvc.stage import Stage
+from dvc.project import Project
+from dvc.utils import file_md5
 
 from tests.basic_env import TestDvc
 
@@ -532,3 +535,528 @@ class TestDataCloudErrorCLI(TestDvc):
         self.main_fail(['push', f])
         self.main_fail(['pull', f])
         self.main_fail(['fetch', f])
+
+
+class TestRemoteLOCALPack(TestDvc):
+    def _remote_files(self, url):
+        ret = []
+        for root, dirs, files in os.walk(url):
+            ret += files
+        return ret
+
+    def test(self):
+        url = get_local_url()
+        self.main(['remote', 'add', '-d', TEST_REMOTE, url])
+        self.main(['remote', 'modify', TEST_REMOTE, 'pack', 'true'])
+
+        self.main(['add', self.DATA_DIR])
+        stage = Stage.load(self.dvc, self.DATA_DIR + Stage.STAGE_FILE_SUFFIX)
+        md5 = stage.outs[0].md5
+
+        self.main(['push'])
+
+        files = self._remote_files(url)
+        self.assertEqual(len([f for f in files if f.endswith('.pack')]), 1)
+        self.assertTrue(os.path.splitext(md5)[0][2:] + '.idx' in files)
+        self.assertTrue(md5[2:] in files)
+        # NOTE: .dir, .idx and the pack instead of two separate objects
+        self.assertEqual(len(files), 3, files)
+
+        shutil.rmtree(self.DATA_DIR)
+        shutil.rmtree(self.dvc.cache.local.cache_dir)
+
+        self.main(['pull'])
+        self.assertTrue(os.path.isfile(self.DATA))
+        self.assertTrue(os.path.isfile(self.DATA_SUB))
+        with open(self.DATA_SUB, 'r') as fd:
+            self.assertEqual(fd.read(), self.DATA_SUB_CONTENTS)
+
+        project = Project('.')
+        with project.state:
+            status = project.cloud.status(project._used_cache()['local'])
+        for name, st in status:
+            self.assertEqual(st, STATUS_OK)
+
+    def test_gc(self):
+        url = get_local_url()
+        self.main(['remote', 'add', '-d', TEST_REMOTE, url])
+        self.main(['remote', 'modify', TEST_REMOTE, 'pack', 'true'])
+
+        self.main(['add', self.DATA_DIR])
+        self.main(['add', self.FOO])
+        self.main(['push'])
+
+        stage = Stage.load(self.dvc, self.FOO + Stage.STAGE_FILE_SUFFIX)
+        md5 = stage.outs[0].md5
+        self.assertTrue(md5[2:] in self._remote_files(url))
+
+        os.mkdir('other')
+        self.create(os.path.join('other', 'file'), 'other')
+        self.main(['add', 'other'])
+        self.main(['push'])
+        files = self._remote_files(url)
+        self.assertEqual(len([f for f in files if f.endswith('.pack')]), 2)
+
+        os.unlink(stage.path)
+        os.unlink('other' + Stage.STAGE_FILE_SUFFIX)
+        self.main(['gc', '-c'])
+
+        # NOTE: the pack and the index of 'other' are not used anymore
+        files = self._remote_files(url)
+        self.assertEqual(len([f for f in files if f.endswith('.pack')]), 1)
+        self.assertEqual(len([f for f in files if f.endswith('.idx')]), 1)
+        self.assertFalse(md5[2:] in files)
+
+        shutil.rmtree(self.DATA_DIR)
+        shutil.rmtree(self.dvc.cache.local.cache_dir)
+
+        self.main(['pull'])
+        with open(self.DATA_SUB, 'r') as fd:
+            self.assertEqual(fd.read(), self.DATA_SUB_CONTENTS)
+
+    def _packs(self, url):
+        ret = {}
+        for root, dirs, files in os.walk(url):
+            for fname in files:
+                if fname.endswith('.pack'):
+                    path = os.path.join(root, fname)
+                    ret[path] = os.path.getsize(path)
+        return ret
+
+    def test_reuse(self):
+        url = get_local_url()
+        self.main(['remote', 'add', '-d', TEST_REMOTE, url])
+        self.main(['remote', 'modify', TEST_REMOTE, 'pack', 'true'])
+
+        self.main(['add', self.DATA_DIR])
+        self.main(['push'])
+        packs = self._packs(url)
+        self.assertEqual(len(packs), 1)
+
+        os.chmod(self.DATA_SUB, 0o644)
+        os.unlink(self.DATA_SUB)
+        self.create(self.DATA_SUB, 'changed')
+        self.main(['add', self.DATA_DIR])
+        self.main(['push'])
+
+        # NOTE: only the changed file is packed again
+        new = dict((p, size) for p, size in self._packs(url).items()
+                   if p not in packs)
+        self.assertEqual(list(new.values()), [len('changed')])
+
+        self.main(['gc', '-c'])
+        self.assertEqual(len(self._packs(url)), 2)
+
+        shutil.rmtree(self.DATA_DIR)
+        shutil.rmtree(self.dvc.cache.local.cache_dir)
+
+        self.main(['pull'])
+        with open(self.DATA, 'r') as fd:
+            self.assertEqual(fd.read(), self.DATA_CONTENTS)
+        with open(self.DATA_SUB, 'r') as fd:
+            self.assertEqual(fd.read(), 'changed')
+
+    def test_corrupted(self):
+        url = get_local_url()
+        self.main(['remote', 'add', '-d', TEST_REMOTE, url])
+        self.main(['remote', 'modify', TEST_REMOTE, 'pack', 'true'])
+
+        self.main(['add', self.DATA_DIR])
+        self.main(['push'])
+
+        path, size = list(self._packs(url).items())[0]
+        with open(path, 'wb') as fd:
+            fd.write(b'x' * size)
+
+        shutil.rmtree(self.DATA_DIR)
+        shutil.rmtree(self.dvc.cache.local.cache_dir)
+
+        main(['pull'])
+        cache = self.dvc.cache.local
+        self.assertEqual([m for m in cache.all()
+                          if not cache.is_dir_cache(m)], [])
+
+    def main(self, args):
+        ret = main(args)
+        self.assertEqual(ret, 0)
+
+
+class TestRemoteLOCALCompress(TestDvc):
+    def main(self, args):
+        ret = main(args)
+        self.assertEqual(ret, 0)
+
+    def _remote_object(self, url, md5):
+        with open(os.path.join(url, md5[0:2], md5[2:]), 'rb') as fd:
+            return fd.read()
+
+    def test(self):
+        import gzip
+        from dvc.remote import compress
+
+        url = get_local_url()
+        self.main(['remote', 'add', '-d', TEST_REMOTE, url])
+        self.main(['remote', 'modify', TEST_REMOTE, 'compress', 'gzip'])
+
+        self.create('text', 'compress me ' * 1024)
+        with gzip.open('archive.gz', 'wb') as fd:
+            fd.write(b'already compressed ' * 1024)
+
+        md5s = {}
+        for fname in ['text', 'archive.gz']:
+            self.main(['add', fname])
+            stage = Stage.load(self.dvc, fname + Stage.STAGE_FILE_SUFFIX)
+            md5s[fname] = stage.outs[0].md5
+
+        self.main(['push'])
+
+        header = compress.MAGIC + b'\x01'
+        data = self._remote_object(url, md5s['text'])
+        self.assertTrue(data.startswith(header))
+        self.assertTrue(len(data) < os.path.getsize('text'))
+
+        header = compress.MAGIC + b'\x00'
+        data = self._remote_object(url, md5s['archive.gz'])
+        self.assertTrue(data.startswith(header))
+        self.assertEqual(len(data),
+                         len(header) + os.path.getsize('archive.gz'))
+
+        os.unlink('text')
+        os.unlink('archive.gz')
+        shutil.rmtree(self.dvc.cache.local.cache_dir)
+
+        # NOTE: 'none' still decodes objects that were compressed before
+        self.main(['remote', 'modify', TEST_REMOTE, 'compress', 'none'])
+        self.main(['pull'])
+
+        with open('text', 'r') as fd:
+            self.assertEqual(fd.read(), 'compress me ' * 1024)
+        with gzip.open('archive.gz', 'rb') as fd:
+            self.assertEqual(fd.read(), b'already compressed ' * 1024)
+
+    def test_uncompressed_remote(self):
+        from dvc.remote import compress
+
+        url = get_local_url()
+        self.main(['remote', 'add', '-d', TEST_REMOTE, url])
+
+        # NOTE: data that merely looks like a compressed object
+        contents = compress.MAGIC + b'\x00' + b'data'
+        with open('magic', 'wb') as fd:
+            fd.write(contents)
+
+        self.main(['add', 'magic'])
+        self.main(['push'])
+
+        os.unlink('magic')
+        shutil.rmtree(self.dvc.cache.local.cache_dir)
+
+        self.main(['pull'])
+        with open('magic', 'rb') as fd:
+            self.assertEqual(fd.read(), contents)
+
+    def test_level(self):
+        url = get_local_url()
+        self.main(['remote', 'add', '-d', TEST_REMOTE, url])
+
+        for codec, level, valid in [('gzip', '9', True),
+                                    ('gzip', '10', False),
+                                    ('zstd', '22', True),
+                                    ('zstd', '0', False),
+                                    ('none', '100', True)]:
+            self.main(['remote', 'modify', TEST_REMOTE, 'compress', codec])
+            self.main(['remote', 'modify', TEST_REMOTE, 'compress_level',
+                       level])
+            if valid:
+                Project('.')
+            else:
+                with self.assertRaises(ConfigError):
+                    Project('.')
+
+
+class TestRemoteLOCALPartialPull(TestDvc):
+    def main(self, args):
+        ret = main(args)
+        self.assertEqual(ret, 0)
+
+    def test(self):
+        self.main(['remote', 'add', '-d', TEST_REMOTE, get_local_url()])
+        self.main(['add', self.DATA_DIR])
+        self.main(['push'])
+
+        shutil.rmtree(self.DATA_DIR)
+        shutil.rmtree(self.dvc.cache.local.cache_dir)
+
+        self.main(['pull', self.DATA_SUB_DIR])
+        self.assertTrue(os.path.isfile(self.DATA_SUB))
+        self.assertFalse(os.path.exists(self.DATA))
+        with open(self.DATA_SUB, 'r') as fd:
+            self.assertEqual(fd.read(), self.DATA_SUB_CONTENTS)
+
+        project = Project('.')
+        with project.state:
+            stage = Stage.load(project,
+                               self.DATA_DIR + Stage.STAGE_FILE_SUFFIX)
+            self.assertFalse(stage.changed())
+
+        self.main(['pull'])
+        self.assertTrue(os.path.isfile(self.DATA))
+        self.assertTrue(os.path.isfile(self.DATA_SUB))
+
+        project = Project('.')
+        with project.state:
+            stage = Stage.load(project,
+                               self.DATA_DIR + Stage.STAGE_FILE_SUFFIX)
+            self.assertFalse(stage.changed())
+            self.assertEqual(project.state.get_partial(self.DATA_DIR), None)
+
+
+class TestRemoteLOCALPipelinedPull(TestDvc):
+    def main(self, args):
+        ret = main(args)
+        self.assertEqual(ret, 0)
+
+    def test(self):
+        from dvc.checkout import CheckoutQueue
+
+        self.main(['remote', 'add', '-d', TEST_REMOTE, get_local_url()])
+        self.main(['add', self.FOO])
+        self.main(['add', self.DATA_DIR])
+        self.main(['push'])
+
+        os.unlink(self.FOO)
+        shutil.rmtree(self.DATA_DIR)
+        shutil.rmtree(self.dvc.cache.local.cache_dir)
+
+        project = Project('.')
+        project.cache.local.PULL_BATCH_SIZE = 1
+
+        arrived = []
+        with project.state:
+            stages = project.active_stages()
+            queue = CheckoutQueue(project, stages)
+            self.assertEqual(queue.ready, [])
+            self.assertEqual(len(queue.pending), 2)
+
+            def callback(md5s):
+                queue(md5s)
+                arrived.append((list(md5s), len(queue.ready)))
+
+            project.cloud.pull(project._used_cache()['local'],
+                               callback=callback)
+
+        self.assertEqual(len(queue.ready), 2)
+        self.assertEqual(queue.pending, [])
+        # NOTE: stages were getting ready one by one along the way
+        self.assertTrue(len(arrived) > 2)
+        self.assertTrue(arrived[-1][1] == 2)
+        self.assertTrue(any(n == 1 for _, n in arrived))
+
+        self.assertTrue(os.path.isfile(self.FOO))
+        self.assertTrue(os.path.isfile(self.DATA))
+        self.assertTrue(os.path.isfile(self.DATA_SUB))
+
+        os.unlink(self.FOO)
+        shutil.rmtree(self.DATA_DIR)
+        shutil.rmtree(self.dvc.cache.local.cache_dir)
+
+        self.main(['pull'])
+        self.assertTrue(os.path.isfile(self.FOO))
+        self.assertTrue(os.path.isfile(self.DATA_SUB))
+        with open(self.DATA, 'r') as fd:
+            self.assertEqual(fd.read(), self.DATA_CONTENTS)
+
+    def test_mixed(self):
+        from dvc.checkout import CheckoutQueue
+
+        class Queue(CheckoutQueue):
+            # NOTE: pretending that 'external' is not a local output
+            @staticmethod
+            def _pullable(out):
+                return CheckoutQueue._pullable(out) and \
+                    os.path.basename(out.path) != 'external'
+
+        cmd = 'python {code} {foo} pulled && python {code} {bar} external'
+        self.main(['remote', 'add', '-d', TEST_REMOTE, get_local_url()])
+        self.main(['run',
+                   '-d', self.FOO,
+                   '-d', self.BAR,
+                   '-o', 'pulled',
+                   '-o', 'external',
+                   cmd.format(code=self.CODE, foo=self.FOO, bar=self.BAR)])
+        self.main(['push'])
+
+        project = Project('.')
+        stage = project.active_stages()[0]
+        pulled = [out for out in stage.outs
+                  if os.path.basename(out.path) == 'pulled'][0]
+        os.unlink('pulled')
+        os.unlink('external')
+        os.unlink(project.cache.local.get(pulled.md5))
+
+        with project.state:
+            queue = Queue(project, [stage])
+            self.assertEqual(queue.ready, [])
+            self.assertFalse(os.path.exists('external'))
+
+            project.cloud.pull(project._used_cache()['local'],
+                               callback=queue)
+
+        self.assertEqual(len(queue.ready), 1)
+        self.assertEqual(queue.pending, [])
+        self.assertTrue(os.path.isfile('pulled'))
+        self.assertTrue(os.path.isfile('external'))
+
+
+class TestRemoteLOCALTransfer(TestDvc):
+    def main(self, args):
+        ret = main(args)
+        self.assertEqual(ret, 0)
+
+    def _objects(self, url):
+        ret = {}
+        for root, dirs, files in os.walk(url):
+            for fname in files:
+                path = os.path.join(root, fname)
+                with open(path, 'rb') as fd:
+                    ret[os.path.relpath(path, url)] = fd.read()
+        return ret
+
+    def _setup(self, **options):
+        self.src_url = get_local_url()
+        self.dest_url = get_local_url()
+        self.main(['remote', 'add', 'src', self.src_url])
+        self.main(['remote', 'add', 'dest', self.dest_url])
+        for key, value in options.items():
+            self.main(['remote', 'modify', 'src', key, value])
+            self.main(['remote', 'modify', 'dest', key, value])
+
+        self.main(['add', self.FOO])
+        self.main(['add', self.DATA_DIR])
+        self.main(['push', '-r', 'src'])
+
+        shutil.rmtree(self.dvc.cache.local.cache_dir)
+
+    def _check_pull(self):
+        os.unlink(self.FOO)
+        shutil.rmtree(self.DATA_DIR)
+        shutil.rmtree(self.dvc.cache.local.cache_dir)
+
+        self.main(['pull', '-r', 'dest'])
+        with open(self.FOO, 'r') as fd:
+            self.assertEqual(fd.read(), self.FOO_CONTENTS)
+        with open(self.DATA_SUB, 'r') as fd:
+            self.assertEqual(fd.read(), self.DATA_SUB_CONTENTS)
+
+    def test(self):
+        self._setup()
+
+        self.main(['push', '--from-remote', 'src', '-r', 'dest'])
+        self.assertEqual(self._objects(self.dest_url),
+                         self._objects(self.src_url))
+        # NOTE: objects are not saved to the local cache on the way
+        cache = self.dvc.cache.local
+        self.assertEqual([m for m in cache.all()
+                          if not cache.is_dir_cache(m)], [])
+
+        self._check_pull()
+
+    def test_spool(self):
+        self._setup(pack='true', compress='gzip')
+
+        project = Project('.')
+        src = project.cloud._init_remote('src')
+        dest = project.cloud._init_remote('dest')
+        # NOTE: pretend they are different kinds of remotes
+        src.can_copy = lambda remote: False
+
+        with project.state:
+            project.cache.local.transfer(project._used_cache()['local'],
+                                         src,
+                                         dest,
+                                         jobs=2)
+
+        self.assertEqual(self._objects(self.dest_url),
+                         self._objects(self.src_url))
+
+        self._check_pull()
+
+    def test_spool_size(self):
+        self._setup()
+
+        project = Project('.')
+        src = project.cloud._init_remote('src')
+        dest = project.cloud._init_remote('dest')
+        src.can_copy = lambda remote: False
+        project.cache.local.SPOOL_SIZE = 1
+
+        spooled = []
+        upload = dest.upload
+
+        def spooling_upload(from_infos, to_infos, **kwargs):
+            spool = os.path.dirname(from_infos[0]['path'])
+            spooled.append(len(os.listdir(spool)))
+            return upload(from_infos, to_infos, **kwargs)
+
+        dest.upload = spooling_upload
+
+        with project.state:
+            project.cache.local.transfer(project._used_cache()['local'],
+                                         src,
+                                         dest)
+
+        # NOTE: every object is sent on as soon as it arrives
+        self.assertTrue(len(spooled) > 1)
+        self.assertEqual(set(spooled), set([1]))
+        self.assertEqual(self._objects(self.dest_url),
+                         self._objects(self.src_url))
+
+    def test_copy_failure(self):
+        self._setup()
+
+        project = Project('.')
+        src = project.cloud._init_remote('src')
+        dest = project.cloud._init_remote('dest')
+        download = src.download
+        failed = file_md5(self.FOO)[0]
+
+        def failing_download(from_infos, to_infos, **kwargs):
+            for from_info in from_infos:
+                if src.path_to_md5(from_info['path']) == failed:
+                    raise Exception('copy failed')
+            return download(from_infos, to_infos, **kwargs)
+
+        src.download = failing_download
+
+        with project.state:
+            project.cache.local.transfer(project._used_cache()['local'],
+                                         src,
+                                         dest)
+
+        # NOTE: the rest of the objects are copied anyway
+        objects = self._objects(self.src_url)
+        self.assertNotEqual(objects, {})
+        del objects[os.path.join(failed[0:2], failed[2:])]
+        self.assertEqual(self._objects(self.dest_url), objects)
+
+
+class TestRemoteS3CanCopy(TestDvc):
+    def _remote(self, **options):
+        config = {Config.SECTION_REMOTE_URL: 's3://bucket/prefix'}
+        config.update(options)
+        return RemoteS3(self.dvc, config)
+
+    def test(self):
+        remote = self._remote()
+        self.assertTrue(remote.can_copy(self._remote()))
+        self.assertFalse(remote.can_copy(RemoteLOCAL(self.dvc, {})))
+
+        other = self._remote(**{Config.SECTION_AWS_PROFILE: 'other'})
+        self.assertFalse(remote.can_copy(other))
+
+        other = self._remote(**{Config.SECTION_AWS_REGION: 'us-west-2'})
+        self.assertFalse(remote.can_copy(other))
+
+        other = self._remote(**{Config.SECTION_AWS_ENDPOINT_URL:
+                                'http://localhost:9000'})
+        self.assertFalse(remote.can_copy(other))
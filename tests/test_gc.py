@@ -39,3 +39,25 @@ class TestGC(TestDvc):
 
         for c in self.good_cache:
             self.assertTrue(os.path.exists(c))
+
+
+class TestGCAllBranches(TestDvc):
+    def test(self):
+        self.dvc.scm.commit('init')
+        self.dvc.scm.checkout('branch', create_new=True)
+        stages = self.dvc.add(self.FOO)
+        foo_cache = stages[0].outs[0].cache
+        self.dvc.scm.add(['.gitignore', 'foo.dvc'])
+        self.dvc.scm.commit('add foo')
+
+        self.dvc.scm.checkout('master')
+        self.dvc.checkout()
+        self.assertFalse(os.path.exists('foo.dvc'))
+
+        self.dvc.gc(all_branches=True)
+        self.assertTrue(os.path.exists(foo_cache))
+        self.assertEqual(self.dvc.scm.active_branch(), 'master')
+        self.assertFalse(os.path.exists('foo.dvc'))
+
+        self.dvc.gc()
+        self.assertFalse(os.path.exists(foo_cache))
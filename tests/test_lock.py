@@ -1,6 +1,10 @@
+import os
+import time
+import tempfile
+
 from dvc.lock import LockError
 from dvc.main import main
-from dvc.lock import Lock
+from dvc.lock import Lock, try_lock
 
 from tests.basic_env import TestDvc
 
@@ -19,3 +23,68 @@ class TestLock(TestDvc):
         with lock:
             ret = main(['add', self.FOO])
             self.assertEqual(ret, 1)
+
+
+class TestSharedLock(TestDvc):
+    def test(self):
+        lock = Lock(self.dvc.dvc_dir, timeout=0)
+        lock2 = Lock(self.dvc.dvc_dir, timeout=0)
+
+        lock.lock(shared=True)
+        lock2.lock(shared=True)
+
+        with self.assertRaises(LockError):
+            Lock(self.dvc.dvc_dir, timeout=0).lock()
+
+        lock.unlock()
+        lock2.unlock()
+
+        with lock:
+            with self.assertRaises(LockError):
+                Lock(self.dvc.dvc_dir, timeout=0).lock(shared=True)
+
+    def test_writer_is_not_starved(self):
+        import threading
+
+        reader = Lock(self.dvc.dvc_dir)
+        reader.lock(shared=True)
+
+        writer = Lock(self.dvc.dvc_dir, timeout=10)
+        thread = threading.Thread(target=writer.lock)
+        thread.start()
+
+        # NOTE: wait for the writer to get in line
+        queue = open(writer.queue_file, 'a+')
+        while try_lock(queue, False):
+            queue.close()
+            time.sleep(0.01)
+            queue = open(writer.queue_file, 'a+')
+        queue.close()
+
+        with self.assertRaises(LockError):
+            Lock(self.dvc.dvc_dir, timeout=0.2).lock(shared=True)
+
+        reader.unlock()
+        thread.join()
+        self.assertIsNotNone(writer._lock)
+        writer.unlock()
+
+    def test_cli(self):
+        ret = main(['config', 'core.lock_timeout', '0'])
+        self.assertEqual(ret, 0)
+        url = tempfile.mkdtemp()
+        ret = main(['remote', 'add', '-d', 'upstream', url])
+        self.assertEqual(ret, 0)
+        ret = main(['add', self.BAR])
+        self.assertEqual(ret, 0)
+
+        lock = Lock(self.dvc.dvc_dir)
+
+        lock.lock(shared=True)
+        try:
+            self.assertEqual(main(['status']), 0)
+            self.assertEqual(main(['add', self.FOO]), 1)
+            self.assertEqual(main(['push']), 0)
+            self.assertEqual(len(os.listdir(url)), 1)
+        finally:
+            lock.unlock()
@@ -1,5 +1,6 @@
 import os
 import json
+from unittest import SkipTest
 
 from dvc.project import Project
 from dvc.main import main
@@ -247,3 +248,169 @@ class TestCachedMetrics(TestDvc):
         self.assertEqual(res, {"master": {"metrics.json": ["master"]},
                                "one": {"metrics.json": ["one"]},
                                "two": {"metrics.json": ["two"]}})
+
+    def test_no_checkout(self):
+        self.dvc.scm.commit('init')
+
+        self.dvc.scm.branch('one')
+
+        self._do_write('one')
+        self._do_write('master')
+
+        os.unlink('metrics.json')
+
+        res = self.dvc.metrics_show('metrics.json',
+                                    all_branches=True,
+                                    typ='json',
+                                    xpath='metrics')
+
+        self.assertEqual(res, {"master": {"metrics.json": ["master"]},
+                               "one": {"metrics.json": ["one"]}})
+        self.assertEqual(self.dvc.scm.active_branch(), 'master')
+        self.assertFalse(os.path.exists('metrics.json'))
+
+
+class TestMetricsStreaming(TestDvc):
+    def _lines(self, header, count):
+        if header:
+            yield header + '\n'
+        for i in range(count):
+            yield '{},{}\n'.format(i, i * 2)
+        raise AssertionError('read past the requested row')
+
+    def test_xsv(self):
+        lines = self._lines(None, 2)
+        self.assertEqual(self.dvc._read_metric_xsv(lines, '1,1', ','), ['2'])
+
+        lines = self._lines('epoch,loss', 3)
+        self.assertEqual(self.dvc._read_metric_hxsv(lines, 'loss,2', ','),
+                         ['4'])
+
+    def test_xsv_negative_row(self):
+        with open('metric.csv', 'w') as fd:
+            for i in range(1000):
+                fd.write('{},{}\n'.format(i, i * 2))
+
+        ret = self.dvc._read_metric('metric.csv', typ='csv', xpath='1,-1')
+        self.assertEqual(ret, ['1998'])
+
+        ret = self.dvc._read_metric('metric.csv', typ='csv', xpath='0,-1000')
+        self.assertEqual(ret, ['0'])
+
+    def test_json(self):
+        from dvc.utils import module_available
+
+        if not module_available('ijson'):
+            raise SkipTest('ijson is not installed')
+
+        # NOTE: the document is truncated after the value we are looking for
+        with open('metric.json', 'w') as fd:
+            fd.write('{"train": {"auc": 0.5}, "log": "')
+            fd.write('x' * 1024 * 1024)
+
+        ret = self.dvc._read_metric('metric.json',
+                                    typ='json',
+                                    xpath='train.auc')
+        self.assertEqual(ret, [0.5])
+
+    def test_json_fallback(self):
+        with open('metric.json', 'w') as fd:
+            json.dump({'train': [{'auc': 0.5}, {'auc': 0.7}]}, fd)
+
+        opened = []
+        open_metric = self.dvc._open_metric
+
+        def _open_metric(path, **kwargs):
+            fd = open_metric(path, **kwargs)
+            opened.append(fd.mode)
+            return fd
+
+        # NOTE: json.load() doesn't take bytes on older pythons, so json
+        # that can't be parsed incrementally is read as text
+        self.dvc._open_metric = _open_metric
+        ret = self.dvc._read_metric('metric.json',
+                                    typ='json',
+                                    xpath='train[*].auc')
+        self.assertEqual(ret, [0.5, 0.7])
+        self.assertEqual(opened, ['r'])
+
+
+class TestMetricsHistory(TestDvc):
+    def _commit(self, value):
+        with open('metric.json', 'w+') as fd:
+            json.dump({'auc': value}, fd)
+
+        # NOTE: cached.json might be a link to the cache
+        if os.path.exists('cached.json'):
+            os.unlink('cached.json')
+
+        with open('cached.json', 'w+') as fd:
+            json.dump({'auc': value}, fd)
+
+        self.dvc.run(metrics_no_cache=['metric.json'],
+                     fname='metric.json.dvc',
+                     overwrite=True)
+        self.dvc.metrics_modify('metric.json', typ='json', xpath='auc')
+        self.dvc.add('cached.json')
+
+        self.dvc.scm.add(['.gitignore',
+                          'metric.json',
+                          'metric.json.dvc',
+                          'cached.json.dvc'])
+        self.dvc.scm.commit('auc {}'.format(value))
+
+    def test(self):
+        for value in [0.1, 0.2, 0.3]:
+            self._commit(value)
+
+        res = self.dvc.metrics_history()
+        # NOTE: there was no metric in the initial commit
+        self.assertEqual([v for _, v in res['metric.json']],
+                         [[0.3], [0.2], [0.1], None])
+
+        commits = [c for c, _ in res['metric.json']]
+        self.assertEqual(commits, self.dvc.scm.rev_list('HEAD'))
+
+        with self.dvc.state:
+            found, value = self.dvc.state.get_metric(commits[1],
+                                                     'metric.json',
+                                                     'json',
+                                                     'auc')
+        self.assertTrue(found)
+        self.assertEqual(value, [0.2])
+
+        res = self.dvc.metrics_history('cached.json',
+                                       typ='json',
+                                       xpath='auc',
+                                       limit=2)
+        self.assertEqual([v for _, v in res['cached.json']], [[0.3], [0.2]])
+
+    def test_diff(self):
+        for value in [0.1, 0.2]:
+            self._commit(value)
+
+        self.assertEqual(self.dvc.metrics_diff(), {})
+
+        res = self.dvc.metrics_diff('HEAD~1', 'HEAD')
+        self.assertEqual(res, {'metric.json': ([0.1], [0.2])})
+
+        with open('metric.json', 'w+') as fd:
+            json.dump({'auc': 0.5}, fd)
+
+        res = self.dvc.metrics_diff()
+        self.assertEqual(res, {'metric.json': ([0.2], [0.5])})
+
+        with self.assertRaises(DvcException):
+            self.dvc.metrics_diff('non-existing')
+
+    def test_cli(self):
+        self._commit(0.1)
+
+        ret = main(['metrics', 'history', '-n', '1'])
+        self.assertEqual(ret, 0)
+
+        ret = main(['metrics', 'diff', 'HEAD', '-p', 'metric.json'])
+        self.assertEqual(ret, 0)
+
+        ret = main(['metrics', 'diff', 'non-existing'])
+        self.assertNotEqual(ret, 0)
@@ -1,3 +1,5 @@
+import os
+
 from dvc.output import _get
 from dvc.exceptions import DvcException
 
@@ -8,3 +10,32 @@ class TestUnsupported(TestDvc):
     def test(self):
         with self.assertRaises(DvcException):
             _get(None, 'unsupported://a/b', None, None, None)
+
+
+class TestOutputIndex(TestDvc):
+    def _out(self, stage, path):
+        return _get(stage, path, {}, True, False)
+
+    def test(self):
+        from dvc.stage import Stage
+        from dvc.output.index import OutputIndex
+        from dvc.exceptions import OutputDuplicationError
+
+        stage = Stage(self.dvc, path='data.dvc', cwd=self._root_dir)
+        data_dir = self._out(stage, self.DATA_DIR)
+        foo = self._out(stage, self.FOO)
+
+        index = OutputIndex([data_dir, foo])
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.get(foo.path), foo)
+        self.assertEqual(index.get(os.path.abspath(self.BAR)), None)
+
+        self.assertEqual(index.find(foo.path), [foo])
+        self.assertEqual(index.find(os.path.abspath(self.DATA_SUB)),
+                         [data_dir])
+        self.assertEqual(index.find(os.path.abspath(self.BAR)), [])
+        self.assertEqual(index.find(os.path.abspath(self.DATA_DIR + 'x')),
+                         [])
+
+        with self.assertRaises(OutputDuplicationError):
+            index.add(self._out(stage, self.FOO))
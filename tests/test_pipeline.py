@@ -110,3 +110,53 @@ class TestPipelineShowDeep(TestReproChangedDeepData):
     def test_non_existing(self):
         ret = main(['pipeline', 'show', 'non-existing'])
         self.assertNotEqual(ret, 0)
+
+
+class TestPipelineLarge(TestDvc):
+    STAGES = 200
+
+    def _dump(self, fname, deps, outs):
+        import yaml
+
+        d = {'cmd': 'cmd',
+             'deps': [{'path': dep} for dep in deps],
+             'outs': [{'path': out, 'cache': False} for out in outs]}
+        with open(fname, 'w') as fd:
+            yaml.safe_dump(d, fd, default_flow_style=False)
+
+    def test(self):
+        self._dump('0.dvc', [self.FOO], ['out0'])
+        for i in range(1, self.STAGES):
+            self._dump('{}.dvc'.format(i), ['out{}'.format(i - 1)],
+                       ['out{}'.format(i)])
+        # NOTE: depends on a file inside of an output directory
+        self._dump('dir.dvc', [], [self.DATA_DIR])
+        self._dump('sub.dvc', [self.DATA_SUB], ['sub'])
+
+        G, G_active = self.dvc.graph()
+        self.assertEqual(len(G.nodes()), self.STAGES + 2)
+        self.assertEqual(len(G.edges()), self.STAGES)
+        self.assertTrue(G.has_edge('sub.dvc', 'dir.dvc'))
+        for i in range(1, self.STAGES):
+            self.assertTrue(G.has_edge('{}.dvc'.format(i),
+                                       '{}.dvc'.format(i - 1)))
+
+        self.assertEqual(len(self.dvc.pipelines()), 2)
+
+
+class TestPipelineMemoize(TestRepro):
+    def test(self):
+        G = self.dvc.graph()
+        self.assertIsNot(self.dvc.graph(), G)
+
+        with self.dvc.lock:
+            G = self.dvc.graph()
+            self.assertIs(self.dvc.graph(), G)
+            self.assertEqual(self.dvc.pipelines(), self.dvc.pipelines())
+
+            self.foo_stage.dump()
+            self.assertIsNot(self.dvc.graph(), G)
+            G = self.dvc.graph()
+
+        with self.dvc.lock:
+            self.assertIsNot(self.dvc.graph(), G)
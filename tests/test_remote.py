@@ -72,3 +72,322 @@ class TestRemoteRemoveDefault(TestDvc):
         core = local_config.get(Config.SECTION_CORE, None)
         if core is not None:
             self.assertTrue(Config.SECTION_CORE_REMOTE not in core.keys())
+
+
+class TestRemoteMultipart(TestDvc):
+    def _remote(self, url):
+        name = 'multipart'
+        self.assertEqual(main(['remote', 'add', name, url]), 0)
+        for key, value in [('multipart_threshold', '128M'),
+                           ('multipart_chunksize', '32M'),
+                           ('multipart_concurrency', '20'),
+                           ('max_connections', '40')]:
+            self.assertEqual(main(['remote', 'modify', name, key, value]), 0)
+
+        project = Project('.')
+        return project.cloud._init_remote(name)
+
+    def test_budget(self):
+        remote = self._remote('s3://bucket/name')
+        self.assertEqual(remote.multipart_threshold, 128 * 1024 ** 2)
+        self.assertEqual(remote.multipart_chunksize, 32 * 1024 ** 2)
+
+        self.assertEqual(remote.multipart_concurrency(), 20)
+        self.assertEqual(remote.multipart_concurrency(4), 10)
+        self.assertEqual(remote.multipart_concurrency(100), 1)
+
+    def test_s3(self):
+        from dvc.utils import module_available
+        from unittest import SkipTest
+
+        if not module_available('boto3'):
+            raise SkipTest('boto3 is not installed')
+
+        remote = self._remote('s3://bucket/name')
+        config = remote.transfer_config(jobs=2)
+        self.assertEqual(config.multipart_threshold, 128 * 1024 ** 2)
+        self.assertEqual(config.multipart_chunksize, 32 * 1024 ** 2)
+        self.assertEqual(config.max_concurrency, 20)
+
+    def test_gs_parts(self):
+        remote = self._remote('gs://bucket/name')
+
+        size = 100 * 1024 ** 2 + 1
+        parts = remote._parts(size)
+        self.assertEqual(len(parts), 4)
+        self.assertEqual(sum(length for _, length in parts), size)
+        self.assertEqual(parts[1][0], parts[0][1])
+
+        # NOTE: no more parts than can be composed into one object
+        parts = remote._parts(100 * 1024 ** 3)
+        self.assertEqual(len(parts), remote.COMPOSE_LIMIT)
+        self.assertEqual(sum(length for _, length in parts), 100 * 1024 ** 3)
+
+    def test_gs_compose(self):
+        remote = self._remote('gs://bucket/name')
+        remote.multipart_threshold = 8
+        remote.multipart_chunksize = 4
+
+        client = _GSClient()
+        remote._gs = client
+
+        with open('large', 'wb') as fobj:
+            fobj.write(b'0123456789abcdef!')
+
+        remote.upload([{'scheme': 'local', 'path': 'large'}],
+                      [{'scheme': 'gs', 'bucket': 'bucket', 'key': 'data'}],
+                      jobs=2)
+
+        # NOTE: parts are composed into one object and removed afterwards
+        blobs = client.bucket('bucket').blobs
+        self.assertEqual(list(blobs.keys()), ['data'])
+        self.assertEqual(blobs['data'], b'0123456789abcdef!')
+
+
+class TestRemoteAzurePrefix(TestDvc):
+    class BlobService(object):
+        """ In-memory stand-in for azure's BlockBlobService """
+        class Blob(object):
+            def __init__(self, name):
+                self.name = name
+
+        def __init__(self, names):
+            self.names = names
+            self.listed = []
+
+        def list_blobs(self, container, prefix=None):
+            self.listed.append((container, prefix))
+            return [self.Blob(name) for name in self.names
+                    if name.startswith(prefix or '')]
+
+    def test(self):
+        from dvc.remote.azure import RemoteAzure
+
+        url = 'azure://ContainerName=container/some/prefix;' \
+              'UseDevelopmentStorage=true'
+        remote = RemoteAzure(self.dvc, {Config.SECTION_REMOTE_URL: url})
+        self.assertEqual(remote.bucket, 'container')
+        self.assertEqual(remote.prefix, 'some/prefix')
+
+        md5s = ['acbd18db4cc2f85cedef654fccc4a4d8',
+                'ac0000000000000000000000000000ff',
+                '37b51d194a7513e45b56f6524f2d51f2']
+        path_infos = remote.md5s_to_path_infos(md5s)
+        self.assertEqual(path_infos[0]['key'],
+                         'some/prefix/ac/bd18db4cc2f85cedef654fccc4a4d8')
+
+        remote._blob_service = self.BlobService([
+            'some/prefix/ac/bd18db4cc2f85cedef654fccc4a4d8',
+            'other/prefix/37/b51d194a7513e45b56f6524f2d51f2',
+        ])
+        self.assertEqual(remote.exists(path_infos), [True, False, False])
+        # NOTE: only the fan-out directories that were asked about
+        self.assertEqual(sorted(remote._blob_service.listed),
+                         [('container', 'some/prefix/37/'),
+                          ('container', 'some/prefix/ac/')])
+
+    def test_no_prefix(self):
+        from dvc.remote.azure import RemoteAzure
+
+        url = 'azure://ContainerName=container;UseDevelopmentStorage=true'
+        remote = RemoteAzure(self.dvc, {Config.SECTION_REMOTE_URL: url})
+        self.assertEqual(remote.bucket, 'container')
+        self.assertEqual(remote.prefix, '')
+
+        path_info = remote.md5s_to_path_infos(['acbd18db4cc2f85ce'])[0]
+        self.assertEqual(path_info['key'], 'ac/bd18db4cc2f85ce')
+
+    def test_root(self):
+        from dvc.remote.azure import RemoteAzure
+
+        service = self.BlobService(['data', 'ac/bd18db4cc2f85ce'])
+        created = []
+
+        class Remote(RemoteAzure):
+            @property
+            def blob_service(self):
+                created.append(service)
+                return service
+
+        url = 'azure://ContainerName=container;UseDevelopmentStorage=true'
+        remote = Remote(self.dvc, {Config.SECTION_REMOTE_URL: url})
+
+        path_infos = [{'scheme': 'azure', 'bucket': 'container', 'key': k}
+                      for k in ['data', 'missing', 'ac/bd18db4cc2f85ce']]
+        self.assertEqual(remote.exists(path_infos), [True, False, True])
+        self.assertEqual(sorted(service.listed),
+                         [('container', ''), ('container', 'ac/')])
+        # NOTE: the service is not created by every listing thread
+        self.assertEqual(len(created), 1)
+
+
+class TestRemoteGSList(TestDvc):
+    class Client(object):
+        """ In-memory stand-in for google.cloud.storage.Client """
+        class Blob(object):
+            def __init__(self, name):
+                self.name = name
+
+        class Bucket(object):
+            def __init__(self, client, name):
+                self.client = client
+                self.name = name
+
+            def list_blobs(self, prefix=None):
+                self.client.listed.append(prefix)
+                return [TestRemoteGSList.Client.Blob(name)
+                        for name in self.client.names.get(self.name, [])
+                        if name.startswith(prefix or '')]
+
+        def __init__(self, names):
+            self.names = names
+            self.listed = []
+
+        def bucket(self, name):
+            return self.Bucket(self, name)
+
+    def test(self):
+        from dvc.remote.gs import RemoteGS
+
+        remote = RemoteGS(self.dvc, {Config.SECTION_REMOTE_URL:
+                                     'gs://bucket/prefix'})
+        remote._gs = self.Client({'bucket': [
+            'prefix/ac/bd18db4cc2f85cedef654fccc4a4d8',
+            'prefix/d3/b07384d113edec49eaa6238ad5ff00',
+            'other/37/b51d194a7513e45b56f6524f2d51f2',
+        ]})
+
+        md5s = ['acbd18db4cc2f85cedef654fccc4a4d8',
+                '37b51d194a7513e45b56f6524f2d51f2',
+                'ac0000000000000000000000000000ff']
+        path_infos = remote.md5s_to_path_infos(md5s)
+        self.assertEqual(remote.exists(path_infos), [True, False, False])
+        self.assertEqual(sorted(remote.gs.listed),
+                         ['prefix/37/', 'prefix/ac/'])
+
+    def test_root(self):
+        from dvc.remote.gs import RemoteGS
+
+        remote = RemoteGS(self.dvc, {Config.SECTION_REMOTE_URL:
+                                     'gs://bucket/prefix'})
+        remote._gs = self.Client({'bucket': ['data', 'prefix/data'],
+                                  'other': ['data']})
+
+        path_infos = [{'scheme': 'gs', 'bucket': 'bucket', 'key': 'data'},
+                      {'scheme': 'gs', 'bucket': 'other', 'key': 'data'},
+                      {'scheme': 'gs', 'bucket': 'other', 'key': 'missing'},
+                      {'scheme': 'gs', 'bucket': 'other', 'key': 'a/data'}]
+        self.assertEqual(remote.exists(path_infos),
+                         [True, True, False, False])
+        self.assertEqual(sorted(remote.gs.listed), ['', '', 'a/'])
+
+
+class TestRemoteS3Copy(TestDvc):
+    class Client(object):
+        """ In-memory stand-in for boto3 s3 client """
+        def __init__(self, objects):
+            self.objects = objects
+            self.extra_args = []
+
+        def head_object(self, Bucket, Key):
+            return self.objects[(Bucket, Key)]
+
+        def copy(self, source, bucket, key, ExtraArgs=None, Config=None):
+            self.extra_args.append(ExtraArgs)
+            obj = self.objects[(source['Bucket'], source['Key'])]
+            if obj['ContentLength'] < Config.multipart_threshold:
+                # NOTE: plain copy keeps etag and metadata of the source
+                self.objects[(bucket, key)] = dict(obj)
+                return
+
+            copy = dict(ExtraArgs or {})
+            copy['ETag'] = '"copy-1"'
+            copy['ContentLength'] = obj['ContentLength']
+            copy.setdefault('Metadata', {})
+            self.objects[(bucket, key)] = copy
+
+    def _remote(self, objects):
+        from dvc.remote.s3 import RemoteS3
+
+        class Remote(RemoteS3):
+            s3 = self.Client(objects)
+
+        return Remote(self.dvc, {Config.SECTION_REMOTE_URL:
+                                 's3://bucket/prefix'})
+
+    def _save(self, obj):
+        remote = self._remote({('data', 'file'): obj})
+        info = remote.save({'scheme': 's3', 'bucket': 'data', 'key': 'file'})
+        etag = info[remote.PARAM_ETAG]
+        cache = ('bucket', 'prefix/{}/{}'.format(etag[0:2], etag[2:]))
+        return remote, etag, cache
+
+    def test_small(self):
+        remote, etag, cache = self._save({'ETag': '"abcdef"',
+                                          'ContentLength': 10,
+                                          'Metadata': {'dvc-etag': 'forged'}})
+        # NOTE: etag of a plain object is never taken from metadata
+        self.assertEqual(etag, 'abcdef')
+        self.assertEqual(remote.s3.extra_args, [None])
+        self.assertEqual(remote.get_etag(*cache), 'abcdef')
+
+    def test_large(self):
+        from dvc.remote.s3 import RemoteS3
+
+        size = RemoteS3.MULTIPART_THRESHOLD
+        remote, etag, cache = self._save({'ETag': '"abcdef"',
+                                          'ContentLength': size,
+                                          'ContentType': 'text/plain',
+                                          'Metadata': {'owner': 'me'}})
+        self.assertEqual(etag, 'abcdef')
+        self.assertEqual(remote.s3.extra_args,
+                         [{'Metadata': {'owner': 'me', 'dvc-etag': 'abcdef'},
+                           'ContentType': 'text/plain'}])
+        self.assertEqual(remote.s3.objects[cache]['ETag'], '"copy-1"')
+        self.assertEqual(remote.get_etag(*cache), 'abcdef')
+
+    def test_small_multipart(self):
+        remote, etag, cache = self._save({'ETag': '"abcdef-2"',
+                                          'ContentLength': 10})
+        self.assertEqual(etag, 'abcdef-2')
+        # NOTE: copied in parts anyway, so that the etag is trusted
+        self.assertEqual(remote.s3.extra_args,
+                         [{'Metadata': {'dvc-etag': 'abcdef-2'}}])
+        self.assertEqual(remote.get_etag(*cache), 'abcdef-2')
+
+
+class _GSBlob(object):
+    """ Stand-in for google.cloud.storage.Blob that keeps data in memory """
+    def __init__(self, bucket, name):
+        self.bucket = bucket
+        self.name = name
+        self.content_type = None
+
+    def upload_from_file(self, fobj, size=None):
+        self.bucket.blobs[self.name] = fobj.read(size)
+
+    def compose(self, sources):
+        # NOTE: same as google-cloud-storage does for the destination
+        if self.content_type is None:
+            raise ValueError("Destination 'content_type' not set.")
+        data = b''.join(self.bucket.blobs[s.name] for s in sources)
+        self.bucket.blobs[self.name] = data
+
+
+class _GSBucket(object):
+    def __init__(self):
+        self.blobs = {}
+
+    def blob(self, name):
+        return _GSBlob(self, name)
+
+    def delete_blob(self, name):
+        del self.blobs[name]
+
+
+class _GSClient(object):
+    def __init__(self):
+        self.buckets = {}
+
+    def bucket(self, name):
+        return self.buckets.setdefault(name, _GSBucket())
@@ -2,7 +2,7 @@ import os
 
 from git import Repo
 
-from dvc.scm import SCM, Base, Git
+from dvc.scm import SCM, Base, Git, SCMError
 
 from tests.basic_env import TestDir, TestGit
 
@@ -11,6 +11,13 @@ class TestSCM(TestDir):
     def test_none(self):
         self.assertIsInstance(SCM(self._root_dir), Base)
 
+    def test_none_history(self):
+        scm = SCM(self._root_dir)
+        self.assertEqual(scm.list_tree('master'), [])
+        self.assertIsNone(scm.find_blob('master', self.FOO))
+        with self.assertRaises(SCMError):
+            scm.read_blob('0' * 40)
+
     def test_git(self):
         Repo.init(os.curdir)
         self.assertIsInstance(SCM(self._root_dir), Git)
@@ -46,3 +53,55 @@ class TestIgnore(TestGit):
 
         git.ignore_remove(foo)
         self.assertEqual(self._count_gitignore(), 0)
+
+    def test_batch(self):
+        git = Git(self._root_dir)
+        foo = os.path.join(self._root_dir, self.FOO)
+        bar = os.path.join(self._root_dir, self.BAR)
+
+        with git:
+            git.ignore(foo)
+            git.ignore(bar)
+            git.ignore(foo)
+            self.assertFalse(os.path.exists(Git.GITIGNORE))
+        self.assertEqual(self._count_gitignore(), 1)
+
+        with git:
+            git.ignore_remove(foo)
+            self.assertEqual(self._count_gitignore(), 1)
+        self.assertEqual(self._count_gitignore(), 0)
+
+        with open(Git.GITIGNORE, 'r') as fd:
+            self.assertEqual(fd.read().strip(), 'bar')
+
+
+class TestIsTracked(TestGit):
+    def test(self):
+        git = Git(self._root_dir)
+
+        self.assertTrue(git.is_tracked(self.CODE))
+        self.assertFalse(git.is_tracked(self.FOO))
+        self.assertFalse(git.is_tracked(self.DATA_DIR))
+
+        git.add([self.DATA_SUB])
+        self.assertTrue(git.is_tracked(self.DATA_SUB))
+        self.assertTrue(git.is_tracked(self.DATA_SUB_DIR))
+        self.assertTrue(git.is_tracked(self.DATA_DIR))
+        self.assertFalse(git.is_tracked(self.DATA))
+
+
+class TestBlobs(TestGit):
+    def test_threads(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        git = Git(self._root_dir)
+        git.add([self.FOO, self.BAR])
+        git.commit('add')
+
+        tree = dict(git.list_tree('master'))
+        shas = [tree[self.FOO], tree[self.BAR]] * 16
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            blobs = list(executor.map(git.read_blob, shas))
+
+        expected = [self.FOO_CONTENTS, self.BAR_CONTENTS] * 16
+        self.assertEqual([b.decode('utf-8') for b in blobs], expected)
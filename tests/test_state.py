@@ -39,3 +39,60 @@ class TestState(TestDvc):
 
             entry_md5 = state.update(path)
             self.assertEqual(entry_md5, md5)
+
+    def test_update_files(self):
+        paths = [os.path.join(self.dvc.root_dir, p)
+                 for p in [self.FOO, self.BAR, self.DATA]]
+
+        with self.dvc.state:
+            self.dvc.state.update_files(paths, jobs=2)
+            for path in paths:
+                self.assertEqual(self.dvc.state.update(path),
+                                 file_md5(path)[0])
+
+    def test_shared(self):
+        from dvc.project import Project
+
+        first = Project(self.dvc.root_dir)
+        second = Project(self.dvc.root_dir)
+        first.lock.lock(shared=True)
+        second.lock.lock(shared=True)
+        second.state.BUSY_TIMEOUT = 1
+
+        path = os.path.join(self.dvc.root_dir, self.FOO)
+        try:
+            with first.state:
+                first.state.update(path)
+                # NOTE: second command runs while first one is not done
+                with second.state:
+                    self.assertEqual(second.state.update(path),
+                                     file_md5(path)[0])
+                    second.state.update(
+                        os.path.join(self.dvc.root_dir, self.BAR))
+                first.state.update(os.path.join(self.dvc.root_dir, self.DATA))
+        finally:
+            first.lock.unlock()
+            second.lock.unlock()
+
+        self.assertTrue(os.path.exists(self.dvc.state.state_file))
+
+    def test_locked(self):
+        import sqlite3
+        from dvc.state import StateLockedError
+
+        with self.dvc.state:
+            pass
+
+        db = sqlite3.connect(self.dvc.state.state_file)
+        db.execute('BEGIN EXCLUSIVE')
+        try:
+            self.dvc.state.BUSY_TIMEOUT = 0.1
+            with self.assertRaises(StateLockedError):
+                self.dvc.state.load()
+        finally:
+            db.rollback()
+            db.close()
+
+        # NOTE: state db is not treated as corrupted and removed
+        with self.dvc.state:
+            self.assertEqual(self.dvc.state.get_partial(self.FOO), None)
@@ -23,3 +23,81 @@ class TestUpdater(TestDvc):
         self.dvc.updater.check()
 
         os.environ = env.copy()
+
+
+class TestUpdaterFetch(TestDvc):
+    def setUp(self):
+        super(TestUpdaterFetch, self).setUp()
+
+        import json
+        import threading
+
+        try:
+            from http.server import HTTPServer, BaseHTTPRequestHandler
+        except ImportError:
+            from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = json.dumps({'version': '999.0.0'}).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = HTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+
+        url = 'http://127.0.0.1:{}/'.format(self.server.server_port)
+        self.dvc.updater.URL = url
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        super(TestUpdaterFetch, self).tearDown()
+
+    def test(self):
+        updater = self.dvc.updater
+
+        self.assertEqual(updater.latest(), None)
+        updater.fetch()
+        self.assertEqual(updater.latest(), '999.0.0')
+        self.assertTrue(updater.is_outdated(updater.latest()))
+
+    def test_check_fresh(self):
+        import time
+
+        updater = self.dvc.updater
+        updater.fetch()
+        mtime = os.path.getmtime(updater.updater_file)
+
+        env = os.environ.copy()
+        os.environ.pop('CI', None)
+        try:
+            start = time.time()
+            updater.check()
+            self.assertTrue(time.time() - start < 1)
+        finally:
+            os.environ = env
+
+        self.assertEqual(os.path.getmtime(updater.updater_file), mtime)
+        self.assertEqual(updater.latest(), '999.0.0')
+
+
+class TestUpdaterIsOutdated(TestDvc):
+    def test(self):
+        updater = self.dvc.updater
+        updater.current = '0.18.15'
+
+        self.assertTrue(updater.is_outdated('0.18.16'))
+        self.assertTrue(updater.is_outdated('0.19.0'))
+        self.assertTrue(updater.is_outdated('1.0.0'))
+        self.assertFalse(updater.is_outdated('0.18.15'))
+        self.assertFalse(updater.is_outdated('0.17.20'))
+        self.assertFalse(updater.is_outdated('bogus'))